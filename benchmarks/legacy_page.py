@@ -0,0 +1,63 @@
+"""
+Benchmarks the parsing of simple repository pages.
+
+Run it from the root of the repository with:
+
+    python -m benchmarks.legacy_page
+"""
+import timeit
+
+import html5lib
+
+from poetry.repositories.legacy_repository import Page
+
+
+LINKS = 20000
+
+
+def simple_page(links=LINKS):  # type: (int) -> str
+    anchors = []
+    for i in range(links // 2):
+        version = "{}.{}.{}".format(i // 1000, (i // 10) % 100, i % 10)
+        for filename in [
+            "foo-{}-py2.py3-none-any.whl".format(version),
+            "foo-{}.tar.gz".format(version),
+        ]:
+            anchors.append(
+                '<a href="https://files.example.com/packages/{0}#sha256={1}" '
+                'data-requires-python="&gt;=2.7, !=3.0.*">{0}</a><br/>'.format(
+                    filename, "a" * 64
+                )
+            )
+
+    return (
+        "<!DOCTYPE html><html><head><title>Links for foo</title></head>"
+        "<body><h1>Links for foo</h1>{}</body></html>".format("\n".join(anchors))
+    )
+
+
+def main():
+    content = simple_page()
+
+    def html5lib_tree():
+        html5lib.parse(content, namespaceHTMLElements=False).findall(".//a")
+
+    def links():
+        Page("https://example.com/simple/foo/", content, {}).links
+
+    def links_for_versions():
+        page = Page("https://example.com/simple/foo/", content, {})
+        for version in page.versions:
+            page.links_for_version(version)
+
+    for name, bench in [
+        ("html5lib tree (previous parser)", html5lib_tree),
+        ("Page.links", links),
+        ("Page.links_for_version (all versions)", links_for_versions),
+    ]:
+        duration = min(timeit.repeat(bench, number=1, repeat=3))
+        print("{:<40} {:>8.3f}s".format(name, duration))
+
+
+if __name__ == "__main__":
+    main()
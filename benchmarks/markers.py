@@ -0,0 +1,80 @@
+"""
+Benchmarks the parsing and evaluation of the markers of a lock file.
+
+Run it from the root of the repository with:
+
+    python -m benchmarks.markers
+"""
+import timeit
+
+from poetry.utils._compat import Path
+from poetry.utils.toml_file import TomlFile
+from poetry.version.markers import MarkerEnvironment
+from poetry.version.markers import _parse_marker
+from poetry.version.markers import parse_marker
+
+
+LOCK_FILE = Path(__file__).parent.parent / "poetry.lock"
+
+ENVIRONMENT = {
+    "implementation_name": "cpython",
+    "implementation_version": "3.7.1",
+    "os_name": "posix",
+    "platform_machine": "x86_64",
+    "platform_release": "4.15.0",
+    "platform_system": "Linux",
+    "platform_version": "#1 SMP",
+    "python_full_version": "3.7.1",
+    "platform_python_implementation": "CPython",
+    "python_version": "3.7",
+    "sys_platform": "linux",
+}
+
+
+def lock_markers(packages=5000):  # type: (int) -> list
+    """
+    The markers of the packages of the repository lock file,
+    repeated to reach the number of markers of a large lock file.
+    """
+    lock_data = TomlFile(LOCK_FILE).read()
+    markers = [info["marker"] for info in lock_data["package"] if "marker" in info]
+
+    return (markers * (packages // len(markers) + 1))[:packages]
+
+
+def main():
+    markers = lock_markers()
+
+    def uncached():
+        # What the installer did for each locked package.
+        for marker in markers:
+            _parse_marker.__wrapped__(marker).validate(ENVIRONMENT)
+
+    def compiled():
+        environment = MarkerEnvironment(ENVIRONMENT)
+        for marker in markers:
+            parse_marker(marker).compile()(environment)
+
+    parsed = [parse_marker(marker) for marker in markers]
+
+    def validate():
+        for marker in parsed:
+            marker.validate(ENVIRONMENT)
+
+    def evaluate():
+        environment = MarkerEnvironment(ENVIRONMENT)
+        for marker in parsed:
+            marker.compile()(environment)
+
+    for name, bench in [
+        ("parse + validate", uncached),
+        ("parse + compiled", compiled),
+        ("validate", validate),
+        ("compiled", evaluate),
+    ]:
+        duration = min(timeit.repeat(bench, number=1, repeat=3))
+        print("{:<20} {:>8.3f}s ({} markers)".format(name, duration, len(markers)))
+
+
+if __name__ == "__main__":
+    main()
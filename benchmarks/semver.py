@@ -0,0 +1,108 @@
+"""
+Benchmarks the parsing of version constraints and the sorting of versions.
+
+Run it from the root of the repository with:
+
+    python -m benchmarks.semver
+"""
+import random
+import timeit
+
+from poetry.semver import Version
+from poetry.semver import _parse_constraint
+from poetry.semver import parse_constraint
+
+
+# Constraints found in the requirements and python requirements
+# of popular packages, in PEP 440 and poetry formats.
+CONSTRAINTS = [
+    "*",
+    "^1.0",
+    "^2.7",
+    "~2.7 || ^3.4",
+    "~=3.6",
+    "~1.5",
+    ">=2.7",
+    ">=3.5",
+    ">=1.4.4,<2.0",
+    ">=2.7, !=3.0.*, !=3.1.*, !=3.2.*, !=3.3.*",
+    ">=2.7,!=3.0.*,!=3.1.*,!=3.2.*,!=3.3.*,!=3.4.*",
+    ">=3.6,<4.0",
+    ">=0.5 <0.6",
+    "==2.18.4",
+    "==1.24.1",
+    "!=2.0.0",
+    "<2.0.0",
+    "<=1.3.0",
+    ">1.0.1",
+    "1.2",
+    "2.0.0",
+    "0.10.0",
+    "^0.12.0",
+    "^1.4 || ^2.0",
+    ">=2.21.0,<3.0.0",
+    ">=1.21.1,<1.25",
+    ">=2017.4.17",
+    ">=3.0.2,<3.1.0",
+    ">=4.0,<6.0",
+    "2.*",
+    "1.0.0-beta.1",
+    ">=1.0.0a1",
+]
+
+
+def releases(count=100000):  # type: (int) -> list
+    """
+    Version strings shaped like the releases listed by PyPI,
+    with pre-releases, post-releases and four parts versions, shuffled.
+    """
+    versions = []
+    while len(versions) < count:
+        major, minor, patch = len(versions) // 1000, len(versions) // 50 % 20, 0
+        for suffix in ["", "a1", "b2", "rc1", ".dev0", ".post1", ".1", "-beta.3"]:
+            versions.append("{}.{}.{}{}".format(major, minor, patch, suffix))
+            patch += 1
+
+    versions = versions[:count]
+    random.Random(0).shuffle(versions)
+
+    return versions
+
+
+def main():
+    corpus = CONSTRAINTS * 1000
+
+    def uncached():
+        for constraint in corpus:
+            _parse_constraint.__wrapped__(constraint)
+
+    def cached():
+        for constraint in corpus:
+            parse_constraint(constraint)
+
+    for name, bench in [("parse (uncached)", uncached), ("parse (cached)", cached)]:
+        duration = min(timeit.repeat(bench, number=1, repeat=3))
+        print(
+            "{:<20} {:>8.3f}s ({:.0f} constraints/s)".format(
+                name, duration, len(corpus) / duration
+            )
+        )
+
+    versions = [Version.parse(version) for version in releases()]
+    for name, bench in [
+        ("sort", lambda: sorted(versions)),
+        ("sort unique", lambda: sorted(set(versions))),
+    ]:
+        duration = min(timeit.repeat(bench, number=1, repeat=3))
+        print("{:<20} {:>8.3f}s ({} versions)".format(name, duration, len(versions)))
+
+    duration = min(
+        timeit.repeat(
+            lambda: [Version.parse(v) for v in releases()], number=1, repeat=3
+        )
+    )
+    print("{:<20} {:>8.3f}s".format("parse versions", duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Benchmarks the resolution of synthetic, conflict-heavy, dependency graphs.
+
+Run it from the root of the repository with:
+
+    python -m benchmarks.solver
+"""
+import timeit
+
+from poetry.io import NullIO
+from poetry.packages import Dependency
+from poetry.packages import DependencyPackage
+from poetry.packages import Package
+from poetry.packages import ProjectPackage
+from poetry.puzzle import Solver
+from poetry.puzzle.provider import Provider
+from poetry.repositories import Pool
+from poetry.repositories import Repository
+
+# Importing the puzzle package first avoids a circular import
+from poetry.mixology import resolve_version  # noqa: I100
+from poetry.mixology.partial_solution import PartialSolution  # noqa: I100
+
+
+def add_package(repository, name, version, deps=None):
+    package = Package(name, version)
+    for dep_name, dep_constraint in (deps or {}).items():
+        package.add_dependency(dep_name, dep_constraint)
+
+    repository.add_package(package)
+
+
+def deep_chain(depth=25, versions=10, fillers=0):
+    """
+    A chain of packages in which only the oldest version of the last one
+    is compatible with the root, so that conflicts have to be traced back
+    through the whole chain.
+
+    Fillers are unrelated packages which are only there to make
+    the partial solution larger.
+    """
+    root = ProjectPackage("root", "1.0.0")
+    repository = Repository()
+
+    for i in range(fillers):
+        root.add_dependency("filler{}".format(i), "*")
+        add_package(repository, "filler{}".format(i), "1.0.0")
+
+    root.add_dependency("chain0", "*")
+    root.add_dependency("leaf", "<2.0.0")
+
+    for i in range(depth):
+        for version in range(1, versions + 1):
+            next_name = "chain{}".format(i + 1) if i + 1 < depth else "leaf"
+            add_package(
+                repository,
+                "chain{}".format(i),
+                "{}.0.0".format(version),
+                {next_name: ">={}.0.0".format(version)},
+            )
+
+    for version in range(1, versions + 1):
+        add_package(repository, "leaf", "{}.0.0".format(version))
+
+    return root, repository
+
+
+def many_releases(releases=100):
+    """
+    A package with a lot of releases depending on the same version
+    of another package which is not compatible with the root.
+    """
+    root = ProjectPackage("root", "1.0.0")
+    repository = Repository()
+
+    root.add_dependency("a", "*")
+    root.add_dependency("c", "<2.0.0")
+
+    add_package(repository, "a", "1.0.0")
+    for version in range(1, releases + 1):
+        add_package(repository, "a", "1.0.{}".format(version), {"b": ">=2.0.0"})
+
+    for version in range(2, 5):
+        add_package(repository, "b", "{}.0.0".format(version), {"c": ">=2.0.0"})
+
+    add_package(repository, "c", "1.0.0")
+    add_package(repository, "c", "2.0.0")
+
+    return root, repository
+
+
+def large_lock(packages=400, versions=10, conflict=False):
+    """
+    A lot of packages, each depending on the next two ones, locked
+    to their latest versions, to which a new leaf dependency is added.
+
+    If conflict is True, the leaf requires an older version
+    of one of the locked packages.
+    """
+    root = ProjectPackage("root", "1.0.0")
+    repository = Repository()
+
+    for i in range(0, packages, 10):
+        root.add_dependency("package{}".format(i), "*")
+
+    for i in range(packages):
+        deps = {
+            "package{}".format(j): ">=1.0.0" for j in range(i + 1, min(i + 3, packages))
+        }
+        for version in range(1, versions + 1):
+            add_package(
+                repository, "package{}".format(i), "{}.0.0".format(version), deps
+            )
+
+    deps = {}
+    if conflict:
+        deps["package{}".format(packages // 2)] = "<{}.0.0".format(versions)
+
+    # Two releases so that the leaf is only decided on after the locked packages.
+    add_package(repository, "leaf", "1.0.0", deps)
+    add_package(repository, "leaf", "1.1.0", deps)
+
+    locked = {}
+    for package in solve(root, repository).packages:
+        locked[package.name] = DependencyPackage(package.to_dependency(), package)
+
+    root.add_dependency("leaf", "*")
+
+    return root, repository, locked
+
+
+PLATFORMS = ["win32", "linux", "darwin"]
+
+PYTHONS = [">=3.4", ">=3.6", ">=3.4,<3.8", ">=3.5"]
+
+
+def cross_platform(layers=5, width=5):
+    """
+    Layers of packages each depending on all the packages of the next layer,
+    restricted to various platforms and Python versions, so that
+    the packages of the last layers are reached through a lot of paths.
+    """
+    root = ProjectPackage("root", "1.0.0")
+    root.python_versions = "~2.7 || ^3.4"
+    repository = Repository()
+
+    for i in range(width):
+        root.add_dependency("layer0-{}".format(i), "*")
+
+    for layer in range(layers):
+        for i in range(width):
+            package = Package("layer{}-{}".format(layer, i), "1.0.0")
+            if layer + 1 < layers:
+                for j in range(width):
+                    constraint = {"version": "*"}
+                    if (i + j) % 2:
+                        constraint["platform"] = PLATFORMS[(i + j) % len(PLATFORMS)]
+                    else:
+                        constraint["python"] = PYTHONS[(i + j) % len(PYTHONS)]
+
+                    package.add_dependency(
+                        "layer{}-{}".format(layer + 1, j), constraint
+                    )
+
+            repository.add_package(package)
+
+    return root, repository
+
+
+def solve(root, repository):
+    pool = Pool()
+    pool.add_repository(repository)
+
+    return resolve_version(root, Provider(root, pool, NullIO()))
+
+
+def backtracking(derivations=2000, rounds=200):
+    """
+    Repeatedly makes a decision on top of a large partial solution
+    and backtracks it.
+    """
+    solution = PartialSolution()
+    for i in range(derivations):
+        solution.derive(Dependency("package{}".format(i), ">=1.0"), True, object())
+
+    decision = Package("decision", "1.0.0")
+    for _ in range(rounds):
+        solution.decide(decision)
+        solution.derive(Dependency("package0", "<2.0"), True, object())
+        solution.backtrack(0)
+
+
+def main():
+    for name, graph in [
+        ("deep chain", lambda: deep_chain(depth=20)),
+        ("wide deep chain", lambda: deep_chain(depth=10, fillers=40)),
+        ("many releases", many_releases),
+    ]:
+        root, repository = graph()
+        result = solve(root, repository)
+
+        duration = min(
+            timeit.repeat(lambda: solve(root, repository), number=1, repeat=3)
+        )
+        print(
+            "{:<20} {:>8.3f}s ({} attempted solutions)".format(
+                name, duration, result.attempted_solutions
+            )
+        )
+
+    duration = min(timeit.repeat(backtracking, number=1, repeat=3))
+    print("{:<20} {:>8.3f}s".format("backtracking", duration))
+
+    for name, conflict in [("add to lock", False), ("conflicting lock", True)]:
+        root, repository, locked = large_lock(conflict=conflict)
+        pool = Pool()
+        pool.add_repository(repository)
+        duration = min(
+            timeit.repeat(
+                lambda: resolve_version(
+                    root, Provider(root, pool, NullIO()), locked=locked
+                ),
+                number=1,
+                repeat=3,
+            )
+        )
+        print("{:<20} {:>8.3f}s".format(name, duration))
+
+    root, repository = cross_platform()
+    pool = Pool()
+    pool.add_repository(repository)
+
+    def solve_cross_platform():
+        return Solver(root, pool, Repository(), Repository(), NullIO()).solve()
+
+    ops = solve_cross_platform()
+    duration = min(timeit.repeat(solve_cross_platform, number=1, repeat=3))
+    print(
+        "{:<20} {:>8.3f}s ({} characters of markers)".format(
+            "cross platform", duration, sum(len(str(op.package.marker)) for op in ops)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
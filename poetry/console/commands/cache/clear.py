@@ -15,7 +15,10 @@ class CacheClearCommand(Command):
     def handle(self):
         from cachy import CacheManager
         from poetry.locations import CACHE_DIR
+        from poetry.puzzle.resolution_cache import ResolutionCache
+        from poetry.repositories.metadata_store import MetadataStore
         from poetry.utils._compat import Path
+        from poetry.utils.helpers import safe_rmtree
 
         cache = self.argument("cache")
 
@@ -34,9 +37,10 @@ class CacheClearCommand(Command):
             {
                 "default": parts[0],
                 "serializer": "json",
-                "stores": {parts[0]: {"driver": "file", "path": str(cache_dir)}},
+                "stores": {parts[0]: {"driver": "metadata", "path": str(cache_dir)}},
             }
         )
+        cache.extend("metadata", lambda config: MetadataStore.create(config["path"]))
 
         if len(parts) == 1:
             if not self.option("all"):
@@ -49,10 +53,7 @@ class CacheClearCommand(Command):
                 self.line("No cache entries for {}".format(parts[0]))
                 return 0
 
-            # Calculate number of entries
-            entries_count = 0
-            for path, dirs, files in os.walk(str(cache_dir)):
-                entries_count += len(files)
+            entries_count = cache.store().get_store().count()
 
             delete = self.confirm(
                 "<question>Delete {} entries?</>".format(entries_count)
@@ -61,6 +62,10 @@ class CacheClearCommand(Command):
                 return 0
 
             cache.flush()
+
+            http_cache_dir = cache_dir / "_http"
+            if http_cache_dir.exists():
+                safe_rmtree(str(http_cache_dir))
         elif len(parts) == 2:
             raise RuntimeError(
                 "Only specifying the package name is not yet supported. "
@@ -81,3 +86,6 @@ class CacheClearCommand(Command):
             cache.forget("{}:{}".format(package, version))
         else:
             raise ValueError("Invalid cache key")
+
+        # Resolutions are only valid for the cached metadata they were built from
+        ResolutionCache().clear()
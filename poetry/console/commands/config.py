@@ -46,10 +46,14 @@ To remove a repository (repo is a short alias for repositories):
     @property
     def unique_config_values(self):
         from poetry.locations import CACHE_DIR
+        from poetry.repositories.http_client import HTTPClient
+        from poetry.repositories.metadata_store import MetadataStore
         from poetry.utils._compat import Path
 
         boolean_validator = lambda val: val in {"true", "false", "1", "0"}
         boolean_normalizer = lambda val: True if val in ["true", "1"] else False
+        integer_validator = lambda val: val.isdigit()
+        number_validator = lambda val: re.match(r"^\d+(\.\d+)?$", val) is not None
 
         unique_config_values = {
             "settings.virtualenvs.create": (
@@ -67,6 +71,36 @@ To remove a repository (repo is a short alias for repositories):
                 lambda val: str(Path(val)),
                 str(Path(CACHE_DIR) / "virtualenvs"),
             ),
+            "settings.http.pool-size": (
+                integer_validator,
+                int,
+                HTTPClient.POOL_SIZE,
+            ),
+            "settings.http.retries": (
+                integer_validator,
+                int,
+                HTTPClient.RETRIES,
+            ),
+            "settings.http.timeout": (
+                number_validator,
+                float,
+                HTTPClient.TIMEOUT,
+            ),
+            "settings.http.async": (
+                boolean_validator,
+                boolean_normalizer,
+                False,
+            ),
+            "settings.cache.max-size": (
+                integer_validator,
+                int,
+                MetadataStore.MAX_SIZE,
+            ),
+            "settings.cache.max-age": (
+                integer_validator,
+                int,
+                MetadataStore.MAX_AGE,
+            ),
         }
 
         return unique_config_values
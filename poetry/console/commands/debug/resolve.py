@@ -15,6 +15,7 @@ class DebugResolveCommand(Command):
         { --python= : Python version(s) to use for resolution. }
         { --tree : Displays the dependency tree. }
         { --install : Show what would be installed for the current system. }
+        { --no-cache : Do not reuse the dependencies resolved previously. }
     """
 
     _loggers = ["poetry.repositories.pypi_repository"]
@@ -22,6 +23,7 @@ class DebugResolveCommand(Command):
     def handle(self):
         from poetry.packages import ProjectPackage
         from poetry.puzzle import Solver
+        from poetry.puzzle.resolution_cache import ResolutionCache
         from poetry.repositories.repository import Repository
         from poetry.semver import parse_constraint
         from poetry.utils.env import Env
@@ -54,7 +56,14 @@ class DebugResolveCommand(Command):
 
         pool = self.poetry.pool
 
-        solver = Solver(package, pool, Repository(), Repository(), self.output)
+        solver = Solver(
+            package,
+            pool,
+            Repository(),
+            Repository(),
+            self.output,
+            cache=None if self.option("no-cache") else ResolutionCache(),
+        )
 
         ops = solver.solve()
 
@@ -6,6 +6,7 @@ class LockCommand(EnvCommand):
     Locks the project dependencies.
 
     lock
+        { --no-cache : Do not reuse the dependencies resolved previously. }
     """
 
     help = """The <info>lock</info> command reads the <comment>pyproject.toml</> file from
@@ -18,6 +19,7 @@ the current directory, processes it, and locks the depdencies in the <comment>po
 
     def handle(self):
         from poetry.installation import Installer
+        from poetry.puzzle.resolution_cache import ResolutionCache
 
         installer = Installer(
             self.output,
@@ -28,5 +30,7 @@ the current directory, processes it, and locks the depdencies in the <comment>po
         )
 
         installer.lock()
+        if not self.option("no-cache"):
+            installer.resolution_cache(ResolutionCache())
 
         return installer.run()
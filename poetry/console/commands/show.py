@@ -121,7 +121,17 @@ lists all packages available."""
             name_length = max(name_length, current_length)
             version_length = max(version_length, len(locked.full_pretty_version))
             if show_latest:
-                latest = self.find_latest_package(locked)
+                latest_packages[locked.pretty_name] = None
+
+        if show_latest:
+            # The latest versions are retrieved all at once
+            # so that the repositories can be queried concurrently.
+            packages = [
+                locked
+                for locked in locked_packages
+                if locked.pretty_name in latest_packages
+            ]
+            for locked, latest in zip(packages, self.find_latest_packages(packages)):
                 if not latest:
                     latest = locked
 
@@ -286,23 +296,40 @@ lists all packages available."""
         for color in self.colors:
             self.set_style(color, color)
 
-    def find_latest_package(self, package):
+    def find_latest_packages(self, packages):
         from poetry.io import NullIO
         from poetry.puzzle.provider import Provider
         from poetry.version.version_selector import VersionSelector
 
-        # find the latest version allowed in this pool
-        if package.source_type == "git":
-            for dep in self.poetry.package.requires:
-                if dep.name == package.name and dep.is_vcs():
-                    return Provider(
-                        self.poetry.package, self.poetry.pool, NullIO()
-                    ).search_for_vcs(dep)[0]
+        # find the latest versions allowed in this pool
+        latest = [None] * len(packages)
+        requests = []
+        for i, package in enumerate(packages):
+            if package.source_type == "git":
+                for dep in self.poetry.package.requires:
+                    if dep.name == package.name and dep.is_vcs():
+                        latest[i] = Provider(
+                            self.poetry.package, self.poetry.pool, NullIO()
+                        ).search_for_vcs(dep)[0]
+
+                        break
+
+                if latest[i] is not None:
+                    continue
+
+            requests.append((i, package))
 
-        name = package.name
         selector = VersionSelector(self.poetry.pool)
+        candidates = selector.find_best_candidates(
+            [
+                (package.name, ">={}".format(package.pretty_version))
+                for _, package in requests
+            ]
+        )
+        for (i, _), candidate in zip(requests, candidates):
+            latest[i] = candidate
 
-        return selector.find_best_candidate(name, ">={}".format(package.pretty_version))
+        return latest
 
     def get_update_status(self, latest, package):
         from poetry.semver import parse_constraint
@@ -13,6 +13,7 @@ from poetry.puzzle.operations import Install
 from poetry.puzzle.operations import Uninstall
 from poetry.puzzle.operations import Update
 from poetry.puzzle.operations.operation import Operation
+from poetry.puzzle.resolution_cache import ResolutionCache
 from poetry.repositories import Pool
 from poetry.repositories import Repository
 from poetry.repositories.installed_repository import InstalledRepository
@@ -53,6 +54,8 @@ class Installer:
 
         self._extras = []
 
+        self._resolution_cache = None  # type: Union[ResolutionCache, None]
+
         self._installer = self._get_installer()
         if installed is None:
             installed = self._get_installed()
@@ -140,6 +143,15 @@ class Installer:
 
         return self
 
+    def resolution_cache(self, cache):  # type: (ResolutionCache) -> Installer
+        """
+        Reuse the packages previously resolved for the same requirements
+        when updating dependencies.
+        """
+        self._resolution_cache = cache
+
+        return self
+
     def _do_install(self, local_repo):
         locked_repository = Repository()
         if self._update:
@@ -164,6 +176,7 @@ class Installer:
                 self._installed_repository,
                 locked_repository,
                 self._io,
+                cache=self._resolution_cache,
             )
 
             ops = solver.solve(use_latest=self._whitelist)
@@ -5,9 +5,7 @@ import re
 
 from typing import List
 
-import requests
-
-from requests import adapters
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 from requests.packages.urllib3 import util
 from requests_toolbelt import user_agent
@@ -45,7 +43,7 @@ class Uploader:
         return user_agent("poetry", __version__)
 
     @property
-    def adapter(self):
+    def adapter(self):  # type: () -> HTTPAdapter
         retry = util.Retry(
             connect=5,
             total=10,
@@ -53,7 +51,8 @@ class Uploader:
             status_forcelist=[500, 501, 502, 503],
         )
 
-        return adapters.HTTPAdapter(max_retries=retry)
+        # Uploads reuse the connections of the repositories
+        return self._poetry.pool.http_client.adapter(max_retries=retry)
 
     @property
     def files(self):  # type: () -> List[str]
@@ -81,7 +80,11 @@ class Uploader:
         self._password = password
 
     def make_session(self):
-        session = requests.session()
+        session = self._poetry.pool.http_client.session()
+
+        # Large files can take a while to be processed once uploaded
+        session.timeout = None
+
         if self.is_authenticated():
             session.auth = (self._username, self._password)
 
@@ -76,6 +76,10 @@ class Incompatibility:
         self._terms = terms
         self._cause = cause
 
+        # Computed lazily since conflict causes are hashed along
+        # with the incompatibilities they are derived from.
+        self._hash = None
+
     @property
     def terms(self):  # type: () -> List[Term]
         return self._terms
@@ -105,6 +109,26 @@ class Incompatibility:
             len(self._terms) == 1 and self._terms[0].dependency.is_root
         )
 
+    def __eq__(self, other):
+        if not isinstance(other, Incompatibility):
+            return NotImplemented
+
+        return (
+            self is other
+            or hash(self) == hash(other)
+            and self._cause == other.cause
+            and frozenset(self._terms) == frozenset(other.terms)
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((frozenset(self._terms), self._cause))
+
+        return self._hash
+
     def __str__(self):
         if isinstance(self._cause, DependencyCause):
             assert len(self._terms) == 2
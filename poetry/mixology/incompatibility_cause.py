@@ -3,6 +3,24 @@ class IncompatibilityCause(Exception):
     The reason and Incompatibility's terms are incompatible.
     """
 
+    def _key(self):  # type: () -> tuple
+        """
+        The values which, along with its type, identify this cause.
+        """
+        return ()
+
+    def __eq__(self, other):
+        if not isinstance(other, IncompatibilityCause):
+            return NotImplemented
+
+        return type(self) is type(other) and self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((type(self), self._key()))
+
 
 class RootCause(IncompatibilityCause):
 
@@ -15,8 +33,12 @@ class NoVersionsCause(IncompatibilityCause):
 
 
 class DependencyCause(IncompatibilityCause):
+    """
+    The incompatibility represents a package's dependency.
 
-    pass
+    It carries no values since the terms of the incompatibility hold the
+    whole dependency, extras and source included.
+    """
 
 
 class ConflictCause(IncompatibilityCause):
@@ -37,6 +59,9 @@ class ConflictCause(IncompatibilityCause):
     def other(self):
         return self._other
 
+    def _key(self):  # type: () -> tuple
+        return self._conflict, self._other
+
     def __str__(self):
         return str(self._conflict)
 
@@ -60,6 +85,9 @@ class PythonCause(IncompatibilityCause):
     def root_python_version(self):
         return self._root_python_version
 
+    def _key(self):  # type: () -> tuple
+        return self._python_version, self._root_python_version
+
 
 class PlatformCause(IncompatibilityCause):
     """
@@ -74,6 +102,9 @@ class PlatformCause(IncompatibilityCause):
     def platform(self):
         return self._platform
 
+    def _key(self):  # type: () -> tuple
+        return (self._platform,)
+
 
 class PackageNotFoundCause(IncompatibilityCause):
     """
@@ -87,3 +118,6 @@ class PackageNotFoundCause(IncompatibilityCause):
     @property
     def error(self):
         return self._error
+
+    def _key(self):  # type: () -> tuple
+        return (self._error,)
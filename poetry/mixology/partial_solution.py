@@ -3,6 +3,8 @@ from collections import OrderedDict
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Tuple
+from typing import Union
 
 from poetry.packages import Dependency
 from poetry.packages import Package
@@ -27,6 +29,15 @@ class PartialSolution:
         # assigned.
         self._assignments = []  # type: List[Assignment]
 
+        # The assignments made for each package, in the order they were
+        # assigned, along with the intersection of each of them with all
+        # the previous ones, so that satisfiers can be found
+        # without going through all the assignments.
+        #
+        # This is derived from self._assignments.
+        self._assignments_by_package = {}  # type: Dict[str, List[Assignment]]
+        self._intersections_by_package = {}  # type: Dict[str, List[Term]]
+
         # The decisions made for each package.
         self._decisions = OrderedDict()  # type: Dict[str, Package]
 
@@ -44,6 +55,12 @@ class PartialSolution:
         # This is derived from self._assignments.
         self._negative = OrderedDict()  # type: Dict[str, Dict[str, Term]]
 
+        # The positive and negative terms, or None, of the package of each
+        # assignment before it was registered, in the order they were assigned,
+        # so that backtracking only has to restore the terms
+        # of the removed assignments.
+        self._undo_log = []  # type: List[Tuple[str, Term, Dict[str, Term]]]
+
         # The number of distinct solutions that have been attempted so far.
         self._attempted_solutions = 1
 
@@ -70,6 +87,17 @@ class PartialSolution:
             if term.dependency.name not in self._decisions
         ]
 
+    def undecided(self, name):  # type: (str) -> Union[Dependency, None]
+        """
+        Returns the dependency on the package of the given name
+        if it is required but not decided on yet.
+        """
+        term = self._positive.get(name)
+        if term is None or name in self._decisions:
+            return
+
+        return term.dependency
+
     def decide(self, package):  # type: (Package) -> None
         """
         Adds an assignment of package as a decision
@@ -109,9 +137,39 @@ class PartialSolution:
         """
         Adds an Assignment to _assignments and _positive or _negative.
         """
+        name = assignment.dependency.name
+        negative = self._negative.get(name)
+        self._undo_log.append(
+            (
+                name,
+                self._positive.get(name),
+                None if negative is None else dict(negative),
+            )
+        )
+
         self._assignments.append(assignment)
+        self._index(assignment)
         self._register(assignment)
 
+    def _index(self, assignment):  # type: (Assignment) -> None
+        """
+        Adds an Assignment to the assignments of its package.
+        """
+        name = assignment.dependency.name
+        assignments = self._assignments_by_package.get(name)
+        if assignments is None:
+            self._assignments_by_package[name] = [assignment]
+            self._intersections_by_package[name] = [assignment]
+
+            return
+
+        intersections = self._intersections_by_package[name]
+        assignments.append(assignment)
+        if intersections[-1] is None:
+            intersections.append(None)
+        else:
+            intersections.append(intersections[-1].intersect(assignment))
+
     def backtrack(self, decision_level):  # type: (int) -> None
         """
         Resets the current decision level to decision_level, and removes all
@@ -126,17 +184,40 @@ class PartialSolution:
             if removed.is_decision():
                 del self._decisions[removed.dependency.name]
 
-        # Re-compute _positive and _negative for the packages that were removed.
-        for package in packages:
-            if package in self._positive:
-                del self._positive[package]
+            # Assignments are removed in reverse order so the removed
+            # assignment is always the last one of its package.
+            name = removed.dependency.name
+            self._assignments_by_package[name].pop(-1)
+            self._intersections_by_package[name].pop(-1)
+            if not self._assignments_by_package[name]:
+                del self._assignments_by_package[name]
+                del self._intersections_by_package[name]
+
+            # Restore _positive and _negative as they were
+            # before the removed assignment was registered.
+            _, positive, negative = self._undo_log.pop(-1)
+            if positive is None:
+                self._positive.pop(name, None)
+            else:
+                self._positive[name] = positive
+
+            if negative is None:
+                self._negative.pop(name, None)
+            else:
+                self._negative[name] = negative
 
-            if package in self._negative:
-                del self._negative[package]
+        # The order of _positive decides which package is chosen
+        # next so the restored packages are moved at the end,
+        # in the order in which their terms became positive.
+        restored = [package for package in packages if package in self._positive]
+        restored.sort(key=self._first_positive_index)
+        for package in restored:
+            self._positive[package] = self._positive.pop(package)
 
-        for assignment in self._assignments:
-            if assignment.dependency.name in packages:
-                self._register(assignment)
+    def _first_positive_index(self, package):  # type: (str) -> int
+        for assignment in self._assignments_by_package[package]:
+            if assignment.is_positive():
+                return assignment.index
 
     def _register(self, assignment):  # type: (Assignment) -> None
         """
@@ -173,33 +254,33 @@ class PartialSolution:
         Returns the first Assignment in this solution such that the sublist of
         assignments up to and including that entry collectively satisfies term.
         """
-        assigned_term = None  # type: Term
-
-        for assignment in self._assignments:
-            if assignment.dependency.name != term.dependency.name:
-                continue
-
-            if (
-                not assignment.dependency.is_root
-                and not assignment.dependency.name == term.dependency.name
-            ):
-                if not assignment.is_positive():
-                    continue
+        name = term.dependency.name
+        assignments = self._assignments_by_package.get(name, [])
+        intersections = self._intersections_by_package.get(name, [])
+
+        # Intersections only get narrower so, once an intersection
+        # satisfies term, all the following ones do too.
+        low, high = 0, len(intersections)
+        while low < high:
+            middle = (low + high) // 2
+            intersection = intersections[middle]
+            if intersection is None or intersection.satisfies(term):
+                high = middle
+            else:
+                low = middle + 1
 
-                assert not term.is_positive()
+        if low == len(intersections):
+            raise RuntimeError("[BUG] {} is not satisfied.".format(term))
 
-                return assignment
+        return assignments[low]
 
-            if assigned_term is None:
-                assigned_term = assignment
-            else:
-                assigned_term = assigned_term.intersect(assignment)
-
-            # As soon as we have enough assignments to satisfy term, return them.
-            if assigned_term.satisfies(term):
-                return assignment
+    def contains(self, assignment):  # type: (Assignment) -> bool
+        """
+        Returns whether assignment has not been removed by backtracking.
+        """
+        index = assignment.index
 
-        raise RuntimeError("[BUG] {} is not satisfied.".format(term))
+        return index < len(self._assignments) and self._assignments[index] is assignment
 
     def satisfies(self, term):  # type: (Term) -> bool
         return self.relation(term) == SetRelation.SUBSET
@@ -163,6 +163,45 @@ class Term(object):
 
         return Term(dep, is_positive)
 
+    def _key(self):  # type: () -> tuple
+        """
+        The values which identify this term: its polarity and everything
+        about its dependency which restricts the packages that satisfy it.
+        """
+        dependency = self._dependency
+
+        return (
+            self._positive,
+            dependency.name,
+            dependency.constraint,
+            tuple(sorted(dependency.extras)),
+            self._source(),
+            dependency.allows_prereleases(),
+        )
+
+    def _source(self):  # type: () -> tuple
+        dependency = self._dependency
+
+        if dependency.is_vcs():
+            return dependency.vcs, dependency.source, dependency.reference
+
+        if dependency.is_file() or dependency.is_directory():
+            return (str(dependency.path),)
+
+        return ()
+
+    def __eq__(self, other):
+        if not isinstance(other, Term):
+            return NotImplemented
+
+        return self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key())
+
     def __str__(self):
         return "{}{}".format("not " if not self.is_positive() else "", self._dependency)
 
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 import time
 
+from collections import OrderedDict
+from collections import deque
+
 from typing import Dict
 from typing import List
+from typing import Tuple
 from typing import Union
 
 from poetry.packages import Dependency
@@ -11,7 +15,9 @@ from poetry.packages import Package
 from poetry.puzzle.provider import Provider
 from poetry.semver import Version
 from poetry.semver import VersionRange
+from poetry.semver.operation_cache import operation_cache
 
+from .assignment import Assignment
 from .failure import SolveFailure
 from .incompatibility import Incompatibility
 from .incompatibility_cause import ConflictCause
@@ -52,9 +58,45 @@ class VersionSolver:
 
         self._use_latest = use_latest
 
-        self._incompatibilities = {}  # type: Dict[str, List[Incompatibility]]
+        # The names of the locked packages to decide on as pre-made
+        # decisions, before choosing the versions of the other packages.
+        #
+        # Most locked versions are still valid after a change of the
+        # root requirements, so they are decided on as soon as they are
+        # required, without looking at their other versions, and their
+        # incompatibilities are not merged with the ones of their
+        # neighbouring versions. Only the other packages are resolved
+        # as usual.
+        self._seeds = deque()
+
+        # The locked packages decided on as pre-made decisions, in order,
+        # so that they are decided on again in the same order.
+        self._seeded = OrderedDict()  # type: Dict[str, None]
+
+        # The locked packages involved in a conflict, and their dependers,
+        # which are resolved as usual from then on.
+        self._unlocked = set()
+
+        # The names of the locked packages depending on each package.
+        self._locked_dependers = None  # type: Dict[str, List[str]]
+
+        self._incompatibilities = {}  # type: Dict[str, Dict[Incompatibility, None]]
         self._solution = PartialSolution()
 
+        # The packages of the two terms of each incompatibility, keyed by id,
+        # which were inconclusive the last time it was propagated.
+        self._watched = {}  # type: Dict[int, Tuple[str, str]]
+
+        # The assignment of _solution which contradicted a term of each
+        # incompatibility, keyed by id, the last time it was propagated.
+        self._contradicted = {}  # type: Dict[int, Assignment]
+
+        # The number of times an incompatibility has been propagated.
+        self._visits = 0
+
+        # The time spent choosing the package versions to decide on.
+        self._decision_time = 0.0
+
     @property
     def solution(self):  # type: () -> PartialSolution
         return self._solution
@@ -65,6 +107,27 @@ class VersionSolver:
         or raises an error if no such set is available.
         """
         start = time.time()
+        hits, misses = operation_cache.hits, operation_cache.misses
+
+        try:
+            return self._solve()
+        finally:
+            self._log(
+                "Version solving took {:.3f} seconds, "
+                "{:.3f} of which choosing versions.\n"
+                "Tried {} solutions.\n"
+                "Visited {} incompatibilities.\n"
+                "Constraint operations cache: {} hits, {} misses.".format(
+                    time.time() - start,
+                    self._decision_time,
+                    self._solution.attempted_solutions,
+                    self._visits,
+                    operation_cache.hits - hits,
+                    operation_cache.misses - misses,
+                )
+            )
+
+    def _solve(self):  # type: () -> SolverResult
         root_dependency = Dependency(self._root.name, self._root.version)
         root_dependency.is_root = True
 
@@ -72,22 +135,15 @@ class VersionSolver:
             Incompatibility([Term(root_dependency, False)], RootCause())
         )
 
-        try:
-            next = self._root.name
-            while next is not None:
-                self._propagate(next)
-                next = self._choose_package_version()
-
-            return self._result()
-        except Exception:
-            raise
-        finally:
-            self._log(
-                "Version solving took {:.3f} seconds.\n"
-                "Tried {} solutions.".format(
-                    time.time() - start, self._solution.attempted_solutions
-                )
-            )
+        next = self._root.name
+        while next is not None:
+            self._propagate(next)
+
+            decision_start = time.time()
+            next = self._decide_locked_version() or self._choose_package_version()
+            self._decision_time += time.time() - decision_start
+
+        return self._result()
 
     def _propagate(self, package):  # type: (str) -> None
         """
@@ -105,6 +161,9 @@ class VersionSolver:
             # we can derive stronger assignments sooner and more eagerly find
             # conflicts.
             for incompatibility in reversed(self._incompatibilities[package]):
+                if self._is_inconclusive(incompatibility, package):
+                    continue
+
                 result = self._propagate_incompatibility(incompatibility)
 
                 if result is _conflict:
@@ -126,6 +185,32 @@ class VersionSolver:
                 elif result is not None:
                     changed.add(result)
 
+    def _is_inconclusive(
+        self, incompatibility, package
+    ):  # type: (Incompatibility, str) -> bool
+        """
+        Returns whether nothing can be deduced from incompatibility after
+        new assignments for package, without looking at its terms.
+
+        Like the watched literals of SAT solvers, this relies on the terms that
+        prevented deducing anything from incompatibility the last time it was
+        propagated: new assignments only ever narrow down _solution and
+        backtracking only widens it again.
+        """
+        key = id(incompatibility)
+
+        # A contradicted term stays contradicted until the assignment
+        # that contradicted it is backtracked.
+        contradiction = self._contradicted.get(key)
+        if contradiction is not None:
+            return self._solution.contains(contradiction)
+
+        # An inconclusive term can only be satisfied by new assignments
+        # for its package.
+        watched = self._watched.get(key)
+
+        return watched is not None and package not in watched
+
     def _propagate_incompatibility(
         self, incompatibility
     ):  # type: (Incompatibility) -> Union[str, _conflict, None]
@@ -139,6 +224,12 @@ class VersionSolver:
 
         Otherwise, returns None.
         """
+        self._visits += 1
+
+        key = id(incompatibility)
+        self._watched.pop(key, None)
+        self._contradicted.pop(key, None)
+
         # The first entry in incompatibility.terms that's not yet satisfied by
         # _solution, if one exists. If we find more than one, _solution is
         # inconclusive for incompatibility and we can't deduce anything.
@@ -151,11 +242,18 @@ class VersionSolver:
                 # If term is already contradicted by _solution, then
                 # incompatibility is contradicted as well and there's nothing new we
                 # can deduce from it.
+                self._contradicted[key] = self._solution.satisfier(term.inverse)
+
                 return
             elif relation == SetRelation.OVERLAPPING:
                 # If more than one term is inconclusive, we can't deduce anything about
                 # incompatibility.
                 if unsatisfied is not None:
+                    self._watched[key] = (
+                        unsatisfied.dependency.name,
+                        term.dependency.name,
+                    )
+
                     return
 
                 # If exactly one term in incompatibility is inconclusive, then it's
@@ -197,6 +295,8 @@ class VersionSolver:
 
         new_incompatibility = False
         while not incompatibility.is_failure():
+            self._unlock(incompatibility)
+
             # The term in incompatibility.terms that was most recently satisfied by
             # _solution.
             most_recent_term = None
@@ -261,6 +361,11 @@ class VersionSolver:
                 or most_recent_satisfier.cause is None
             ):
                 self._solution.backtrack(previous_satisfier_level)
+
+                # The backtracked locked versions are decided on again.
+                if self._seeded:
+                    self._seeds.extend(self._seeded)
+
                 if new_incompatibility:
                     self._add_incompatibility(incompatibility)
 
@@ -339,7 +444,9 @@ class VersionSolver:
                 return 1
 
             try:
-                return len(self._provider.search_for(dependency))
+                # The candidates themselves are only needed
+                # for the package that gets chosen.
+                return self._provider.count_for(dependency)
             except ValueError:
                 return 0
 
@@ -349,7 +456,8 @@ class VersionSolver:
             dependency = min(*unsatisfied, key=_get_min)
 
         locked = self._get_locked(dependency.name)
-        if locked is None or not dependency.constraint.allows(locked.version):
+        is_locked = locked is not None and dependency.constraint.allows(locked.version)
+        if not is_locked:
             try:
                 packages = self._provider.search_for(dependency)
             except ValueError as e:
@@ -374,10 +482,53 @@ class VersionSolver:
 
             return dependency.name
 
+        # The locked versions are decided on without merging
+        # until they are involved in a conflict.
+        merge = not is_locked or dependency.name in self._unlocked
+
+        return self._select(dependency, version, merge=merge)
+
+    def _decide_locked_version(self):  # type: () -> Union[str, None]
+        """
+        Tries to select the locked version of a required package
+        as a pre-made decision.
+
+        Returns the name of the package whose incompatibilities should be
+        propagated by _propagate(), or None if no locked version can be
+        selected as is.
+        """
+        while self._seeds:
+            name = self._seeds.popleft()
+            if name in self._unlocked:
+                continue
+
+            dependency = self._solution.undecided(name)
+            if dependency is None:
+                continue
+
+            locked = self._get_locked(name)
+            if locked is None or not dependency.constraint.allows(locked.version):
+                continue
+
+            return self._select(dependency, locked, merge=False)
+
+    def _select(
+        self, dependency, version, merge=True
+    ):  # type: (Dependency, Package, bool) -> str
+        """
+        Adds the incompatibilities of version, and decides on it
+        if they are not already satisfied.
+
+        Returns the name of the package whose incompatibilities should be
+        propagated by _propagate().
+        """
         version = self._provider.complete_package(version)
+        if not merge:
+            self._seeded[dependency.name] = None
 
         conflict = False
-        for incompatibility in self._provider.incompatibilities_for(version):
+        incompatibilities = self._provider.incompatibilities_for(version, merge=merge)
+        for incompatibility in incompatibilities:
             self._add_incompatibility(incompatibility)
 
             # If an incompatibility is already satisfied, then selecting version
@@ -399,6 +550,9 @@ class VersionSolver:
                 "selecting {} ({})".format(version.name, version.full_pretty_version)
             )
 
+            # The locked versions of its dependencies are decided on next.
+            self._seeds.extend(dep.name for dep in version.all_requires)
+
         return dependency.name
 
     def _excludes_single_version(self, constraint):  # type: (Any) -> bool
@@ -421,12 +575,37 @@ class VersionSolver:
 
         for term in incompatibility.terms:
             if term.dependency.name not in self._incompatibilities:
-                self._incompatibilities[term.dependency.name] = []
+                self._incompatibilities[term.dependency.name] = OrderedDict()
 
+            # The same facts are derived again every time a package version
+            # is selected so the incompatibilities of each package are stored
+            # in an ordered set to drop them without scanning.
             if incompatibility in self._incompatibilities[term.dependency.name]:
                 continue
 
-            self._incompatibilities[term.dependency.name].append(incompatibility)
+            self._incompatibilities[term.dependency.name][incompatibility] = None
+
+    def _unlock(self, incompatibility):  # type: (Incompatibility) -> None
+        """
+        Stops deciding on the locked versions involved in incompatibility,
+        and on the ones depending on them, as pre-made decisions.
+        """
+        for term in incompatibility.terms:
+            name = term.dependency.name
+            if name not in self._seeded or name in self._unlocked:
+                continue
+
+            if self._locked_dependers is None:
+                self._locked_dependers = {}
+                for locked in self._locked.values():
+                    for dependency in locked.requires:
+                        self._locked_dependers.setdefault(dependency.name, []).append(
+                            locked.name
+                        )
+
+            self._log("unlocking {} and its dependers".format(name))
+            self._unlocked.add(name)
+            self._unlocked.update(self._locked_dependers.get(name, []))
 
     def _get_locked(self, package_name):  # type: (str) -> Union[Package, None]
         if package_name in self._use_latest:
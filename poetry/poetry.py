@@ -15,9 +15,12 @@ from .packages import Package
 from .packages import ProjectPackage
 from .repositories import Pool
 from .repositories.auth import Auth
+from .repositories.base_repository import BaseRepository
+from .repositories.http_client import HTTPClient
 from .repositories.legacy_repository import LegacyRepository
 from .repositories.pypi_repository import PyPiRepository
 from .spdx import license_by_id
+from .utils._compat import PY35
 from .utils._compat import Path
 from .utils.helpers import get_http_basic_auth
 from .utils.toml_file import TomlFile
@@ -42,12 +45,12 @@ class Poetry:
         self._auth_config = Config.create("auth.toml")
 
         # Configure sources
-        self._pool = Pool()
+        self._pool = Pool(http_client=self.create_http_client())
         for source in self._local_config.get("source", []):
             self._pool.add_repository(self.create_legacy_repository(source))
 
         # Always put PyPI last to prefer private repositories
-        self._pool.add_repository(PyPiRepository())
+        self._pool.add_repository(self.create_pypi_repository())
 
     @property
     def file(self):
@@ -196,9 +199,20 @@ class Poetry:
 
         return cls(poetry_file, local_config, package, locker)
 
+    def create_pypi_repository(self):  # type: () -> BaseRepository
+        if self.use_async_repositories():
+            from .repositories.async_repository import AsyncPyPiRepository
+            from .repositories.async_repository import AsyncRepositoryAdapter
+
+            return AsyncRepositoryAdapter(
+                AsyncPyPiRepository(http_client=self._pool.http_client)
+            )
+
+        return PyPiRepository(http_client=self._pool.http_client)
+
     def create_legacy_repository(
         self, source
-    ):  # type: (Dict[str, str]) -> LegacyRepository
+    ):  # type: (Dict[str, str]) -> BaseRepository
         if "url" in source:
             # PyPI-like repository
             if "name" not in source:
@@ -208,13 +222,50 @@ class Poetry:
 
         name = source["name"]
         url = source["url"]
+        auth = None
         credentials = get_http_basic_auth(self._auth_config, name)
-        if not credentials:
-            return LegacyRepository(name, url)
+        if credentials:
+            auth = Auth(url, credentials[0], credentials[1])
+
+        if self.use_async_repositories():
+            from .repositories.async_repository import AsyncLegacyRepository
+            from .repositories.async_repository import AsyncRepositoryAdapter
 
-        auth = Auth(url, credentials[0], credentials[1])
+            return AsyncRepositoryAdapter(
+                AsyncLegacyRepository(
+                    name, url, auth=auth, http_client=self._pool.http_client
+                )
+            )
+
+        return LegacyRepository(
+            name, url, auth=auth, http_client=self._pool.http_client
+        )
 
-        return LegacyRepository(name, url, auth=auth)
+    def use_async_repositories(self):  # type: () -> bool
+        """
+        Whether the metadata of packages should be retrieved
+        with the asyncio based repositories.
+        """
+        if not self._config.setting("settings.http.async", False):
+            return False
+
+        if not PY35:
+            raise RuntimeError("Asynchronous repositories require Python 3.5+")
+
+        return True
+
+    def create_http_client(self):  # type: () -> HTTPClient
+        return HTTPClient(
+            pool_size=int(
+                self._config.setting("settings.http.pool-size", HTTPClient.POOL_SIZE)
+            ),
+            retries=int(
+                self._config.setting("settings.http.retries", HTTPClient.RETRIES)
+            ),
+            timeout=float(
+                self._config.setting("settings.http.timeout", HTTPClient.TIMEOUT)
+            ),
+        )
 
     @classmethod
     def check(cls, config, strict=False):  # type: (dict, bool) -> Dict[str, List[str]]
@@ -1,3 +1,4 @@
+import bisect
 import glob
 import logging
 import os
@@ -8,7 +9,11 @@ import time
 from cleo import ProgressIndicator
 from contextlib import contextmanager
 from tempfile import mkdtemp
+from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
 
 from poetry.packages import Dependency
 from poetry.packages import DependencyPackage
@@ -25,6 +30,13 @@ from poetry.mixology.incompatibility_cause import PythonCause
 from poetry.mixology.term import Term
 
 from poetry.repositories import Pool
+from poetry.repositories.exceptions import PackageNotFound
+from poetry.repositories.prefetcher import ReleasePrefetcher
+
+from poetry.semver import Version
+from poetry.semver import VersionConstraint
+from poetry.semver import VersionRange
+from poetry.semver import VersionUnion
 
 from poetry.utils._compat import PY35
 from poetry.utils._compat import Path
@@ -67,12 +79,32 @@ class Provider:
 
     UNSAFE_PACKAGES = {"setuptools", "distribute", "pip"}
 
+    # The number of candidate versions, starting from the most recent one,
+    # whose release information is retrieved ahead of time.
+    PREFETCH_DEPTH = 2
+
+    # The number of neighbouring candidate versions, on each side of
+    # a selected version, whose dependencies are compared with its own
+    # to merge their incompatibilities.
+    MERGE_DEPTH = 4
+
     def __init__(self, package, pool, io):  # type: (Package, Pool, ...) -> None
         self._package = package
         self._pool = pool
         self._io = io
         self._python_constraint = package.python_constraint
-        self._search_for = {}
+
+        # The candidates found for each dependency, sorted by version,
+        # along with their versions.
+        self._search_for = {}  # type: Dict[Dependency, Tuple[List[Package], List]]
+
+        # The dependencies in _search_for, by package name.
+        self._search_for_by_name = {}  # type: Dict[str, List[Dependency]]
+
+        # The number of candidates of each dependency.
+        self._count_for = {}  # type: Dict[Dependency, int]
+
+        self._prefetcher = ReleasePrefetcher(pool)
         self._is_debugging = self._io.is_debug() or self._io.is_very_verbose()
         self._in_progress = False
 
@@ -80,6 +112,18 @@ class Provider:
     def pool(self):  # type: () -> Pool
         return self._pool
 
+    @property
+    def prefetcher(self):  # type: () -> ReleasePrefetcher
+        return self._prefetcher
+
+    @property
+    def searched_packages(self):  # type: () -> Set[str]
+        """
+        The names of the packages whose candidates have been searched for
+        or counted so far.
+        """
+        return set(self._search_for_by_name) | set(d.name for d in self._count_for)
+
     @property
     def name_for_explicit_dependency_source(self):  # type: () -> str
         return "pyproject.toml"
@@ -107,27 +151,14 @@ class Provider:
         if dependency.is_root:
             return PackageCollection(dependency, [self._package])
 
-        for constraint in self._search_for.keys():
-            if (
-                constraint.name == dependency.name
-                and constraint.constraint.intersect(dependency.constraint)
-                == dependency.constraint
-            ):
-                packages = [
-                    p
-                    for p in self._search_for[constraint]
-                    if dependency.constraint.allows(p.version)
-                ]
-
-                packages.sort(
-                    key=lambda p: (
-                        not p.is_prerelease() and not dependency.allows_prereleases(),
-                        p.version,
-                    ),
-                    reverse=True,
-                )
-
-                return PackageCollection(dependency, packages)
+        candidates = self._cached_candidates(dependency)
+        if candidates is not None:
+            return PackageCollection(
+                dependency,
+                self._order(
+                    self._select(candidates, dependency.constraint), dependency
+                ),
+            )
 
         if dependency.is_vcs():
             packages = self.search_for_vcs(dependency)
@@ -145,18 +176,111 @@ class Provider:
                 allow_prereleases=dependency.allows_prereleases(),
             )
 
-            packages.sort(
-                key=lambda p: (
-                    not p.is_prerelease() and not dependency.allows_prereleases(),
-                    p.version,
-                ),
-                reverse=True,
-            )
+        packages = sorted(packages, key=lambda p: p.version)
+        self._search_for[dependency] = (packages, [p.version for p in packages])
+        self._search_for_by_name.setdefault(dependency.name, []).append(dependency)
 
-        self._search_for[dependency] = packages
+        packages = self._order(packages, dependency)
+        if not (
+            dependency.is_vcs() or dependency.is_file() or dependency.is_directory()
+        ):
+            self._prefetcher.prefetch(
+                dependency.name,
+                [p.version.text for p in packages[: self.PREFETCH_DEPTH]],
+            )
 
         return PackageCollection(dependency, packages)
 
+    def count_for(self, dependency):  # type: (Dependency) -> int
+        """
+        Returns the number of specifications search_for() would return
+        for the given dependency.
+
+        Unless they have already been found, the specifications are only
+        counted by the repositories, without building them.
+        """
+        if (
+            dependency.is_root
+            or dependency.is_vcs()
+            or dependency.is_file()
+            or dependency.is_directory()
+        ):
+            return len(self.search_for(dependency))
+
+        count = self._count_for.get(dependency)
+        if count is None:
+            candidates = self._cached_candidates(dependency)
+            if candidates is not None:
+                count = len(self._select(candidates, dependency.constraint))
+            else:
+                count = self._pool.count_packages(
+                    dependency.name,
+                    dependency.constraint,
+                    allow_prereleases=dependency.allows_prereleases(),
+                )
+
+            self._count_for[dependency] = count
+
+        return count
+
+    def _cached_candidates(
+        self, dependency
+    ):  # type: (Dependency) -> Optional[Tuple[List[Package], List[Version]]]
+        candidates = self._search_for.get(dependency)
+        if candidates is not None:
+            return candidates
+
+        # The candidates of a dependency with a wider constraint
+        # can be narrowed down instead of searching again.
+        for other in self._search_for_by_name.get(dependency.name, []):
+            if other.constraint.allows_all(dependency.constraint):
+                return self._search_for[other]
+
+    def _select(
+        self, candidates, constraint
+    ):  # type: (tuple, VersionConstraint) -> List[Package]
+        """
+        Returns the candidates allowed by a constraint, sorted by version.
+
+        Since candidates are sorted by version, only the ones between the
+        bounds of the constraint have to be checked.
+        """
+        packages, versions = candidates
+
+        if isinstance(constraint, VersionUnion):
+            lower, upper = constraint.ranges[0], constraint.ranges[-1]
+        else:
+            lower = upper = constraint
+
+        start, end = 0, len(versions)
+        if isinstance(lower, Version):
+            start = bisect.bisect_left(versions, lower)
+        elif isinstance(lower, VersionRange) and lower.min is not None:
+            start = bisect.bisect_left(versions, lower.min)
+
+        if isinstance(upper, Version):
+            end = bisect.bisect_right(versions, upper)
+        elif isinstance(upper, VersionRange) and upper.max is not None:
+            end = bisect.bisect_right(versions, upper.max)
+
+        return [p for p in packages[start:end] if constraint.allows(p.version)]
+
+    def _order(
+        self, packages, dependency
+    ):  # type: (List[Package], Dependency) -> List[Package]
+        """
+        Orders packages sorted by version in the order they should be
+        considered: the most recent first and, unless the dependency allows
+        them, pre-releases last.
+        """
+        packages = packages[::-1]
+        if dependency.allows_prereleases():
+            return packages
+
+        return [p for p in packages if not p.is_prerelease()] + [
+            p for p in packages if p.is_prerelease()
+        ]
+
     def search_for_vcs(self, dependency):  # type: (VCSDependency) -> List[Package]
         """
         Search for the specifications that match the given VCS dependency.
@@ -391,16 +515,16 @@ class Provider:
         return [package]
 
     def incompatibilities_for(
-        self, package
-    ):  # type: (DependencyPackage) -> List[Incompatibility]
+        self, package, merge=True
+    ):  # type: (DependencyPackage, bool) -> List[Incompatibility]
         """
         Returns incompatibilities that encapsulate a given package's dependencies,
         or that it can't be safely selected.
 
         If multiple subsequent versions of this package have the same
-        dependencies, this will return incompatibilities that reflect that. It
-        won't return incompatibilities that have already been returned by a
-        previous call to _incompatibilities_for().
+        dependencies, this will return incompatibilities that reflect that,
+        unless merge is False. It won't return incompatibilities that have
+        already been returned by a previous call to _incompatibilities_for().
         """
         if package.is_root():
             dependencies = package.all_requires
@@ -433,20 +557,113 @@ class Provider:
                         )
                     ]
 
-        dependencies = [
+        dependencies = self._relevant_dependencies(dependencies)
+        if merge:
+            dependers = self._dependers_for(package, dependencies)
+        else:
+            dependers = [package.to_dependency()] * len(dependencies)
+
+        return [
+            Incompatibility([Term(depender, True), Term(dep, False)], DependencyCause())
+            for depender, dep in zip(dependers, dependencies)
+        ]
+
+    def _relevant_dependencies(
+        self, dependencies
+    ):  # type: (List[Dependency]) -> List[Dependency]
+        return [
             dep
             for dep in dependencies
             if dep.name not in self.UNSAFE_PACKAGES
             and self._package.python_constraint.allows_any(dep.python_constraint)
         ]
 
-        return [
-            Incompatibility(
-                [Term(package.to_dependency(), True), Term(dep, False)],
-                DependencyCause(),
+    def _dependers_for(
+        self, package, dependencies
+    ):  # type: (DependencyPackage, List[Dependency]) -> List[Dependency]
+        """
+        Returns the depender of the incompatibility of each of
+        the given dependencies of package.
+
+        The subsequent candidate versions of package that have the same
+        dependency are merged into a single constraint, so that conflicts
+        caused by this dependency are resolved for all of them at once.
+        The neighbouring candidates are always retrieved, so that
+        the incompatibilities do not depend on the state of the caches.
+        """
+        depender = package.to_dependency()
+        if (
+            not dependencies
+            or package.is_root()
+            or package.source_type in {"directory", "file", "git"}
+        ):
+            return [depender] * len(dependencies)
+
+        candidates = sorted(
+            self.search_for(package.dependency), key=lambda p: p.version
+        )
+        versions = [candidate.version for candidate in candidates]
+        if package.version not in versions:
+            return [depender] * len(dependencies)
+
+        index = versions.index(package.version)
+        below = candidates[max(0, index - self.MERGE_DEPTH) : index][::-1]
+        above = candidates[index + 1 : index + 1 + self.MERGE_DEPTH]
+        # The neighbours are retrieved concurrently
+        # but compared in order, as they are needed.
+        self._prefetcher.prefetch(
+            package.name, [candidate.version.text for candidate in below + above]
+        )
+
+        requirements = [dep.to_pep_508() for dep in dependencies]
+        merged = [[package.version] for _ in dependencies]
+        for neighbours in [below, above]:
+            # The dependencies that are still the same
+            # for all the versions seen so far.
+            same = set(range(len(dependencies)))
+            for neighbour in neighbours:
+                neighbour_requirements = self._requirements_of(
+                    neighbour, package.requires_extras
+                )
+                same = {i for i in same if requirements[i] in neighbour_requirements}
+                if not same:
+                    break
+
+                for i in same:
+                    merged[i].append(neighbour.version)
+
+        dependers = []
+        for versions in merged:
+            if len(versions) == 1:
+                dependers.append(depender)
+                continue
+
+            # Only the inspected versions are covered since the versions
+            # between them are not necessarily candidates.
+            merged_depender = depender.with_constraint(VersionUnion.of(*versions))
+            merged_depender.marker = depender.marker
+
+            dependers.append(merged_depender)
+
+        return dependers
+
+    def _requirements_of(self, package, extras):  # type: (Package, list) -> set
+        """
+        Returns the PEP 508 requirements of the relevant dependencies
+        of a candidate version of a package.
+        """
+        self._prefetcher.wait(package.name, package.version.text)
+
+        try:
+            release = self._pool.package(
+                package.name, package.version.text, extras=extras
             )
-            for dep in dependencies
-        ]
+        except PackageNotFound:
+            return set()
+
+        return {
+            dep.to_pep_508() for dep in self._relevant_dependencies(release.requires)
+        }
 
     def complete_package(
         self, package
@@ -459,6 +676,8 @@ class Provider:
             "file",
             "git",
         }:
+            self._prefetcher.wait(package.name, package.version.text)
+
             package = DependencyPackage(
                 package.dependency,
                 self._pool.package(
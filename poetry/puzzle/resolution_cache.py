@@ -0,0 +1,281 @@
+import json
+
+from hashlib import sha256
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from cachy import CacheManager
+
+from poetry.__version__ import __version__
+from poetry.locations import CACHE_DIR
+from poetry.packages import Dependency
+from poetry.packages import Package
+from poetry.repositories import Pool
+from poetry.repositories import Repository
+from poetry.repositories.metadata_store import MetadataStore
+from poetry.utils._compat import Path
+from poetry.version.markers import parse_marker
+
+
+RESOLUTIONS_CACHE_DIR = str(Path(CACHE_DIR) / "cache" / "resolutions")
+
+
+class ResolutionCache:
+    """
+    Stores the packages resolved for a root package so that resolving
+    the same requirements again does not run the version solver.
+
+    Entries are keyed by the requirements of the root package,
+    the repositories of the pool and the locked packages.
+
+    Checking an entry does not require any remote request, so new
+    releases cannot be detected. Instead, each entry records the
+    validators, like the page ETags or the PyPI serials, of the information
+    the repositories have cached for the packages the resolver looked at,
+    and is discarded when one of them changed, and entries expire
+    after max_age minutes.
+    """
+
+    # The version of the format of the entries.
+    CACHE_VERSION = 2
+
+    # Only packages coming from repositories can be cached
+    # since the contents of their releases do not change.
+    _UNCACHEABLE_SOURCES = {"git", "file", "directory"}
+
+    MAX_AGE = 24 * 60
+
+    def __init__(
+        self, directory=None, max_age=MAX_AGE
+    ):  # type: (Optional[str], int) -> None
+        if directory is None:
+            directory = RESOLUTIONS_CACHE_DIR
+
+        self._max_age = max_age
+
+        self._cache = CacheManager(
+            {
+                "default": "resolutions",
+                "serializer": "json",
+                "stores": {"resolutions": {"driver": "metadata", "path": directory}},
+            }
+        )
+        self._cache.extend(
+            "metadata", lambda config: MetadataStore.create(config["path"])
+        )
+
+    def get(
+        self,
+        package,  # type: Package
+        pool,  # type: Pool
+        locked,  # type: Repository
+        use_latest=None,  # type: Optional[List[str]]
+    ):  # type: (...) -> Optional[Tuple[List[Package], List[int]]]
+        if not self._is_cacheable(package.all_requires):
+            return
+
+        key = self._key(package, pool, locked, use_latest)
+        entry = self._cache.get(key)
+        if entry is None:
+            return
+
+        validators = entry.get("validators")
+        if validators is None or validators != self._validators(pool, validators):
+            self._cache.forget(key)
+
+            return
+
+        return [self._load_package(p) for p in entry["packages"]], entry["depths"]
+
+    def put(
+        self,
+        package,  # type: Package
+        pool,  # type: Pool
+        locked,  # type: Repository
+        use_latest,  # type: Optional[List[str]]
+        packages,  # type: List[Package]
+        depths,  # type: List[int]
+        searched,  # type: Iterable[str]
+    ):  # type: (...) -> bool
+        """
+        Stores resolved packages along with the validators of the pages
+        cached for the packages the resolver searched for.
+
+        Returns whether the resolution could be cached.
+        """
+        if not self._is_cacheable(package.all_requires) or any(
+            p.source_type in self._UNCACHEABLE_SOURCES
+            or p.marker.is_empty()
+            or not self._is_cacheable(p.requires)
+            for p in packages
+        ):
+            return False
+
+        self._cache.put(
+            self._key(package, pool, locked, use_latest),
+            {
+                "validators": self._validators(pool, searched),
+                "packages": [self._dump_package(p) for p in packages],
+                "depths": depths,
+            },
+            self._max_age,
+        )
+
+        return True
+
+    def clear(self):  # type: () -> None
+        self._cache.flush()
+
+    def _is_cacheable(self, dependencies):  # type: (List[Dependency]) -> bool
+        return all(
+            not (dep.is_vcs() or dep.is_file() or dep.is_directory())
+            and not dep.marker.is_empty()
+            for dep in dependencies
+        )
+
+    def _key(
+        self, package, pool, locked, use_latest
+    ):  # type: (Package, Pool, Repository, Optional[List[str]]) -> str
+        content = {
+            "poetry": __version__,
+            "cache-version": self.CACHE_VERSION,
+            "name": package.name,
+            "python-versions": package.python_versions,
+            "dependencies": [self._dependency_key(d) for d in package.requires],
+            "dev-dependencies": [self._dependency_key(d) for d in package.dev_requires],
+            "extras": {
+                extra: sorted(d.name for d in deps)
+                for extra, deps in package.extras.items()
+            },
+            "repositories": [
+                [
+                    type(repository).__name__,
+                    getattr(repository, "name", None),
+                    getattr(repository, "url", None),
+                ]
+                for repository in pool.repositories
+            ],
+            "locked": sorted(
+                [p.name, p.version.text, p.source_type, p.source_reference]
+                for p in locked.packages
+            ),
+            "use-latest": None if use_latest is None else sorted(use_latest),
+        }
+
+        return sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+    def _dependency_key(self, dependency):  # type: (Dependency) -> list
+        return [
+            dependency.to_pep_508(),
+            dependency.pretty_constraint,
+            dependency.category,
+            dependency.is_optional(),
+            dependency.allows_prereleases(),
+        ]
+
+    def _validators(
+        self, pool, names
+    ):  # type: (Pool, Iterable[str]) -> Dict[str, List[Optional[str]]]
+        return {
+            name: [repository.cache_validator(name) for repository in pool.repositories]
+            for name in sorted(names)
+        }
+
+    def _dump_package(self, package):  # type: (Package) -> dict
+        return {
+            "name": package.pretty_name,
+            "version": package.pretty_version,
+            "description": package.description,
+            "category": package.category,
+            "optional": package.optional,
+            "python-versions": package.python_versions,
+            "platform": package.platform,
+            "marker": str(package.marker),
+            "hashes": package.hashes,
+            "source": [
+                package.source_type,
+                package.source_url,
+                package.source_reference,
+            ],
+            "requires": [self._dump_dependency(d) for d in package.requires],
+            "extras": {
+                extra: [self._dump_dependency(d) for d in deps]
+                for extra, deps in package.extras.items()
+            },
+            "requires-extras": package.requires_extras,
+        }
+
+    def _dump_dependency(self, dependency):  # type: (Dependency) -> dict
+        return {
+            "name": dependency.pretty_name,
+            "constraint": dependency.pretty_constraint,
+            "optional": dependency.is_optional(),
+            "category": dependency.category,
+            "allows-prereleases": dependency.allows_prereleases(),
+            "python-versions": dependency.python_versions,
+            "transitive-python-versions": dependency.transitive_python_versions,
+            "marker": str(dependency.marker),
+            "extras": dependency.extras,
+            "in-extras": dependency.in_extras,
+            "activated": dependency.is_activated(),
+        }
+
+    def _load_package(self, data):  # type: (dict) -> Package
+        package = Package(data["name"], data["version"], data["version"])
+        package.description = data["description"]
+        package.category = data["category"]
+        package.optional = data["optional"]
+        package.python_versions = data["python-versions"]
+        package.platform = data["platform"]
+        package.marker = parse_marker(data["marker"])
+        package.hashes = data["hashes"]
+        (
+            package.source_type,
+            package.source_url,
+            package.source_reference,
+        ) = data["source"]
+        package.requires = [self._load_dependency(d) for d in data["requires"]]
+
+        # The dependencies of the activated extras are also required,
+        # and share the same instances, like in the packages of repositories.
+        activated = {
+            (d.name, d.to_pep_508()): d for d in package.requires if d.is_activated()
+        }
+        for extra, dependencies in data["extras"].items():
+            package.extras[extra] = []
+            for dependency in map(self._load_dependency, dependencies):
+                if dependency.is_activated():
+                    dependency = activated.get(
+                        (dependency.name, dependency.to_pep_508()), dependency
+                    )
+
+                package.extras[extra].append(dependency)
+
+        package.requires_extras = data["requires-extras"]
+
+        return package
+
+    def _load_dependency(self, data):  # type: (dict) -> Dependency
+        dependency = Dependency(
+            data["name"],
+            data["constraint"],
+            optional=data["optional"],
+            category=data["category"],
+            allows_prereleases=data["allows-prereleases"],
+        )
+        dependency.python_versions = data["python-versions"]
+        if data["transitive-python-versions"] != data["python-versions"]:
+            dependency.transitive_python_versions = data["transitive-python-versions"]
+
+        dependency.marker = parse_marker(data["marker"])
+        dependency.extras.extend(data["extras"])
+        dependency.in_extras.extend(data["in-extras"])
+        if data["activated"]:
+            dependency.activate()
+        else:
+            dependency.deactivate()
+
+        return dependency
@@ -3,6 +3,8 @@ import time
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Set
 
 from poetry.mixology import resolve_version
 from poetry.mixology.failure import SolveFailure
@@ -10,6 +12,7 @@ from poetry.packages import DependencyPackage
 from poetry.packages import Package
 from poetry.semver import parse_constraint
 from poetry.version.markers import AnyMarker
+from poetry.version.simplifier import simplify_marker
 
 from .exceptions import CompatibilityError
 from .exceptions import SolverProblemError
@@ -20,22 +23,50 @@ from .operations import Update
 from .operations.operation import Operation
 
 from .provider import Provider
+from .resolution_cache import ResolutionCache
 
 
 class Solver:
-    def __init__(self, package, pool, installed, locked, io):
+    def __init__(self, package, pool, installed, locked, io, cache=None):
         self._package = package
         self._pool = pool
         self._installed = installed
         self._locked = locked
         self._io = io
+        self._cache = cache  # type: Optional[ResolutionCache]
         self._provider = Provider(self._package, self._pool, self._io)
         self._branches = []
 
     def solve(self, use_latest=None):  # type: (...) -> List[Operation]
         with self._provider.progress():
             start = time.time()
-            packages, depths = self._solve(use_latest=use_latest)
+            result = None
+            if self._cache is not None and not self._updates_locked(use_latest):
+                result = self._cache.get(
+                    self._package, self._pool, self._locked, use_latest
+                )
+
+            if result is not None:
+                packages, depths = result
+
+                self._provider.debug("Reusing the cached resolution")
+            else:
+                try:
+                    packages, depths = self._solve(use_latest=use_latest)
+                finally:
+                    self._provider.prefetcher.shutdown()
+
+                if self._cache is not None:
+                    self._cache.put(
+                        self._package,
+                        self._pool,
+                        self._locked,
+                        use_latest,
+                        packages,
+                        depths,
+                        self._searched_packages(),
+                    )
+
             end = time.time()
 
             if len(self._branches) > 1:
@@ -126,10 +157,6 @@ class Solver:
         )
 
     def solve_in_compatibility_mode(self, constraints, use_latest=None):
-        locked = {}
-        for package in self._locked.packages:
-            locked[package.name] = DependencyPackage(package.to_dependency(), package)
-
         packages = []
         depths = []
         for constraint in constraints:
@@ -151,7 +178,7 @@ class Solver:
                         idx = packages.index(package)
                         pkg = packages[idx]
                         depths[idx] = max(depths[idx], _depths[index])
-                        pkg.marker = pkg.marker.union(package.marker)
+                        pkg.marker = simplify_marker(pkg.marker.union(package.marker))
 
                         for dep in package.requires:
                             if dep not in pkg.requires:
@@ -159,6 +186,19 @@ class Solver:
 
         return packages, depths
 
+    def _updates_locked(self, use_latest):  # type: (Optional[List[str]]) -> bool
+        """
+        Returns whether all the locked packages are updated to their latest
+        versions, whose new releases cached resolutions cannot know about.
+        """
+        if not use_latest or not self._locked.packages:
+            return False
+
+        return all(package.name in use_latest for package in self._locked.packages)
+
+    def _searched_packages(self):  # type: () -> Set[str]
+        return self._provider.searched_packages
+
     def _solve(self, use_latest=None):
         self._branches.append(self._package.python_versions)
 
@@ -192,7 +232,7 @@ class Solver:
 
             package.category = category
             package.optional = optional
-            package.marker = marker
+            package.marker = simplify_marker(marker)
 
             depths.append(depth)
 
@@ -273,8 +313,8 @@ class Solver:
                         child_graph["optional"] = True
 
                     if existing:
-                        existing["marker"] = existing["marker"].union(
-                            child_graph["marker"]
+                        existing["marker"] = simplify_marker(
+                            existing["marker"].union(child_graph["marker"])
                         )
                         continue
 
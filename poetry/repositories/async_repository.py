@@ -0,0 +1,382 @@
+"""
+Asyncio based PyPI and legacy repositories.
+
+They issue their HTTP requests on a single event loop, so that a lot
+of them can be in flight at the same time without using threads,
+and rely on the same caches as their synchronous counterparts.
+
+It requires Python 3.5+ and the aiohttp package,
+installed with the async extra.
+"""
+import asyncio
+import json
+
+from typing import Any
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from poetry.packages import Package
+from poetry.semver import VersionConstraint
+from poetry.utils._compat import decode
+from poetry.utils._compat import urlparse
+from poetry.utils.helpers import canonicalize_name
+
+from .auth import Auth
+from .base_repository import BaseRepository
+from .exceptions import PackageNotFound
+from .exceptions import RepositoryError
+from .http_client import HTTPClient
+from .legacy_repository import LegacyRepository
+from .legacy_repository import Page
+from .pypi_repository import PyPiRepository
+
+
+class AsyncHTTPMixin(object):
+    """
+    Sends the HTTP requests of a repository with aiohttp.
+
+    Failed requests are retried like the ones of the HTTP client
+    of the repository.
+    """
+
+    MAX_CONCURRENCY = 100
+    RETRY_STATUSES = {500, 502, 503, 504}
+
+    _http_client = None  # type: HTTPClient
+
+    def _init_async(
+        self, max_concurrency, auth=None
+    ):  # type: (int, Optional[Auth]) -> None
+        if aiohttp is None:
+            raise RepositoryError(
+                "The aiohttp package is required to use asyncio repositories"
+            )
+
+        self._max_concurrency = max_concurrency
+        self._auth = auth
+        self._async_session = None  # type: Optional[aiohttp.ClientSession]
+
+    async def search_async(self, query, mode=0):  # type: (str, int) -> List[Package]
+        # The search API of PyPI is only available through XML-RPC
+        return await asyncio.get_event_loop().run_in_executor(
+            None, self.search, query, mode
+        )
+
+    async def close_async(self):  # type: () -> None
+        if self._async_session is not None:
+            await self._async_session.close()
+
+            self._async_session = None
+
+    async def _fetch(
+        self, url, headers=None
+    ):  # type: (str, Optional[dict]) -> Tuple[int, Mapping[str, str], bytes]
+        if self._async_session is None:
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._max_concurrency,
+                    limit_per_host=self._http_client.pool_size,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self._http_client.timeout),
+            )
+
+        url, auth = self._request_auth(url)
+        retries = self._http_client.retries
+        for attempt in range(retries + 1):
+            try:
+                async with self._async_session.get(
+                    url, headers=headers, auth=auth
+                ) as response:
+                    if response.status not in self.RETRY_STATUSES or attempt == retries:
+                        return response.status, response.headers, await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == retries:
+                    raise
+
+            await asyncio.sleep(self._http_client.backoff_factor * (2 ** attempt))
+
+    def _request_auth(
+        self, url
+    ):  # type: (str) -> Tuple[str, Optional[aiohttp.BasicAuth]]
+        """
+        Moves the credentials of a URL, like requests does,
+        to the authentication of the request, falling back
+        to the credentials of the repository for its host.
+        """
+        parts = urlparse.urlsplit(url)
+        if parts.username is None:
+            if self._auth is None or parts.hostname != self._auth.hostname:
+                return url, None
+
+            return url, aiohttp.BasicAuth(self._auth.username, self._auth.password)
+
+        netloc = parts.hostname
+        if parts.port is not None:
+            netloc += ":{}".format(parts.port)
+
+        return (
+            urlparse.urlunsplit(parts._replace(netloc=netloc)),
+            aiohttp.BasicAuth(
+                urlparse.unquote(parts.username),
+                urlparse.unquote(parts.password or ""),
+            ),
+        )
+
+
+class AsyncPyPiRepository(AsyncHTTPMixin, PyPiRepository):
+    def __init__(
+        self,
+        url="https://pypi.org/",  # type: str
+        disable_cache=False,  # type: bool
+        fallback=True,  # type: bool
+        http_client=None,  # type: Optional[HTTPClient]
+        max_concurrency=AsyncHTTPMixin.MAX_CONCURRENCY,  # type: int
+    ):  # type: (...) -> None
+        super(AsyncPyPiRepository, self).__init__(
+            url=url,
+            disable_cache=disable_cache,
+            fallback=fallback,
+            http_client=http_client,
+        )
+
+        self._init_async(max_concurrency)
+
+    async def find_packages_async(
+        self,
+        name,  # type: str
+        constraint=None,  # type: Union[VersionConstraint, str, None]
+        extras=None,  # type: Union[list, None]
+        allow_prereleases=False,  # type: bool
+    ):  # type: (...) -> List[Package]
+        return self._find_packages_in_info(
+            name,
+            await self.get_package_info_async(name),
+            constraint=constraint,
+            extras=extras,
+            allow_prereleases=allow_prereleases,
+        )
+
+    async def package_async(
+        self, name, version, extras=None
+    ):  # type: (str, str, Union[list, None]) -> Package
+        return self._package_from_release_info(
+            name, version, await self.get_release_info_async(name, version), extras
+        )
+
+    async def get_package_info_async(self, name):  # type: (str) -> dict
+        cached = self._get_cached_package_info(name)
+        if cached is not None:
+            return cached
+
+        data = await self._get_async("pypi/{}/json".format(name))
+        if data is None:
+            raise PackageNotFound("Package [{}] not found.".format(name))
+
+        self._cache_package_info(name, data)
+
+        return data
+
+    async def get_release_info_async(self, name, version):  # type: (str, str) -> dict
+        cached = self._get_cached_release_info(name, version)
+        if cached is not None:
+            return cached
+
+        self._log("Getting info for {} ({}) from PyPI".format(name, version), "debug")
+
+        json_data = await self._get_async("pypi/{}/{}/json".format(name, version))
+        if json_data is None:
+            raise PackageNotFound("Package [{}] not found.".format(name))
+
+        if self._fallback and json_data["info"]["requires_dist"] is None:
+            # Archives might have to be inspected, which is blocking
+            data = await asyncio.get_event_loop().run_in_executor(
+                None, self._release_info_from_json, version, json_data
+            )
+        else:
+            data = self._release_info_from_json(version, json_data)
+
+        self._cache_release_info(name, version, data)
+
+        return data
+
+    async def _get_async(self, endpoint):  # type: (str) -> Union[dict, None]
+        status, _, content = await self._fetch(self._url + endpoint)
+        if status == 404:
+            return None
+
+        return json.loads(decode(content))
+
+
+class AsyncLegacyRepository(AsyncHTTPMixin, LegacyRepository):
+    def __init__(
+        self,
+        name,  # type: str
+        url,  # type: str
+        auth=None,  # type: Optional[Auth]
+        disable_cache=False,  # type: bool
+        http_client=None,  # type: Optional[HTTPClient]
+        max_concurrency=AsyncHTTPMixin.MAX_CONCURRENCY,  # type: int
+    ):  # type: (...) -> None
+        super(AsyncLegacyRepository, self).__init__(
+            name, url, auth=auth, disable_cache=disable_cache, http_client=http_client
+        )
+
+        self._init_async(max_concurrency, auth=auth)
+
+    async def find_packages_async(
+        self,
+        name,  # type: str
+        constraint=None,  # type: Union[VersionConstraint, str, None]
+        extras=None,  # type: Union[list, None]
+        allow_prereleases=False,  # type: bool
+    ):  # type: (...) -> List[Package]
+        # Once the page is retrieved, finding the packages does not block
+        await self._get_page_async(
+            "/{}/".format(canonicalize_name(name).replace(".", "-"))
+        )
+
+        return self.find_packages(
+            name, constraint, extras=extras, allow_prereleases=allow_prereleases
+        )
+
+    async def package_async(
+        self, name, version, extras=None
+    ):  # type: (str, str, Union[list, None]) -> Package
+        await self._get_page_async(
+            "/{}/".format(canonicalize_name(name).replace(".", "-"))
+        )
+
+        if self._get_cached_release_info(name, version) is not None:
+            return self.package(name, version, extras=extras)
+
+        # The dependencies are only known by inspecting the archives,
+        # which is blocking
+        return await asyncio.get_event_loop().run_in_executor(
+            None, self.package, name, version, extras
+        )
+
+    async def _get_page_async(self, endpoint):  # type: (str) -> Union[Page, None]
+        if endpoint not in self._pages:
+            self._pages[endpoint] = await self._get_async(endpoint)
+
+        return self._pages[endpoint]
+
+    async def _get_async(self, endpoint):  # type: (str) -> Union[Page, None]
+        status, headers, content = await self._fetch(
+            self._url + endpoint, headers={"Accept": self.ACCEPT}
+        )
+        if status == 404:
+            return
+
+        return self._create_page(endpoint, headers, content)
+
+
+AsyncRepository = Union[AsyncPyPiRepository, AsyncLegacyRepository]
+
+
+class AsyncRepositoryAdapter(BaseRepository):
+    """
+    Exposes the asyncio repository through the synchronous interface
+    of repositories, so that it can be used by pools and providers.
+
+    Batches of requests are run concurrently on the event loop
+    of the adapter.
+    """
+
+    def __init__(self, repository):  # type: (AsyncRepository) -> None
+        super(AsyncRepositoryAdapter, self).__init__()
+
+        self._repository = repository
+        self._loop = asyncio.new_event_loop()
+
+    @property
+    def repository(self):  # type: () -> AsyncRepository
+        return self._repository
+
+    @property
+    def name(self):  # type: () -> str
+        return self._repository.name
+
+    @property
+    def url(self):  # type: () -> str
+        return self._repository.url
+
+    def find_packages(
+        self, name, constraint=None, extras=None, allow_prereleases=False
+    ):  # type: (str, Any, Union[list, None], bool) -> List[Package]
+        return self._run(
+            self._repository.find_packages_async(
+                name, constraint, extras=extras, allow_prereleases=allow_prereleases
+            )
+        )
+
+    def package(
+        self, name, version, extras=None
+    ):  # type: (str, str, Union[list, None]) -> Package
+        return self._run(self._repository.package_async(name, version, extras=extras))
+
+    def cache_validator(self, name):  # type: (str) -> Union[str, None]
+        return self._repository.cache_validator(name)
+
+    def search(self, query, mode=BaseRepository.SEARCH_FULLTEXT):
+        return self._run(self._repository.search_async(query, mode=mode))
+
+    def find_packages_many(
+        self, requests, allow_prereleases=False
+    ):  # type: (List[Tuple[str, Any]], bool) -> List[List[Package]]
+        """
+        Finds the packages matching each (name, constraint) request,
+        returning an empty list for unknown packages.
+        """
+        results = self._gather(
+            [
+                self._repository.find_packages_async(
+                    name, constraint, allow_prereleases=allow_prereleases
+                )
+                for name, constraint in requests
+            ]
+        )
+
+        return [[] if result is None else result for result in results]
+
+    def packages_many(
+        self, requests
+    ):  # type: (List[Tuple[str, str]]) -> List[Union[Package, None]]
+        """
+        Retrieves the package of each (name, version) request,
+        returning None for unknown packages.
+        """
+        return self._gather(
+            [
+                self._repository.package_async(name, version)
+                for name, version in requests
+            ]
+        )
+
+    def close(self):  # type: () -> None
+        self._run(self._repository.close_async())
+        self._loop.close()
+
+    def _gather(self, coroutines):  # type: (list) -> list
+        results = self._run(self._gather_async(coroutines))
+        for i, result in enumerate(results):
+            if isinstance(result, PackageNotFound):
+                results[i] = None
+            elif isinstance(result, Exception):
+                raise result
+
+        return results
+
+    async def _gather_async(self, coroutines):  # type: (list) -> list
+        return list(await asyncio.gather(*coroutines, return_exceptions=True))
+
+    def _run(self, coroutine):  # type: (Any) -> Any
+        return self._loop.run_until_complete(coroutine)
@@ -10,6 +10,18 @@ class Auth(AuthBase):
         self._hostname = urlparse.urlparse(url).hostname
         self._auth = HTTPBasicAuth(username, password)
 
+    @property
+    def hostname(self):  # type: () -> str
+        return self._hostname
+
+    @property
+    def username(self):  # type: () -> str
+        return self._auth.username
+
+    @property
+    def password(self):  # type: () -> str
+        return self._auth.password
+
     def __call__(self, r):  # type: (Request) -> Request
         if urlparse.urlparse(r.url).hostname != self._hostname:
             return r
@@ -16,10 +16,22 @@ class BaseRepository(object):
     def package(self, name, version, extras=None):
         raise NotImplementedError()
 
+    def cache_validator(self, name):
+        """
+        Returns the validator, like an ETag, of the information
+        about the given package cached by the repository, if any.
+        """
+        return
+
     def find_packages(
         self, name, constraint=None, extras=None, allow_prereleases=False
     ):
         raise NotImplementedError()
 
+    def count_packages(self, name, constraint=None, allow_prereleases=False):
+        return len(
+            self.find_packages(name, constraint, allow_prereleases=allow_prereleases)
+        )
+
     def search(self, query, mode=SEARCH_FULLTEXT):
         raise NotImplementedError()
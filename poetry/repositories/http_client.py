@@ -0,0 +1,167 @@
+from typing import Any
+from typing import Optional
+from typing import Union
+
+import requests
+
+from cachecontrol.adapter import CacheControlAdapter
+from cachecontrol.cache import BaseCache
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3 import util
+
+
+class SharedPoolAdapter(HTTPAdapter):
+    """
+    A transport adapter using connection pools owned by an HTTPClient
+    instead of its own, so that connections to a host are reused
+    by every session of the client.
+    """
+
+    def __init__(self, poolmanager=None, *args, **kwargs):
+        self._shared_poolmanager = poolmanager
+
+        super(SharedPoolAdapter, self).__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self._shared_poolmanager is None:
+            super(SharedPoolAdapter, self).init_poolmanager(*args, **kwargs)
+
+            return
+
+        self.poolmanager = self._shared_poolmanager
+
+    def close(self):
+        if self._shared_poolmanager is None:
+            super(SharedPoolAdapter, self).close()
+
+            return
+
+        # The shared connection pools are closed by the client
+        for proxy in self.proxy_manager.values():
+            proxy.clear()
+
+
+class CachedSharedPoolAdapter(CacheControlAdapter, SharedPoolAdapter):
+
+    pass
+
+
+class Session(requests.Session):
+    """
+    A session applying a default timeout to its requests.
+    """
+
+    def __init__(self, timeout=None):  # type: (Optional[float]) -> None
+        super(Session, self).__init__()
+
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+
+        return super(Session, self).request(method, url, **kwargs)
+
+
+class HTTPClient(object):
+    """
+    An HTTP client keeping a pool of connections for each host
+    and retrying failed requests with an exponential backoff.
+
+    Repositories of the same pool share a client, so that metadata
+    requests, downloads and uploads all reuse the same connections.
+    """
+
+    POOL_SIZE = 10
+    RETRIES = 3
+    BACKOFF_FACTOR = 0.5
+    TIMEOUT = 15
+
+    def __init__(
+        self,
+        pool_size=POOL_SIZE,  # type: int
+        retries=RETRIES,  # type: int
+        backoff_factor=BACKOFF_FACTOR,  # type: float
+        timeout=TIMEOUT,  # type: Union[float, None]
+    ):  # type: (...) -> None
+        self._pool_size = pool_size
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+        self._timeout = timeout
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session = None  # type: Optional[Session]
+
+    @property
+    def pool_size(self):  # type: () -> int
+        return self._pool_size
+
+    @property
+    def retries(self):  # type: () -> int
+        return self._retries
+
+    @property
+    def backoff_factor(self):  # type: () -> float
+        return self._backoff_factor
+
+    @property
+    def timeout(self):  # type: () -> Union[float, None]
+        return self._timeout
+
+    @property
+    def poolmanager(self):
+        return self._adapter.poolmanager
+
+    def adapter(
+        self, cache=None, max_retries=None
+    ):  # type: (Optional[BaseCache], Optional[util.Retry]) -> SharedPoolAdapter
+        """
+        Creates a transport adapter using the connections of the client.
+
+        If a cache is given, responses are cached with CacheControl.
+        Failed requests are retried like the other requests of the client
+        unless a retry policy is given.
+        """
+        if max_retries is None:
+            max_retries = util.Retry(
+                total=self._retries,
+                backoff_factor=self._backoff_factor,
+                status_forcelist=[500, 502, 503, 504],
+                raise_on_status=False,
+            )
+
+        kwargs = {
+            "poolmanager": self.poolmanager,
+            "pool_connections": self._pool_size,
+            "pool_maxsize": self._pool_size,
+            "max_retries": max_retries,
+        }
+        if cache is not None:
+            return CachedSharedPoolAdapter(cache=cache, **kwargs)
+
+        return SharedPoolAdapter(**kwargs)
+
+    def session(self, cache=None):  # type: (Optional[BaseCache]) -> Session
+        """
+        Creates a new session using the connections of the client.
+
+        If a cache is given, responses are cached with CacheControl.
+        """
+        adapter = self.adapter(cache=cache)
+
+        session = Session(timeout=self._timeout)
+        for scheme in ("http://", "https://"):
+            session.mount(scheme, adapter)
+
+        return session
+
+    def get(self, url, **kwargs):  # type: (str, Any) -> requests.Response
+        """
+        Sends a GET request with a session of the client
+        that does not cache responses, like archive downloads.
+        """
+        if self._session is None:
+            self._session = self.session()
+
+        return self._session.get(url, **kwargs)
+
+    def close(self):  # type: () -> None
+        self._adapter.close()
@@ -0,0 +1,202 @@
+import zipfile
+
+from tempfile import TemporaryFile
+from typing import List
+from typing import Tuple
+
+import pkginfo
+
+from requests import HTTPError
+from requests import Session
+
+from .exceptions import RepositoryError
+
+
+class HTTPRangeRequestUnsupported(RepositoryError):
+
+    pass
+
+
+class LazyFileOverHTTP(object):
+    """
+    A read-only file-like object retrieving the content
+    of a remote file on demand, with HTTP range requests.
+
+    Retrieved bytes are written at their offset in a sparse
+    temporary file so that they are only requested once.
+    """
+
+    CHUNK_SIZE = 10 * 1024
+
+    def __init__(
+        self, url, session, chunk_size=CHUNK_SIZE
+    ):  # type: (str, Session, int) -> None
+        response = session.head(url, allow_redirects=True)
+        if not response.ok:
+            # Some servers do not support HEAD requests
+            raise HTTPRangeRequestUnsupported(
+                "Unable to retrieve information about {}".format(url)
+            )
+
+        try:
+            self._length = int(response.headers["Content-Length"])
+        except (KeyError, ValueError):
+            raise HTTPRangeRequestUnsupported("Unable to determine the file size")
+
+        if response.headers.get("Accept-Ranges") != "bytes":
+            raise HTTPRangeRequestUnsupported("Range requests are not supported")
+
+        # The ranges of encoded responses are ranges of the encoded content
+        if response.headers.get("Content-Encoding", "identity") != "identity":
+            raise HTTPRangeRequestUnsupported(
+                "Range requests are not supported for encoded content"
+            )
+
+        self._url = url
+        self._session = session
+        self._chunk_size = chunk_size
+        self._position = 0
+        self._retrieved = []  # type: List[Tuple[int, int]]
+        self._file = TemporaryFile()
+        self._file.truncate(self._length)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):  # type: () -> None
+        self._file.close()
+
+    def readable(self):  # type: () -> bool
+        return True
+
+    def seekable(self):  # type: () -> bool
+        return True
+
+    def tell(self):  # type: () -> int
+        return self._position
+
+    def seek(self, offset, whence=0):  # type: (int, int) -> int
+        if whence == 1:
+            offset += self._position
+        elif whence == 2:
+            offset += self._length
+
+        self._position = max(0, offset)
+
+        return self._position
+
+    def read(self, size=-1):  # type: (int) -> bytes
+        start = min(self._position, self._length)
+        if size < 0:
+            end = self._length
+        else:
+            end = min(self._length, start + size)
+
+        # Reading ahead to avoid a request for each small read
+        self.retrieve(start, min(self._length, max(end, start + self._chunk_size)))
+
+        self._file.seek(start)
+        data = self._file.read(end - start)
+        self._position = start + len(data)
+
+        return data
+
+    def retrieve(self, start, end):  # type: (int, int) -> None
+        """
+        Makes sure the bytes in [start, end) have been retrieved.
+        """
+        for gap_start, gap_end in self._gaps(start, end):
+            try:
+                response = self._session.get(
+                    self._url,
+                    headers={"Range": "bytes={}-{}".format(gap_start, gap_end - 1)},
+                    stream=True,
+                )
+            except HTTPError as e:
+                raise HTTPRangeRequestUnsupported(str(e))
+
+            # Servers may reject range requests they advertised (416, 403, 501...)
+            # or ignore them and send the whole file, in which case the caller
+            # falls back to downloading it.
+            if response.status_code != 206:
+                response.close()
+
+                raise HTTPRangeRequestUnsupported(
+                    "Range request failed with status {}".format(response.status_code)
+                )
+
+            self._file.seek(gap_start)
+            for chunk in response.iter_content(chunk_size=self._chunk_size):
+                self._file.write(chunk)
+
+            self._add_retrieved(gap_start, gap_end)
+
+    def _gaps(self, start, end):  # type: (int, int) -> List[Tuple[int, int]]
+        gaps = []
+        for retrieved_start, retrieved_end in self._retrieved:
+            if retrieved_end <= start:
+                continue
+
+            if retrieved_start >= end:
+                break
+
+            if retrieved_start > start:
+                gaps.append((start, retrieved_start))
+
+            start = max(start, retrieved_end)
+
+        if start < end:
+            gaps.append((start, end))
+
+        return gaps
+
+    def _add_retrieved(self, start, end):  # type: (int, int) -> None
+        merged = []
+        for retrieved_start, retrieved_end in sorted(self._retrieved + [(start, end)]):
+            if merged and retrieved_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], retrieved_end))
+            else:
+                merged.append((retrieved_start, retrieved_end))
+
+        self._retrieved = merged
+
+
+def metadata_from_wheel_url(
+    url, session
+):  # type: (str, Session) -> pkginfo.Distribution
+    """
+    Reads the metadata of a remote wheel without downloading it entirely.
+
+    Only the end of the archive, holding the central directory,
+    and the METADATA file are retrieved.
+
+    Raises HTTPRangeRequestUnsupported if the server
+    does not support range requests.
+    """
+    with LazyFileOverHTTP(url, session) as f:
+        # The central directory is most likely in the last chunk
+        # of the archive, so we retrieve it in a single request.
+        f.retrieve(max(0, f.seek(0, 2) - f.CHUNK_SIZE), f.tell())
+        f.seek(0)
+
+        try:
+            with zipfile.ZipFile(f) as archive:
+                metadata = [
+                    name
+                    for name in archive.namelist()
+                    if name.count("/") == 1 and name.endswith(".dist-info/METADATA")
+                ]
+                if not metadata:
+                    raise ValueError("No METADATA file found in {}".format(url))
+
+                data = archive.read(metadata[0])
+        except zipfile.BadZipfile as e:
+            raise ValueError(str(e))
+
+    meta = pkginfo.Distribution()
+    meta.parse(data)
+
+    return meta
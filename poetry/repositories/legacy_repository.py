@@ -1,4 +1,5 @@
 import cgi
+import json
 import re
 
 try:
@@ -7,24 +8,26 @@ except ImportError:
     import urlparse
 
 try:
-    from html import unescape
+    from html.parser import HTMLParser
 except ImportError:
-    try:
-        from html.parser import HTMLParser
-    except ImportError:
-        from HTMLParser import HTMLParser
+    from HTMLParser import HTMLParser
 
+try:
+    from html import unescape
+except ImportError:
     unescape = HTMLParser().unescape
 
 from collections import defaultdict
+from typing import Any
+from typing import Dict
 from typing import Generator
+from typing import List
+from typing import Mapping
 from typing import Optional
 from typing import Union
 
 import html5lib
-import requests
 
-from cachecontrol import CacheControl
 from cachecontrol.caches.file_cache import FileCache
 from cachy import CacheManager
 
@@ -38,19 +41,41 @@ from poetry.semver import parse_constraint
 from poetry.semver import Version
 from poetry.semver import VersionConstraint
 from poetry.semver import VersionRange
+from poetry.utils._compat import OrderedDict
 from poetry.utils._compat import Path
+from poetry.utils._compat import decode
 from poetry.utils.helpers import canonicalize_name
 from poetry.utils.patterns import wheel_file_re
 from poetry.version.markers import InvalidMarker
 
 from .auth import Auth
 from .exceptions import PackageNotFound
+from .http_client import HTTPClient
+from .metadata_store import MetadataStore
+from .pypi_repository import ARCHIVES_CACHE_DIR
 from .pypi_repository import PyPiRepository
 
 
+class AnchorParser(HTMLParser):
+    """
+    Collects the attributes of every anchor of an HTML document
+    in a single pass, without building a document tree.
+    """
+
+    def __init__(self):
+        HTMLParser.__init__(self)
+
+        self.anchors = []  # type: List[Dict[str, str]]
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self.anchors.append(dict(attrs))
+
+
 class Page:
 
     VERSION_REGEX = re.compile(r"(?i)([a-z0-9_\-.]+?)-(?=\d)([a-z0-9_.!+-]+)")
+    HASH_NAMES = ["sha256", "sha512", "sha384", "sha224", "sha1", "md5"]
     SUPPORTED_FORMATS = [
         ".tar.gz",
         ".whl",
@@ -74,38 +99,71 @@ class Page:
                 encoding = params["charset"]
 
         self._content = content
+        self._encoding = encoding
+        self._links = None  # type: Union[List[Link], None]
+        self._links_by_version = None  # type: Union[Dict[Version, List[Link]], None]
 
-        if encoding is None:
-            self._parsed = html5lib.parse(content, namespaceHTMLElements=False)
-        else:
-            self._parsed = html5lib.parse(
-                content, transport_encoding=encoding, namespaceHTMLElements=False
-            )
+    @classmethod
+    def from_links(cls, url, links):  # type: (str, List[Link]) -> Page
+        """
+        Creates a page from already parsed links.
+        """
+        page = cls(url, "", {})
+        page._links = links
 
-    @property
-    def versions(self):  # type: () -> Generator[Version]
-        seen = set()
-        for link in self.links:
-            version = self.link_version(link)
+        return page
 
-            if not version:
-                continue
+    @classmethod
+    def from_json(cls, url, data):  # type: (str, dict) -> Page
+        """
+        Creates a page from the JSON form of a simple repository page,
+        as described in PEP 691.
+        """
+        if not url.endswith("/"):
+            url += "/"
 
-            if version in seen:
+        links = []
+        for file in data.get("files", []):
+            href = file["url"]
+            if not href.startswith(("https://", "http://")):
+                href = urlparse.urljoin(url, href)
+
+            hashes = file.get("hashes") or {}
+            if "#" not in href:
+                for hash_name in cls.HASH_NAMES:
+                    if hashes.get(hash_name):
+                        href += "#{}={}".format(hash_name, hashes[hash_name])
+                        break
+
+            link = Link(href, url, requires_python=file.get("requires-python"))
+            if link.ext not in cls.SUPPORTED_FORMATS:
                 continue
 
-            seen.add(version)
+            links.append(link)
+
+        return cls.from_links(url, links)
 
-            yield version
+    @property
+    def versions(self):  # type: () -> List[Version]
+        return list(self._get_links_by_version().keys())
 
     @property
-    def links(self):  # type: () -> Generator[Link]
-        for anchor in self._parsed.findall(".//a"):
+    def links(self):  # type: () -> List[Link]
+        if self._links is None:
+            self._links = list(self._parse_links())
+
+        return self._links
+
+    def _parse_links(self):  # type: () -> Generator[Link]
+        for anchor in self._parse_anchors():
             if anchor.get("href"):
                 href = anchor.get("href")
-                url = self.clean_link(urlparse.urljoin(self._url, href))
-                pyrequire = anchor.get("data-requires-python")
-                pyrequire = unescape(pyrequire) if pyrequire else None
+                if not href.startswith(("https://", "http://")):
+                    href = urlparse.urljoin(self._url, href)
+
+                url = self.clean_link(href)
+                # Attribute values are already unescaped by the parsers
+                pyrequire = anchor.get("data-requires-python") or None
 
                 link = Link(url, self, requires_python=pyrequire)
 
@@ -114,10 +172,94 @@ class Page:
 
                 yield link
 
-    def links_for_version(self, version):  # type: (Version) -> Generator[Link]
-        for link in self.links:
-            if self.link_version(link) == version:
-                yield link
+    def _parse_anchors(self):  # type: () -> List[Dict[str, str]]
+        content = self._content
+        if isinstance(content, bytes):
+            if self._encoding is None and not self._is_ascii(content):
+                # Without a charset, the encoding must be sniffed from
+                # the content itself, <meta charset> included, like html5lib does.
+                return self._parse_anchors_with_html5lib()
+
+            content = decode(content, [self._encoding] if self._encoding else None)
+
+        # Simple pages are mostly a flat list of anchors, so we extract them
+        # with regular expressions if the page has nothing that could trip
+        # them up and if every anchor opening tag has been understood.
+        if not self._unsafe_re.search(content):
+            content = self._comment_re.sub("", content)
+            anchors = [
+                self._parse_attributes(m.group(1))
+                for m in self._anchor_re.finditer(content)
+            ]
+            if len(anchors) == len(self._anchor_start_re.findall(content)):
+                return anchors
+
+        parser = AnchorParser()
+        try:
+            parser.feed(content)
+            parser.close()
+
+            return parser.anchors
+        except Exception:
+            # The page is too malformed for the standard parser
+            # so we fall back to the much slower html5lib.
+            return self._parse_anchors_with_html5lib()
+
+    def _parse_anchors_with_html5lib(self):  # type: () -> List[Dict[str, str]]
+        if self._encoding is None:
+            parsed = html5lib.parse(self._content, namespaceHTMLElements=False)
+        else:
+            parsed = html5lib.parse(
+                self._content,
+                transport_encoding=self._encoding,
+                namespaceHTMLElements=False,
+            )
+
+        return [anchor.attrib for anchor in parsed.findall(".//a")]
+
+    @staticmethod
+    def _is_ascii(content):  # type: (bytes) -> bool
+        # Every encoding html5lib could sniff decodes ASCII content the same way
+        try:
+            content.decode("ascii")
+        except UnicodeDecodeError:
+            return False
+
+        return True
+
+    def _parse_attributes(self, attributes):  # type: (str) -> Dict[str, str]
+        parsed = {}
+        for m in self._attribute_re.finditer(attributes):
+            value = m.group(2)
+            if value is None:
+                value = m.group(3)
+
+            if value is None:
+                value = m.group(4)
+
+            parsed[m.group(1).lower()] = unescape(value) if value else value
+
+        return parsed
+
+    def links_for_version(self, version):  # type: (Version) -> List[Link]
+        return self._get_links_by_version().get(version, [])
+
+    def _get_links_by_version(self):  # type: () -> Dict[Version, List[Link]]
+        if self._links_by_version is None:
+            links_by_version = OrderedDict()
+            for link in self.links:
+                version = self.link_version(link)
+                if not version:
+                    continue
+
+                if version not in links_by_version:
+                    links_by_version[version] = []
+
+                links_by_version[version].append(link)
+
+            self._links_by_version = links_by_version
+
+        return self._links_by_version
 
     def link_version(self, link):  # type: (Link) -> Union[Version, None]
         m = wheel_file_re.match(link.filename)
@@ -140,6 +282,19 @@ class Page:
 
     _clean_re = re.compile(r"[^a-z0-9$&+,/:;=?@.#%_\\|-]", re.I)
 
+    _attribute_re = re.compile(
+        r"""([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?"""
+    )
+    _anchor_re = re.compile(
+        r"""<a((?:\s+[^\s"'>/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'>]+))?)*)\s*/?>""",
+        re.I,
+    )
+    _anchor_start_re = re.compile(r"<a[\s/>]", re.I)
+    _comment_re = re.compile(r"<!--.*?-->", re.S)
+    _unsafe_re = re.compile(
+        r"<!\[CDATA\[|<script|<style|<textarea|<base[\s/>]", re.I
+    )
+
     def clean_link(self, url):
         """Makes sure a link is fully encoded.  That is, if a ' ' shows up in
         the link, it will be rewritten to %20 (while not over-quoting
@@ -148,9 +303,27 @@ class Page:
 
 
 class LegacyRepository(PyPiRepository):
+
+    JSON_CONTENT_TYPE = "application/vnd.pypi.simple.v1+json"
+
+    # The JSON form of simple pages (PEP 691) is preferred
+    # since it is much cheaper to parse than the HTML one.
+    ACCEPT = ", ".join(
+        [
+            JSON_CONTENT_TYPE,
+            "application/vnd.pypi.simple.v1+html;q=0.2",
+            "text/html;q=0.01",
+        ]
+    )
+
     def __init__(
-        self, name, url, auth=None, disable_cache=False
-    ):  # type: (str, str, Optional[Auth], bool) -> None
+        self,
+        name,  # type: str
+        url,  # type: str
+        auth=None,  # type: Optional[Auth]
+        disable_cache=False,  # type: bool
+        http_client=None,  # type: Optional[HTTPClient]
+    ):  # type: (...) -> None
         if name == "pypi":
             raise ValueError("The name [pypi] is reserved for repositories")
 
@@ -164,15 +337,24 @@ class LegacyRepository(PyPiRepository):
                 "default": "releases",
                 "serializer": "json",
                 "stores": {
-                    "releases": {"driver": "file", "path": str(self._cache_dir)},
+                    "releases": {"driver": "metadata", "path": str(self._cache_dir)},
                     "packages": {"driver": "dict"},
                     "matches": {"driver": "dict"},
+                    "pages": {"driver": "metadata", "path": str(self._cache_dir)},
+                    "archives": {"driver": "metadata", "path": ARCHIVES_CACHE_DIR},
                 },
             }
         )
+        self._cache.extend(
+            "metadata", lambda config: MetadataStore.create(config["path"])
+        )
+
+        if http_client is None:
+            http_client = HTTPClient()
 
-        self._session = CacheControl(
-            requests.session(), cache=FileCache(str(self._cache_dir / "_http"))
+        self._http_client = http_client
+        self._session = http_client.session(
+            cache=FileCache(str(self._cache_dir / "_http"))
         )
 
         url_parts = urlparse.urlparse(self._url)
@@ -181,15 +363,49 @@ class LegacyRepository(PyPiRepository):
 
         self._disable_cache = disable_cache
 
+        # The pages retrieved during this run, by endpoint
+        self._pages = {}  # type: Dict[str, Union[Page, None]]
+
     @property
     def name(self):
         return self._name
 
+    @property
+    def url(self):  # type: () -> str
+        return self._url
+
     def find_packages(
         self, name, constraint=None, extras=None, allow_prereleases=False
     ):
         packages = []
 
+        for version in self._find_versions(name, constraint, allow_prereleases):
+            package = Package(name, version)
+            package.source_type = "legacy"
+            package.source_url = self._url
+
+            if extras is not None:
+                package.requires_extras = extras
+
+            packages.append(package)
+
+        self._log(
+            "{} packages found for {} {}".format(
+                len(packages), name, str(constraint or "*")
+            ),
+            level="debug",
+        )
+
+        return packages
+
+    def count_packages(
+        self, name, constraint=None, allow_prereleases=False
+    ):  # type: (str, Any, bool) -> int
+        return len(self._find_versions(name, constraint, allow_prereleases))
+
+    def _find_versions(
+        self, name, constraint=None, allow_prereleases=False
+    ):  # type: (str, Any, bool) -> List[Version]
         if constraint is None:
             constraint = "*"
 
@@ -210,38 +426,23 @@ class LegacyRepository(PyPiRepository):
             key = "{}:{}".format(key, str(constraint))
 
         if self._cache.store("matches").has(key):
-            versions = self._cache.store("matches").get(key)
-        else:
-            page = self._get("/{}/".format(canonicalize_name(name).replace(".", "-")))
-            if page is None:
-                return []
-
-            versions = []
-            for version in page.versions:
-                if version.is_prerelease() and not allow_prereleases:
-                    continue
-
-                if constraint.allows(version):
-                    versions.append(version)
-
-            self._cache.store("matches").put(key, versions, 5)
+            return self._cache.store("matches").get(key)
 
-        for version in versions:
-            package = Package(name, version)
-            package.source_type = "legacy"
-            package.source_url = self._url
+        page = self._get_page("/{}/".format(canonicalize_name(name).replace(".", "-")))
+        if page is None:
+            return []
 
-            if extras is not None:
-                package.requires_extras = extras
+        versions = []
+        for version in page.versions:
+            if version.is_prerelease() and not allow_prereleases:
+                continue
 
-            packages.append(package)
+            if constraint.allows(version):
+                versions.append(version)
 
-        self._log(
-            "{} packages found for {} {}".format(len(packages), name, str(constraint)),
-            level="debug",
-        )
+        self._cache.store("matches").put(key, versions, 5)
 
-        return packages
+        return versions
 
     def package(
         self, name, version, extras=None
@@ -324,8 +525,20 @@ class LegacyRepository(PyPiRepository):
 
             return package
 
+    def cache_validator(self, name):  # type: (str) -> Optional[str]
+        if self._disable_cache:
+            return
+
+        cached = self._cache.store("pages").get(
+            "/{}/".format(canonicalize_name(name).replace(".", "-"))
+        )
+        if cached is None:
+            return
+
+        return cached["validator"]
+
     def _get_release_info(self, name, version):  # type: (str, str) -> dict
-        page = self._get("/{}/".format(canonicalize_name(name).replace(".", "-")))
+        page = self._get_page("/{}/".format(canonicalize_name(name).replace(".", "-")))
         if page is None:
             raise PackageNotFound('No package named "{}"'.format(name))
 
@@ -376,10 +589,61 @@ class LegacyRepository(PyPiRepository):
                 if chunk:
                     f.write(chunk)
 
+    def _get_page(self, endpoint):  # type: (str) -> Union[Page, None]
+        """
+        Returns the page for the given endpoint,
+        retrieving it only once per run.
+        """
+        if endpoint not in self._pages:
+            self._pages[endpoint] = self._get(endpoint)
+
+        return self._pages[endpoint]
+
     def _get(self, endpoint):  # type: (str) -> Union[Page, None]
         url = self._url + endpoint
-        response = self._session.get(url)
+        response = self._session.get(url, headers={"Accept": self.ACCEPT})
         if response.status_code == 404:
             return
 
-        return Page(url, response.content, response.headers)
+        return self._create_page(endpoint, response.headers, response.content)
+
+    def _create_page(
+        self, endpoint, headers, content
+    ):  # type: (str, Mapping[str, str], bytes) -> Page
+        url = self._url + endpoint
+
+        # The links of a page are persisted along with the page's validator
+        # so that unchanged pages do not need to be parsed again.
+        validator = headers.get("ETag") or headers.get("Last-Modified")
+        if self._disable_cache or not validator:
+            return self._parse_page(url, headers, content)
+
+        cached = self._cache.store("pages").get(endpoint)
+        if cached is not None and cached["validator"] == validator:
+            return Page.from_links(
+                url,
+                [
+                    Link(link_url, url, requires_python=requires_python)
+                    for link_url, requires_python in cached["links"]
+                ],
+            )
+
+        page = self._parse_page(url, headers, content)
+        self._cache.store("pages").forever(
+            endpoint,
+            {
+                "validator": validator,
+                "links": [[link.url, link.requires_python] for link in page.links],
+            },
+        )
+
+        return page
+
+    def _parse_page(
+        self, url, headers, content
+    ):  # type: (str, Mapping[str, str], bytes) -> Page
+        content_type = headers.get("Content-Type", "")
+        if content_type.split(";")[0].strip().lower() == self.JSON_CONTENT_TYPE:
+            return Page.from_json(url, json.loads(decode(content)))
+
+        return Page(url, content, headers)
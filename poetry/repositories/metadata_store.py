@@ -0,0 +1,339 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from typing import Optional
+
+from cachy.contracts.store import Store
+
+from poetry.utils._compat import Path
+from poetry.utils._compat import decode
+from poetry.utils._compat import encode
+from poetry.utils.helpers import canonicalize_name
+
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataStore(Store):
+    """
+    A cache store keeping every entry of a repository cache in a single
+    SQLite database instead of one file per entry.
+
+    Entries stored by the previous file based cache of the repository
+    are migrated the first time the store is opened.
+
+    Entries older than max_age seconds are evicted and, when the
+    entries exceed max_size bytes, the oldest ones are evicted first.
+    """
+
+    FILENAME = "metadata.sqlite"
+
+    # Defaults of the settings.cache.max-size (in megabytes)
+    # and settings.cache.max-age (in days, 0 meaning never) settings.
+    MAX_SIZE = 256
+    MAX_AGE = 0
+
+    # The first line of each entry stored with cachy's file driver
+    # is a 10 digits expiration timestamp.
+    _LEGACY_EXPIRATION_LENGTH = 10
+    _LEGACY_FOREVER = 9999999999
+
+    def __init__(
+        self, directory, max_size=MAX_SIZE * 1024 * 1024, max_age=None
+    ):  # type: (str, Optional[int], Optional[int]) -> None
+        self._directory = Path(directory)
+        self._max_size = max_size
+        self._max_age = max_age
+        self._lock = threading.Lock()
+        self._connection = None
+
+    @classmethod
+    def create(cls, directory):  # type: (str) -> MetadataStore
+        """
+        Creates a store limited by the cache settings of the configuration.
+        """
+        from poetry.config import Config
+
+        config = Config.create("config.toml")
+
+        max_size = int(config.setting("settings.cache.max-size", cls.MAX_SIZE))
+        max_age = int(config.setting("settings.cache.max-age", cls.MAX_AGE))
+
+        return cls(
+            directory,
+            max_size=max_size * 1024 * 1024 if max_size else None,
+            max_age=max_age * 24 * 60 * 60 if max_age else None,
+        )
+
+    @property
+    def path(self):  # type: () -> Path
+        return self._directory / self.FILENAME
+
+    def get(self, key):
+        rows = self._read("SELECT value, expiration FROM entries WHERE key = ?", (key,))
+        if not rows:
+            return
+
+        value, expiration = rows[0]
+        if expiration is not None and time.time() >= expiration:
+            self.forget(key)
+
+            return
+
+        return self.unserialize(value)
+
+    def put(self, key, value, minutes):
+        expiration = None
+        if minutes:
+            expiration = int(round(time.time()) + minutes * 60)
+
+        value = decode(self.serialize(value))
+
+        self._write(
+            "INSERT OR REPLACE INTO entries "
+            "(key, value, size, created_at, expiration) VALUES (?, ?, ?, ?, ?)",
+            (key, value, len(value), int(time.time()), expiration),
+        )
+
+    def increment(self, key, value=1):
+        # Reading and updating the counter in a single transaction
+        # keeps concurrent increments of other processes from being lost.
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "DELETE FROM entries "
+                "WHERE key = ? AND expiration IS NOT NULL AND expiration <= ?",
+                (key, int(time.time())),
+            )
+            updated = connection.execute(
+                "UPDATE entries SET value = CAST(value AS INTEGER) + ?, "
+                "size = LENGTH(CAST(value AS INTEGER) + ?) WHERE key = ?",
+                (value, value, key),
+            ).rowcount
+            if not updated:
+                connection.execute(
+                    "INSERT INTO entries "
+                    "(key, value, size, created_at, expiration) "
+                    "VALUES (?, ?, ?, ?, NULL)",
+                    (key, str(value), len(str(value)), int(time.time())),
+                )
+
+            integer = connection.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()[0]
+            connection.commit()
+
+            return int(integer)
+
+    def decrement(self, key, value=1):
+        return self.increment(key, value * -1)
+
+    def forever(self, key, value):
+        self.put(key, value, 0)
+
+    def forget(self, key):
+        return self._write("DELETE FROM entries WHERE key = ?", (key,)) > 0
+
+    def flush(self):
+        self._write("DELETE FROM entries")
+
+    def count(self):  # type: () -> int
+        return self._read("SELECT COUNT(*) FROM entries")[0][0]
+
+    def prune(self):  # type: () -> int
+        """
+        Evicts the expired entries as well as the entries
+        exceeding the age and size limits.
+
+        Returns the number of evicted entries.
+        """
+        with self._lock:
+            return self._prune(self._connect())
+
+    def get_prefix(self):
+        return ""
+
+    def _read(self, query, parameters=()):
+        with self._lock:
+            return self._connect().execute(query, parameters).fetchall()
+
+    def _write(self, query, parameters=()):
+        with self._lock:
+            connection = self._connect()
+            count = connection.execute(query, parameters).rowcount
+            connection.commit()
+
+            return count
+
+    def _connect(self):  # type: () -> sqlite3.Connection
+        if self._connection is not None:
+            return self._connection
+
+        if not self._directory.exists():
+            self._directory.mkdir(parents=True)
+
+        connection = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "created_at INTEGER NOT NULL, "
+            "expiration INTEGER"
+            ")"
+        )
+        connection.commit()
+
+        self._migrate(connection)
+        self._prune(connection)
+
+        self._connection = connection
+
+        return connection
+
+    def _prune(self, connection):  # type: (sqlite3.Connection) -> int
+        now = int(time.time())
+        evicted = connection.execute(
+            "DELETE FROM entries WHERE expiration IS NOT NULL AND expiration <= ?",
+            (now,),
+        ).rowcount
+
+        if self._max_age is not None:
+            evicted += connection.execute(
+                "DELETE FROM entries WHERE created_at <= ?", (now - self._max_age,)
+            ).rowcount
+
+        if self._max_size is not None:
+            size = connection.execute("SELECT TOTAL(size) FROM entries").fetchone()[0]
+            if size > self._max_size:
+                rows = connection.execute(
+                    "SELECT key, size FROM entries ORDER BY created_at DESC, rowid DESC"
+                ).fetchall()
+
+                kept = 0
+                stale = []
+                for key, entry_size in rows:
+                    kept += entry_size
+                    if kept > self._max_size:
+                        stale.append((key,))
+
+                connection.executemany("DELETE FROM entries WHERE key = ?", stale)
+                evicted += len(stale)
+
+        connection.commit()
+
+        return evicted
+
+    def _migrate(self, connection):  # type: (sqlite3.Connection) -> None
+        """
+        Imports the entries stored by cachy's file driver.
+
+        The file names are the SHA256 hashes of the keys so the keys are
+        rebuilt from the cached release information and only kept
+        if their hash matches.
+        """
+        entries = []
+        migrated = []
+        for path in self._legacy_files():
+            try:
+                with path.open("rb") as f:
+                    contents = f.read()
+
+                expiration = int(contents[: self._LEGACY_EXPIRATION_LENGTH])
+                value = decode(contents[self._LEGACY_EXPIRATION_LENGTH :])
+                data = json.loads(value)
+            except (IOError, OSError, ValueError):
+                continue
+
+            migrated.append(path)
+
+            key = self._legacy_key(path.name, data)
+            if key is None:
+                continue
+
+            if expiration == self._LEGACY_FOREVER:
+                expiration = None
+            elif expiration <= time.time():
+                continue
+
+            entries.append(
+                (key, value, len(value), int(path.stat().st_mtime), expiration)
+            )
+
+        if not migrated:
+            return
+
+        logger.debug("Migrating {} cache entries to {}".format(len(entries), self.path))
+
+        connection.executemany(
+            "INSERT OR IGNORE INTO entries "
+            "(key, value, size, created_at, expiration) VALUES (?, ?, ?, ?, ?)",
+            entries,
+        )
+        connection.commit()
+
+        for path in migrated:
+            path.unlink()
+
+        for directory in sorted(
+            set(p.parent for p in migrated), key=lambda p: len(p.parts), reverse=True
+        ):
+            # Removing the hash directories left empty
+            while directory != self._directory:
+                try:
+                    directory.rmdir()
+                except OSError:
+                    break
+
+                directory = directory.parent
+
+    def _legacy_files(self):
+        if not self._directory.exists():
+            return
+
+        # cachy's file driver stores entries under 8 levels
+        # of 2 characters hexadecimal directories.
+        for root, dirs, files in os.walk(str(self._directory)):
+            root = Path(root)
+            depth = len(root.relative_to(self._directory).parts)
+            if depth > 0 and (len(root.name) != 2 or not _is_hex(root.name)):
+                dirs[:] = []
+
+                continue
+
+            if depth < 8:
+                continue
+
+            for name in files:
+                if len(name) == 64 and _is_hex(name):
+                    yield root / name
+
+    def _legacy_key(self, digest, data):  # type: (str, dict) -> Optional[str]
+        if not isinstance(data, dict):
+            return
+
+        name = data.get("name")
+        version = data.get("version")
+        if not name or not version:
+            return
+
+        for candidate in {name, name.lower(), canonicalize_name(name)}:
+            key = "{}:{}".format(candidate, version)
+            if hashlib.sha256(encode(key)).hexdigest() == digest:
+                return key
+
+
+def _is_hex(value):  # type: (str) -> bool
+    try:
+        int(value, 16)
+    except ValueError:
+        return False
+
+    return True
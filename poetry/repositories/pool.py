@@ -1,18 +1,30 @@
+from multiprocessing.pool import ThreadPool
+from typing import Callable
 from typing import List
+from typing import Tuple
 from typing import Union
 
+from poetry.packages.package import Package
+from poetry.semver import VersionConstraint
 
 from .base_repository import BaseRepository
 from .exceptions import PackageNotFound
+from .http_client import HTTPClient
 from .repository import Repository
 
 
 class Pool(BaseRepository):
-    def __init__(self, repositories=None):  # type: (Union[list, None]) -> None
+    def __init__(
+        self, repositories=None, http_client=None
+    ):  # type: (Union[list, None], Union[HTTPClient, None]) -> None
         if repositories is None:
             repositories = []
 
+        if http_client is None:
+            http_client = HTTPClient()
+
         self._repositories = []
+        self._http_client = http_client
 
         for repository in repositories:
             self.add_repository(repository)
@@ -23,6 +35,13 @@ class Pool(BaseRepository):
     def repositories(self):  # type: () -> List[Repository]
         return self._repositories
 
+    @property
+    def http_client(self):  # type: () -> HTTPClient
+        """
+        The HTTP client shared by the repositories of the pool.
+        """
+        return self._http_client
+
     def add_repository(self, repository):  # type: (Repository) -> Pool
         """
         Adds a repository to the pool.
@@ -69,6 +88,106 @@ class Pool(BaseRepository):
 
         return []
 
+    def count_packages(self, name, constraint=None, allow_prereleases=False):
+        for repository in self._repositories:
+            count = repository.count_packages(
+                name, constraint, allow_prereleases=allow_prereleases
+            )
+            if count:
+                return count
+
+        return 0
+
+    def find_packages_many(
+        self,
+        requests,  # type: List[Tuple[str, Union[VersionConstraint, str, None]]]
+        allow_prereleases=False,  # type: bool
+    ):  # type: (...) -> List[List[Package]]
+        """
+        Finds the packages matching each (name, constraint) request.
+
+        Repositories are still queried by order of priority but the
+        requests sent to a repository are dispatched concurrently.
+        Results are returned in the order of the requests.
+        """
+
+        def find_packages(repository, request):
+            try:
+                return repository.find_packages(
+                    request[0], request[1], allow_prereleases=allow_prereleases
+                )
+            except PackageNotFound:
+                return []
+
+        results = [[] for _ in requests]  # type: List[List[Package]]
+        pending = list(range(len(requests)))
+        for repository in self._repositories:
+            if not pending:
+                break
+
+            batch = [requests[i] for i in pending]
+            if hasattr(repository, "find_packages_many"):
+                found = repository.find_packages_many(
+                    batch, allow_prereleases=allow_prereleases
+                )
+            else:
+                found = self._map(
+                    lambda request: find_packages(repository, request), batch
+                )
+
+            remaining = []
+            for i, packages in zip(pending, found):
+                if packages:
+                    results[i] = packages
+                else:
+                    remaining.append(i)
+
+            pending = remaining
+
+        return results
+
+    def packages_many(
+        self, requests
+    ):  # type: (List[Tuple[str, str]]) -> List[Union[Package, None]]
+        """
+        Retrieves the package of each (name, version) request,
+        or None if it cannot be found in any repository.
+
+        Repositories are still queried by order of priority but the
+        requests sent to a repository are dispatched concurrently.
+        Results are returned in the order of the requests.
+        """
+
+        def package(repository, request):
+            try:
+                return repository.package(request[0], request[1])
+            except PackageNotFound:
+                return
+
+        results = [None for _ in requests]  # type: List[Union[Package, None]]
+        pending = list(range(len(requests)))
+        for repository in self._repositories:
+            if not pending:
+                break
+
+            batch = [requests[i] for i in pending]
+            if hasattr(repository, "packages_many"):
+                found = repository.packages_many(batch)
+            else:
+                found = self._map(lambda request: package(repository, request), batch)
+
+            remaining = []
+            for i, found_package in zip(pending, found):
+                if found_package:
+                    self._packages.append(found_package)
+                    results[i] = found_package
+                else:
+                    remaining.append(i)
+
+            pending = remaining
+
+        return results
+
     def search(self, query, mode=BaseRepository.SEARCH_FULLTEXT):
         from .legacy_repository import LegacyRepository
 
@@ -80,3 +199,15 @@ class Pool(BaseRepository):
             results += repository.search(query, mode=mode)
 
         return results
+
+    def _map(self, func, items):  # type: (Callable, list) -> list
+        if len(items) <= 1:
+            return [func(item) for item in items]
+
+        # There is no point in having more requests in flight
+        # than the number of connections kept for a host.
+        pool = ThreadPool(min(len(items), self._http_client.pool_size))
+        try:
+            return pool.map(func, items)
+        finally:
+            pool.terminate()
@@ -0,0 +1,178 @@
+import logging
+import threading
+
+from collections import deque
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+from .exceptions import PackageNotFound
+from .pool import Pool
+from .pypi_repository import PyPiRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+class ReleasePrefetcher(object):
+    """
+    Speculatively retrieves release information in background threads.
+
+    Fetched releases are stored in the "releases" cache of the repository
+    that provides them, so that later calls to Pool.package()
+    are served from warm data instead of blocking on the network.
+
+    The number of worker threads and of pending requests are bounded:
+    requests scheduled while the queue is full are simply dropped.
+    """
+
+    def __init__(
+        self, pool, max_workers=4, max_pending=256
+    ):  # type: (Pool, int, int) -> None
+        self._pool = pool
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+
+        self._pending = deque()
+        self._scheduled = set()
+        self._in_flight = {}  # type: Dict[Tuple[str, str], threading.Event]
+        self._workers = []
+        self._condition = threading.Condition()
+        self._shutdown = False
+
+    @property
+    def pending(self):  # type: () -> int
+        with self._condition:
+            return len(self._pending)
+
+    def prefetch(self, name, versions):  # type: (str, Iterable[str]) -> None
+        """
+        Schedules the retrieval of the release information
+        of the given versions of a package.
+        """
+        if self._max_workers <= 0 or not self._repositories():
+            return
+
+        with self._condition:
+            self._shutdown = False
+
+            for version in versions:
+                key = (name, version)
+                if key in self._scheduled:
+                    continue
+
+                if len(self._pending) >= self._max_pending:
+                    break
+
+                self._scheduled.add(key)
+                self._pending.append(key)
+
+            self._start_workers()
+            self._condition.notify_all()
+
+    def wait(self, name, version):  # type: (str, str) -> None
+        """
+        Makes sure no background retrieval is in progress for the given release.
+
+        If the release is still pending, it is removed from the queue
+        since the caller is about to retrieve it anyway.
+        """
+        key = (name, version)
+        with self._condition:
+            event = self._in_flight.get(key)
+            if event is None:
+                if key in self._pending:
+                    self._pending.remove(key)
+                    self._scheduled.remove(key)
+
+                return
+
+        event.wait()
+
+    def cancel(self):  # type: () -> None
+        """
+        Drops every pending request.
+
+        Retrievals already in progress are allowed to finish.
+        """
+        with self._condition:
+            for key in self._pending:
+                self._scheduled.discard(key)
+
+            self._pending.clear()
+
+    def shutdown(self):  # type: () -> None
+        """
+        Cancels pending requests and stops the worker threads.
+        """
+        with self._condition:
+            self._shutdown = True
+            for key in self._pending:
+                self._scheduled.discard(key)
+
+            self._pending.clear()
+            self._condition.notify_all()
+            workers = self._workers
+            self._workers = []
+
+        for worker in workers:
+            worker.join()
+
+    def _repositories(self):  # type: () -> List[PyPiRepository]
+        # Only repositories caching their releases on disk can benefit
+        # from prefetching. We stop at the first one that cannot
+        # since Pool.package() may be satisfied by it.
+        repositories = []
+        for repository in self._pool.repositories:
+            if not isinstance(repository, PyPiRepository) or repository._disable_cache:
+                break
+
+            repositories.append(repository)
+
+        return repositories
+
+    def _start_workers(self):  # type: () -> None
+        missing = min(self._max_workers, len(self._pending)) - len(self._workers)
+        for _ in range(missing):
+            worker = threading.Thread(target=self._work)
+            worker.daemon = True
+            worker.start()
+
+            self._workers.append(worker)
+
+    def _work(self):  # type: () -> None
+        while True:
+            with self._condition:
+                while not self._pending and not self._shutdown:
+                    self._condition.wait()
+
+                if self._shutdown:
+                    return
+
+                key = self._pending.popleft()
+                event = threading.Event()
+                self._in_flight[key] = event
+
+            try:
+                self._fetch(*key)
+            finally:
+                with self._condition:
+                    del self._in_flight[key]
+
+                event.set()
+
+    def _fetch(self, name, version):  # type: (str, str) -> None
+        for repository in self._repositories():
+            try:
+                repository.get_release_info(name, version)
+            except PackageNotFound:
+                continue
+            except Exception as e:
+                # The solver will encounter the error again
+                # and report it when it needs this release.
+                logger.debug(
+                    "Unable to prefetch {} ({}): {}".format(name, version, str(e))
+                )
+
+            return
@@ -1,6 +1,7 @@
 import logging
 import os
 import tarfile
+import threading
 import zipfile
 
 import pkginfo
@@ -8,8 +9,11 @@ import pkginfo
 from bz2 import BZ2File
 from collections import defaultdict
 from gzip import GzipFile
+from multiprocessing.pool import ThreadPool
+from typing import Callable
 from typing import Dict
 from typing import List
+from typing import Tuple
 from typing import Union
 
 try:
@@ -22,22 +26,21 @@ try:
 except ImportError:
     from xmlrpclib import ServerProxy
 
-from cachecontrol import CacheControl
 from cachecontrol.caches.file_cache import FileCache
 from cachy import CacheManager
-from requests import get
-from requests import session
 
 from poetry.locations import CACHE_DIR
 from poetry.packages import dependency_from_pep_508
 from poetry.packages import Package
 from poetry.packages.utils.link import Link
 from poetry.semver import parse_constraint
+from poetry.semver import Version
 from poetry.semver import VersionConstraint
 from poetry.semver import VersionRange
 from poetry.semver.exceptions import ParseVersionError
 from poetry.utils._compat import Path
 from poetry.utils._compat import to_str
+from poetry.utils.helpers import canonicalize_name
 from poetry.utils.helpers import parse_requires
 from poetry.utils.helpers import temporary_directory
 from poetry.utils.patterns import wheel_file_re
@@ -46,17 +49,43 @@ from poetry.version.markers import InvalidMarker
 from poetry.version.markers import parse_marker
 
 from .exceptions import PackageNotFound
+from .http_client import HTTPClient
+from .lazy_wheel import HTTPRangeRequestUnsupported
+from .lazy_wheel import metadata_from_wheel_url
+from .metadata_store import MetadataStore
 from .repository import Repository
 
 
 logger = logging.getLogger(__name__)
 
+# The information retrieved from archives does not depend on the repository
+# they are provided by so it is shared by all repositories.
+ARCHIVES_CACHE_DIR = str(Path(CACHE_DIR) / "cache" / "archives")
+
+
+class InconclusiveInspection(Exception):
+    """
+    Raised when the dependencies of an archive could not be determined,
+    along with the information assumed instead.
+    """
+
+    def __init__(self, info):  # type: (dict) -> None
+        super(InconclusiveInspection, self).__init__()
+
+        self.info = info
+
 
 class PyPiRepository(Repository):
 
     CACHE_VERSION = parse_constraint("0.12.0")
 
-    def __init__(self, url="https://pypi.org/", disable_cache=False, fallback=True):
+    def __init__(
+        self,
+        url="https://pypi.org/",  # type: str
+        disable_cache=False,  # type: bool
+        fallback=True,  # type: bool
+        http_client=None,  # type: Union[HTTPClient, None]
+    ):  # type: (...) -> None
         self._name = "PyPI"
         self._url = url
         self._disable_cache = disable_cache
@@ -68,18 +97,31 @@ class PyPiRepository(Repository):
                 "default": "releases",
                 "serializer": "json",
                 "stores": {
-                    "releases": {"driver": "file", "path": str(release_cache_dir)},
+                    "releases": {"driver": "metadata", "path": str(release_cache_dir)},
                     "packages": {"driver": "dict"},
+                    "serials": {"driver": "metadata", "path": str(release_cache_dir)},
+                    "archives": {"driver": "metadata", "path": ARCHIVES_CACHE_DIR},
                 },
             }
         )
+        self._cache.extend(
+            "metadata", lambda config: MetadataStore.create(config["path"])
+        )
+
+        if http_client is None:
+            http_client = HTTPClient()
 
-        self._session = CacheControl(
-            session(), cache=FileCache(str(release_cache_dir / "_http"))
+        self._http_client = http_client
+        self._session = http_client.session(
+            cache=FileCache(str(release_cache_dir / "_http"))
         )
 
         super(PyPiRepository, self).__init__()
 
+    @property
+    def url(self):  # type: () -> str
+        return self._url
+
     def find_packages(
         self,
         name,  # type: str
@@ -90,6 +132,71 @@ class PyPiRepository(Repository):
         """
         Find packages on the remote server.
         """
+        return self._find_packages_in_info(
+            name,
+            self.get_package_info(name),
+            constraint=constraint,
+            extras=extras,
+            allow_prereleases=allow_prereleases,
+        )
+
+    def count_packages(
+        self,
+        name,  # type: str
+        constraint=None,  # type: Union[VersionConstraint, str, None]
+        allow_prereleases=False,  # type: bool
+    ):  # type: (...) -> int
+        """
+        Count packages on the remote server without building them.
+        """
+        return len(
+            self._find_versions_in_info(
+                name,
+                self.get_package_info(name),
+                constraint=constraint,
+                allow_prereleases=allow_prereleases,
+            )
+        )
+
+    def _find_packages_in_info(
+        self,
+        name,  # type: str
+        info,  # type: dict
+        constraint=None,  # type: Union[VersionConstraint, str, None]
+        extras=None,  # type: Union[list, None]
+        allow_prereleases=False,  # type: bool
+    ):  # type: (...) -> List[Package]
+        packages = []
+
+        for version, pretty_version in self._find_versions_in_info(
+            name, info, constraint=constraint, allow_prereleases=allow_prereleases
+        ):
+            package = Package(name, version, pretty_version=pretty_version)
+            if extras is not None:
+                package.requires_extras = extras
+
+            packages.append(package)
+
+        self._log(
+            "{} packages found for {} {}".format(
+                len(packages), name, str(constraint or "*")
+            ),
+            level="debug",
+        )
+
+        return packages
+
+    def _find_versions_in_info(
+        self,
+        name,  # type: str
+        info,  # type: dict
+        constraint=None,  # type: Union[VersionConstraint, str, None]
+        allow_prereleases=False,  # type: bool
+    ):  # type: (...) -> List[Tuple[Version, str]]
+        """
+        Returns the parsed and pretty versions of the releases
+        of a package matching a constraint.
+        """
         if constraint is None:
             constraint = "*"
 
@@ -105,9 +212,7 @@ class PyPiRepository(Repository):
             ):
                 allow_prereleases = True
 
-        info = self.get_package_info(name)
-
-        packages = []
+        versions = []
 
         for version, release in info["releases"].items():
             if not release:
@@ -121,7 +226,7 @@ class PyPiRepository(Repository):
                 continue
 
             try:
-                package = Package(name, version)
+                parsed_version = Version.parse(version)
             except ParseVersionError:
                 self._log(
                     'Unable to parse version "{}" for the {} package, skipping'.format(
@@ -131,21 +236,13 @@ class PyPiRepository(Repository):
                 )
                 continue
 
-            if package.is_prerelease() and not allow_prereleases:
+            if parsed_version.is_prerelease() and not allow_prereleases:
                 continue
 
-            if not constraint or (constraint and constraint.allows(package.version)):
-                if extras is not None:
-                    package.requires_extras = extras
+            if not constraint or (constraint and constraint.allows(parsed_version)):
+                versions.append((parsed_version, version))
 
-                packages.append(package)
-
-        self._log(
-            "{} packages found for {} {}".format(len(packages), name, str(constraint)),
-            level="debug",
-        )
-
-        return packages
+        return versions
 
     def package(
         self,
@@ -153,10 +250,20 @@ class PyPiRepository(Repository):
         version,  # type: str
         extras=None,  # type: (Union[list, None])
     ):  # type: (...) -> Union[Package, None]
+        return self._package_from_release_info(
+            name, version, self.get_release_info(name, version), extras=extras
+        )
+
+    def _package_from_release_info(
+        self,
+        name,  # type: str
+        version,  # type: str
+        release_info,  # type: dict
+        extras=None,  # type: (Union[list, None])
+    ):  # type: (...) -> Package
         if extras is None:
             extras = []
 
-        release_info = self.get_release_info(name, version)
         package = Package(name, version, version)
         requires_dist = release_info["requires_dist"] or []
         for req in requires_dist:
@@ -234,12 +341,46 @@ class PyPiRepository(Repository):
         The information is returned from the cache if it exists
         or retrieved from the remote server.
         """
+        cached = self._get_cached_package_info(name)
+        if cached is not None:
+            return cached
+
+        data = self._get_package_info(name)
+        self._cache_package_info(name, data)
+
+        return data
+
+    def _get_cached_package_info(self, name):  # type: (str) -> Union[dict, None]
+        if self._disable_cache:
+            return
+
+        return self._cache.store("packages").get(name)
+
+    def _cache_package_info(self, name, data):  # type: (str, dict) -> None
         if self._disable_cache:
-            return self._get_package_info(name)
+            return
+
+        self._cache.store("packages").forever(name, data)
+
+        # The serial of the project changes with each of its releases
+        # so it is kept to validate the resolutions using its information.
+        serial = data.get("last_serial")
+        if serial is not None:
+            self._cache.store("serials").forever(
+                "pypi/{}/json".format(canonicalize_name(name)), serial
+            )
 
-        return self._cache.store("packages").remember_forever(
-            name, lambda: self._get_package_info(name)
+    def cache_validator(self, name):  # type: (str) -> Union[str, None]
+        if self._disable_cache:
+            return
+
+        serial = self._cache.store("serials").get(
+            "pypi/{}/json".format(canonicalize_name(name))
         )
+        if serial is None:
+            return
+
+        return str(serial)
 
     def _get_package_info(self, name):  # type: (str) -> dict
         data = self._get("pypi/{}/json".format(name))
@@ -255,12 +396,24 @@ class PyPiRepository(Repository):
         The information is returned from the cache if it exists
         or retrieved from the remote server.
         """
+        cached = self._get_cached_release_info(name, version)
+        if cached is not None:
+            return cached
+
+        data = self._get_release_info(name, version)
+        self._cache_release_info(name, version, data)
+
+        return data
+
+    def _get_cached_release_info(
+        self, name, version
+    ):  # type: (str, str) -> Union[dict, None]
         if self._disable_cache:
-            return self._get_release_info(name, version)
+            return
 
-        cached = self._cache.remember_forever(
-            "{}:{}".format(name, version), lambda: self._get_release_info(name, version)
-        )
+        cached = self._cache.get("{}:{}".format(name, version))
+        if cached is None:
+            return
 
         cache_version = cached.get("_cache_version", "0.0.0")
         if parse_constraint(cache_version) != self.CACHE_VERSION:
@@ -269,12 +422,17 @@ class PyPiRepository(Repository):
                 "The cache for {} {} is outdated. Refreshing.".format(name, version),
                 level="debug",
             )
-            cached = self._get_release_info(name, version)
 
-            self._cache.forever("{}:{}".format(name, version), cached)
+            return
 
         return cached
 
+    def _cache_release_info(
+        self, name, version, data
+    ):  # type: (str, str, dict) -> None
+        if not self._disable_cache:
+            self._cache.forever("{}:{}".format(name, version), data)
+
     def _get_release_info(self, name, version):  # type: (str, str) -> dict
         self._log("Getting info for {} ({}) from PyPI".format(name, version), "debug")
 
@@ -282,6 +440,11 @@ class PyPiRepository(Repository):
         if json_data is None:
             raise PackageNotFound("Package [{}] not found.".format(name))
 
+        return self._release_info_from_json(version, json_data)
+
+    def _release_info_from_json(
+        self, version, json_data
+    ):  # type: (str, dict) -> dict
         info = json_data["info"]
         data = {
             "name": info["name"],
@@ -316,7 +479,13 @@ class PyPiRepository(Repository):
                 if dist_type not in ["sdist", "bdist_wheel"]:
                     continue
 
-                urls[dist_type].append(url["url"])
+                # The digest is kept in the URL, like in simple indexes,
+                # so that the archive is only inspected once.
+                sha256 = url.get("digests", {}).get("sha256")
+                if sha256:
+                    urls[dist_type].append("{}#sha256={}".format(url["url"], sha256))
+                else:
+                    urls[dist_type].append(url["url"])
 
             if not urls:
                 return data
@@ -374,13 +543,18 @@ class PyPiRepository(Repository):
                     platform_specific_wheels.append(wheel)
 
             if universal_wheel is not None:
-                return self._get_info_from_wheel(universal_wheel)
+                return self._get_info_from_archive(
+                    universal_wheel, self._get_info_from_wheel
+                )
 
             info = {}
             if universal_python2_wheel and universal_python3_wheel:
-                info = self._get_info_from_wheel(universal_python2_wheel)
+                # Both wheels are needed so we inspect them concurrently
+                info, py3_info = self._get_info_from_archives(
+                    [universal_python2_wheel, universal_python3_wheel],
+                    self._get_info_from_wheel,
+                )
 
-                py3_info = self._get_info_from_wheel(universal_python3_wheel)
                 if py3_info["requires_dist"]:
                     if not info["requires_dist"]:
                         info["requires_dist"] = py3_info["requires_dist"]
@@ -422,31 +596,90 @@ class PyPiRepository(Repository):
 
             if platform_specific_wheels and "sdist" not in urls:
                 # Pick the first wheel available and hope for the best
-                return self._get_info_from_wheel(platform_specific_wheels[0])
+                return self._get_info_from_archive(
+                    platform_specific_wheels[0], self._get_info_from_wheel
+                )
 
-        return self._get_info_from_sdist(urls["sdist"][0])
+        return self._get_info_from_archive(urls["sdist"][0], self._get_info_from_sdist)
+
+    def _get_info_from_archives(
+        self, urls, inspect
+    ):  # type: (List[str], Callable[[str], dict]) -> List[dict]
+        """
+        Retrieves the information of multiple archives concurrently.
+
+        Once one of the inspections fails, the archives which are not
+        being inspected yet are skipped. The running inspections complete
+        and their results are cached.
+        """
+        failed = threading.Event()
+
+        def get_info(url):
+            if failed.is_set():
+                return
+
+            try:
+                return self._get_info_from_archive(url, inspect)
+            except Exception:
+                failed.set()
+
+                raise
+
+        # The threads of the pool do not outlive the inspections of the release
+        pool = ThreadPool(min(len(urls), self._http_client.pool_size))
+        try:
+            return pool.map(get_info, urls, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _get_info_from_archive(
+        self, url, inspect
+    ):  # type: (str, Callable[[str], dict]) -> Dict[str, Union[str, List, None]]
+        """
+        Retrieves the information of an archive.
+
+        The result is cached by the archive's SHA256 digest so that the same
+        archive is never inspected twice, whichever repository provides it.
+        Inconclusive inspections are not cached so they are tried again.
+        """
+        link = Link(url)
+        try:
+            if self._disable_cache or link.hash_name != "sha256":
+                return inspect(url)
+
+            return self._cache.store("archives").remember_forever(
+                "sha256:{}".format(link.hash), lambda: inspect(url)
+            )
+        except InconclusiveInspection as e:
+            return e.info
 
     def _get_info_from_wheel(
         self, url
     ):  # type: (str) -> Dict[str, Union[str, List, None]]
-        self._log(
-            "Downloading wheel: {}".format(urlparse.urlparse(url).path.rsplit("/")[-1]),
-            level="debug",
-        )
         info = {"summary": "", "requires_python": None, "requires_dist": None}
 
         filename = os.path.basename(urlparse.urlparse(url).path.rsplit("/")[-1])
 
-        with temporary_directory() as temp_dir:
-            filepath = os.path.join(temp_dir, filename)
-            self._download(url, filepath)
-
-            try:
-                meta = pkginfo.Wheel(filepath)
-            except ValueError:
-                # Unable to determine dependencies
-                # Assume none
-                return info
+        try:
+            meta = self._get_wheel_metadata(url)
+        except HTTPRangeRequestUnsupported:
+            self._log("Downloading wheel: {}".format(filename), level="debug")
+
+            with temporary_directory() as temp_dir:
+                filepath = os.path.join(temp_dir, filename)
+                self._download(url, filepath)
+
+                try:
+                    meta = pkginfo.Wheel(filepath)
+                except ValueError:
+                    # Unable to determine dependencies
+                    # Assume none
+                    raise InconclusiveInspection(info)
+        except ValueError:
+            # Unable to determine dependencies
+            # Assume none
+            raise InconclusiveInspection(info)
 
         if meta.summary:
             info["summary"] = meta.summary or ""
@@ -458,6 +691,20 @@ class PyPiRepository(Repository):
 
         return info
 
+    def _get_wheel_metadata(self, url):  # type: (str) -> pkginfo.Distribution
+        """
+        Reads the metadata of a remote wheel by retrieving
+        only the relevant parts of the archive.
+        """
+        self._log(
+            "Reading wheel metadata: {}".format(
+                urlparse.urlparse(url).path.rsplit("/")[-1]
+            ),
+            level="debug",
+        )
+
+        return metadata_from_wheel_url(url, self._session)
+
     def _get_info_from_sdist(
         self, url
     ):  # type: (str) -> Dict[str, Union[str, List, None]]
@@ -562,7 +809,8 @@ class PyPiRepository(Repository):
                     ),
                     "warning",
                 )
-                return info
+
+                raise InconclusiveInspection(info)
 
     def _inspect_sdist_with_setup(self, sdist_dir):
         info = {"requires_python": None, "requires_dist": None}
@@ -589,7 +837,7 @@ class PyPiRepository(Repository):
         return info
 
     def _download(self, url, dest):  # type: (str, str) -> None
-        r = get(url, stream=True)
+        r = self._http_client.get(url, stream=True)
         r.raise_for_status()
 
         with open(dest, "wb") as f:
@@ -1,5 +1,7 @@
 import re
 
+from poetry.utils._compat import lru_cache
+
 from .empty_constraint import EmptyConstraint
 from .patterns import BASIC_CONSTRAINT
 from .patterns import CARET_CONSTRAINT
@@ -13,6 +15,17 @@ from .version_union import VersionUnion
 
 
 def parse_constraint(constraints):  # type: (str) -> VersionConstraint
+    """
+    Parses a constraint string.
+
+    Constraints are immutable so the ones parsed from the same string
+    are shared instead of being parsed again.
+    """
+    return _parse_constraint(constraints)
+
+
+@lru_cache(maxsize=2048)
+def _parse_constraint(constraints):  # type: (str) -> VersionConstraint
     if constraints == "*":
         return VersionRange()
 
@@ -0,0 +1,85 @@
+import functools
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+
+
+class OperationCache(object):
+    """
+    Caches the results of operations between version constraints,
+    keyed by the operation and the identity of its operands.
+
+    Constraints are immutable so the result of an operation between
+    the same operands never changes. The operands are kept alive along
+    with the result so that their identities cannot be reused while cached.
+
+    Once the cache holds maxsize results, it is cleared.
+    """
+
+    def __init__(self, maxsize=65536):  # type: (int) -> None
+        self._maxsize = maxsize
+        self._results = {}  # type: Dict[tuple, Tuple[tuple, Any]]
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):  # type: () -> int
+        return len(self._results)
+
+    @property
+    def hit_rate(self):  # type: () -> float
+        calls = self.hits + self.misses
+        if not calls:
+            return 0.0
+
+        return self.hits / float(calls)
+
+    def get(self, key, default=None):  # type: (tuple, Any) -> Any
+        entry = self._results.get(key)
+        if entry is None:
+            self.misses += 1
+
+            return default
+
+        self.hits += 1
+
+        return entry[1]
+
+    def put(self, key, operands, result):  # type: (tuple, tuple, Any) -> None
+        if len(self._results) >= self._maxsize:
+            self._results.clear()
+
+        self._results[key] = (operands, result)
+
+    def clear(self):  # type: () -> None
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+operation_cache = OperationCache()
+
+_missing = object()
+
+
+def memoize(method):  # type: (Callable) -> Callable
+    """
+    Caches the results of a constraint operation in operation_cache.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *others):
+        operands = (self,) + others
+        key = (name,) + tuple(id(operand) for operand in operands)
+
+        result = operation_cache.get(key, _missing)
+        if result is _missing:
+            result = method(self, *others)
+            operation_cache.put(key, operands, result)
+
+        return result
+
+    return wrapper
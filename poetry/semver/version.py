@@ -16,6 +16,18 @@ class Version(VersionRange):
     A parsed semantic version number.
     """
 
+    __slots__ = (
+        "_major",
+        "_minor",
+        "_patch",
+        "_rest",
+        "_precision",
+        "_text",
+        "_prerelease",
+        "_build",
+        "_key",
+    )
+
     def __init__(
         self,
         major,  # type: int
@@ -93,6 +105,20 @@ class Version(VersionRange):
 
             self._build = self._split_parts(build)
 
+        # Versions are compared, hashed and sorted through this key,
+        # which orders them the same way as the rules of _cmp() below
+        # would, so that comparing two versions is a single tuple comparison.
+        self._key = (
+            self._major,
+            self._minor,
+            self._patch,
+            self._rest,
+            # Pre-releases always come before no pre-release string.
+            (0, self._parts_key(self._prerelease)) if self._prerelease else (1,),
+            # Builds always come after no build string.
+            (1, self._parts_key(self._build)) if self._build else (0,),
+        )
+
     @property
     def major(self):  # type: () -> int
         return self._major
@@ -336,16 +362,33 @@ class Version(VersionRange):
 
         return parts
 
+    def _parts_key(self, parts):  # type: (List[Union[str, int]]) -> tuple
+        # Numeric parts come before alphanumeric ones and missing parts
+        # come before present ones, as with tuples.
+        return tuple((0, p) if isinstance(p, int) else (1, p) for p in parts)
+
     def __lt__(self, other):
+        if isinstance(other, Version):
+            return self._key < other._key
+
         return self._cmp(other) < 0
 
     def __le__(self, other):
+        if isinstance(other, Version):
+            return self._key <= other._key
+
         return self._cmp(other) <= 0
 
     def __gt__(self, other):
+        if isinstance(other, Version):
+            return self._key > other._key
+
         return self._cmp(other) > 0
 
     def __ge__(self, other):
+        if isinstance(other, Version):
+            return self._key >= other._key
+
         return self._cmp(other) >= 0
 
     def _cmp(self, other):
@@ -355,91 +398,16 @@ class Version(VersionRange):
         if not isinstance(other, Version):
             return -other._cmp(self)
 
-        if self.major != other.major:
-            return self._cmp_parts(self.major, other.major)
-
-        if self.minor != other.minor:
-            return self._cmp_parts(self.minor, other.minor)
-
-        if self.patch != other.patch:
-            return self._cmp_parts(self.patch, other.patch)
-
-        if self.rest != other.rest:
-            return self._cmp_parts(self.rest, other.rest)
-
-        # Pre-releases always come before no pre-release string.
-        if not self.is_prerelease() and other.is_prerelease():
-            return 1
-
-        if not other.is_prerelease() and self.is_prerelease():
-            return -1
-
-        comparison = self._cmp_lists(self.prerelease, other.prerelease)
-        if comparison != 0:
-            return comparison
-
-        # Builds always come after no build string.
-        if not self.build and other.build:
-            return -1
-
-        if not other.build and self.build:
-            return 1
+        if self._key == other._key:
+            return 0
 
-        return self._cmp_lists(self.build, other.build)
-
-    def _cmp_parts(self, a, b):
-        if a < b:
-            return -1
-        elif a > b:
-            return 1
-
-        return 0
-
-    def _cmp_lists(self, a, b):  # type: (List, List) -> int
-        for i in range(max(len(a), len(b))):
-            a_part = None
-            if i < len(a):
-                a_part = a[i]
-
-            b_part = None
-            if i < len(b):
-                b_part = b[i]
-
-            if a_part == b_part:
-                continue
-
-            # Missing parts come after present ones.
-            if a_part is None:
-                return -1
-
-            if b_part is None:
-                return 1
-
-            if isinstance(a_part, int):
-                if isinstance(b_part, int):
-                    return self._cmp_parts(a_part, b_part)
-
-                return -1
-            else:
-                if isinstance(b_part, int):
-                    return 1
-
-                return self._cmp_parts(a_part, b_part)
-
-        return 0
+        return -1 if self._key < other._key else 1
 
     def __eq__(self, other):  # type: (Version) -> bool
         if not isinstance(other, Version):
             return NotImplemented
 
-        return (
-            self._major == other.major
-            and self._minor == other.minor
-            and self._patch == other.patch
-            and self._rest == other.rest
-            and self._prerelease == other.prerelease
-            and self._build == other.build
-        )
+        return self._key == other._key
 
     def __ne__(self, other):
         return not self == other
@@ -451,12 +419,4 @@ class Version(VersionRange):
         return "<Version {}>".format(str(self))
 
     def __hash__(self):
-        return hash(
-            (
-                self.major,
-                self.minor,
-                self.patch,
-                ".".join(str(p) for p in self.prerelease),
-                ".".join(str(p) for p in self.build),
-            )
-        )
+        return hash(self._key)
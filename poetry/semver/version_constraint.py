@@ -1,4 +1,7 @@
-class VersionConstraint:
+class VersionConstraint(object):
+
+    __slots__ = ()
+
     def is_empty(self):  # type: () -> bool
         raise NotImplementedError()
 
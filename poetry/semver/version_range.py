@@ -1,9 +1,13 @@
 from .empty_constraint import EmptyConstraint
+from .operation_cache import memoize
 from .version_constraint import VersionConstraint
 from .version_union import VersionUnion
 
 
 class VersionRange(VersionConstraint):
+
+    __slots__ = ("_min", "_max", "_full_max", "_include_min", "_include_max")
+
     def __init__(
         self,
         min=None,
@@ -75,6 +79,7 @@ class VersionRange(VersionConstraint):
 
         return True
 
+    @memoize
     def allows_all(self, other):  # type: (VersionConstraint) -> bool
         from .version import Version
 
@@ -92,6 +97,7 @@ class VersionRange(VersionConstraint):
 
         raise ValueError("Unknown VersionConstraint type {}.".format(other))
 
+    @memoize
     def allows_any(self, other):  # type: (VersionConstraint) -> bool
         from .version import Version
 
@@ -111,6 +117,7 @@ class VersionRange(VersionConstraint):
 
         raise ValueError("Unknown VersionConstraint type {}.".format(other))
 
+    @memoize
     def intersect(self, other):  # type: (VersionConstraint) -> VersionConstraint
         from .version import Version
 
@@ -166,6 +173,7 @@ class VersionRange(VersionConstraint):
             intersect_min, intersect_max, intersect_include_min, intersect_include_max
         )
 
+    @memoize
     def union(self, other):  # type: (VersionConstraint) -> VersionConstraint
         from .version import Version
 
@@ -218,6 +226,7 @@ class VersionRange(VersionConstraint):
 
         return VersionUnion.of(self, other)
 
+    @memoize
     def difference(self, other):  # type: (VersionConstraint) -> VersionConstraint
         from .version import Version
 
@@ -1,4 +1,5 @@
 from .empty_constraint import EmptyConstraint
+from .operation_cache import memoize
 from .version_constraint import VersionConstraint
 
 
@@ -12,13 +13,14 @@ class VersionUnion(VersionConstraint):
     """
 
     def __init__(self, *ranges):
-        self._ranges = list(ranges)
+        self._ranges = tuple(ranges)
 
     @property
     def ranges(self):
         return self._ranges
 
     @classmethod
+    @memoize
     def of(cls, *ranges):
         from .version_range import VersionRange
 
@@ -75,6 +77,7 @@ class VersionUnion(VersionConstraint):
     def allows(self, version):  # type: (Version) -> bool
         return any([constraint.allows(version) for constraint in self._ranges])
 
+    @memoize
     def allows_all(self, other):  # type: (VersionConstraint) -> bool
         our_ranges = iter(self._ranges)
         their_ranges = iter(self._ranges_for(other))
@@ -90,6 +93,7 @@ class VersionUnion(VersionConstraint):
 
         return their_current_range is None
 
+    @memoize
     def allows_any(self, other):  # type: (VersionConstraint) -> bool
         our_ranges = iter(self._ranges)
         their_ranges = iter(self._ranges_for(other))
@@ -108,6 +112,7 @@ class VersionUnion(VersionConstraint):
 
         return False
 
+    @memoize
     def intersect(self, other):  # type: (VersionConstraint) -> VersionConstraint
         our_ranges = iter(self._ranges)
         their_ranges = iter(self._ranges_for(other))
@@ -129,9 +134,11 @@ class VersionUnion(VersionConstraint):
 
         return VersionUnion.of(*new_ranges)
 
+    @memoize
     def union(self, other):  # type: (VersionConstraint) -> VersionConstraint
         return VersionUnion.of(self, other)
 
+    @memoize
     def difference(self, other):  # type: (VersionConstraint) -> VersionConstraint
         our_ranges = iter(self._ranges)
         their_ranges = iter(self._ranges_for(other))
@@ -240,6 +247,9 @@ class VersionUnion(VersionConstraint):
 
         return self._ranges == other.ranges
 
+    def __hash__(self):
+        return hash(tuple(self._ranges))
+
     def __str__(self):
         from .version_range import VersionRange
 
@@ -20,6 +20,7 @@ from poetry.utils._compat import decode
 from poetry.utils._compat import encode
 from poetry.utils._compat import list_to_shell_command
 from poetry.version.markers import BaseMarker
+from poetry.version.markers import MarkerEnvironment
 
 
 GET_ENVIRONMENT_INFO = """\
@@ -114,6 +115,7 @@ class Env(object):
         self._base = base or path
 
         self._marker_env = None
+        self._frozen_marker_env = None
 
     @property
     def path(self):  # type: () -> Path
@@ -309,7 +311,10 @@ class Env(object):
         raise NotImplementedError()
 
     def is_valid_for_marker(self, marker):  # type: (BaseMarker) -> bool
-        return marker.validate(self.marker_env)
+        if self._frozen_marker_env is None:
+            self._frozen_marker_env = MarkerEnvironment(self.marker_env)
+
+        return marker.compile()(self._frozen_marker_env)
 
     def is_sane(self):  # type: () -> bool
         """
@@ -6,10 +6,13 @@ from pyparsing import ZeroOrMore, Group, Forward, QuotedString
 from pyparsing import Literal as L  # noqa
 
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import Iterator
 from typing import List
 
+from poetry.utils._compat import lru_cache
+
 
 class InvalidMarker(ValueError):
     """
@@ -152,6 +155,29 @@ def _format_marker(marker, first=True):
         return marker
 
 
+class MarkerEnvironment(object):
+    """
+    A frozen marker environment, against which compiled markers are evaluated.
+
+    Since the environment does not change, each distinct single marker
+    is only validated once.
+    """
+
+    def __init__(self, environment):  # type: (Dict[str, Any]) -> None
+        self._environment = dict(environment)
+        self._results = {}  # type: Dict[tuple, bool]
+
+    def evaluate(
+        self, key, validate
+    ):  # type: (tuple, Callable[[Dict[str, Any]], bool]) -> bool
+        try:
+            return self._results[key]
+        except KeyError:
+            result = self._results[key] = validate(self._environment)
+
+            return result
+
+
 class BaseMarker(object):
     def intersect(self, other):  # type: (BaseMarker) -> BaseMarker
         raise NotImplementedError()
@@ -168,6 +194,20 @@ class BaseMarker(object):
     def validate(self, environment):  # type: (Dict[str, Any]) -> bool
         raise NotImplementedError()
 
+    def compile(self):  # type: () -> Callable[[MarkerEnvironment], bool]
+        """
+        Lowers the marker to a predicate evaluated against a MarkerEnvironment,
+        equivalent to validate().
+        """
+        predicate = self.__dict__.get("_predicate")
+        if predicate is None:
+            predicate = self._predicate = self._compile()
+
+        return predicate
+
+    def _compile(self):  # type: () -> Callable[[MarkerEnvironment], bool]
+        raise NotImplementedError()
+
     def without_extras(self):  # type: () -> BaseMarker
         raise NotImplementedError()
 
@@ -191,6 +231,9 @@ class AnyMarker(BaseMarker):
     def validate(self, environment):
         return True
 
+    def _compile(self):
+        return lambda environment: True
+
     def without_extras(self):
         return self
 
@@ -217,6 +260,9 @@ class EmptyMarker(BaseMarker):
     def validate(self, environment):
         return False
 
+    def _compile(self):
+        return lambda environment: False
+
     def without_extras(self):
         return self
 
@@ -338,6 +384,15 @@ class SingleMarker(BaseMarker):
 
         return self._constraint.allows(self._parser(environment[self._name]))
 
+    def _compile(self):
+        key = (self._name, self._constraint_string)
+        validate = self.validate
+
+        def predicate(environment):
+            return environment.evaluate(key, validate)
+
+        return predicate
+
     def without_extras(self):
         if self.name == "extra":
             return EmptyMarker()
@@ -375,12 +430,9 @@ def _flatten_markers(
 
 class MultiMarker(BaseMarker):
     def __init__(self, *markers):
-        self._markers = []
-
-        markers = _flatten_markers(markers, MultiMarker)
-
-        for m in markers:
-            self._markers.append(m)
+        # The markers are shared between the parsed markers
+        # so they are kept in a tuple, which cannot be changed.
+        self._markers = tuple(_flatten_markers(markers, MultiMarker))
 
     @classmethod
     def of(cls, *markers):
@@ -433,7 +485,7 @@ class MultiMarker(BaseMarker):
         if other.is_empty():
             return other
 
-        new_markers = self._markers + [other]
+        new_markers = self._markers + (other,)
 
         return MultiMarker.of(*new_markers)
 
@@ -450,6 +502,18 @@ class MultiMarker(BaseMarker):
 
         return True
 
+    def _compile(self):
+        predicates = tuple(m.compile() for m in self._markers)
+
+        def predicate(environment):
+            for p in predicates:
+                if not p(environment):
+                    return False
+
+            return True
+
+        return predicate
+
     def without_extras(self):
         new_markers = []
 
@@ -489,17 +553,17 @@ class MultiMarker(BaseMarker):
 
 class MarkerUnion(BaseMarker):
     def __init__(self, *markers):
-        self._markers = []
+        new_markers = []
 
         markers = _flatten_markers(markers, MarkerUnion)
 
         for marker in markers:
-            if marker in self._markers:
+            if marker in new_markers:
                 continue
 
             if isinstance(marker, SingleMarker) and marker.name == "python_version":
                 intersected = False
-                for i, mark in enumerate(self._markers):
+                for i, mark in enumerate(new_markers):
                     if (
                         not isinstance(mark, SingleMarker)
                         or isinstance(mark, SingleMarker)
@@ -512,25 +576,22 @@ class MarkerUnion(BaseMarker):
                         intersected = True
                         break
                     elif intersection == marker.constraint:
-                        self._markers[i] = marker
+                        new_markers[i] = marker
                         intersected = True
                         break
 
                 if intersected:
                     continue
 
-            self._markers.append(marker)
+            new_markers.append(marker)
+
+        # Shared between the parsed markers, like the ones of MultiMarker.
+        self._markers = tuple(new_markers)
 
     @property
     def markers(self):
         return self._markers
 
-    def append(self, marker):
-        if marker in self._markers:
-            return
-
-        self._markers.append(marker)
-
     def intersect(self, other):
         if other.is_any():
             return self
@@ -562,7 +623,7 @@ class MarkerUnion(BaseMarker):
         if other.is_empty():
             return self
 
-        new_markers = self._markers + [other]
+        new_markers = self._markers + (other,)
 
         return MarkerUnion(*new_markers)
 
@@ -573,6 +634,18 @@ class MarkerUnion(BaseMarker):
 
         return False
 
+    def _compile(self):
+        predicates = tuple(m.compile() for m in self._markers)
+
+        def predicate(environment):
+            for p in predicates:
+                if p(environment):
+                    return True
+
+            return False
+
+        return predicate
+
     def without_extras(self):
         new_markers = []
 
@@ -601,7 +674,18 @@ class MarkerUnion(BaseMarker):
         return " or ".join(str(m) for m in self._markers)
 
 
-def parse_marker(marker):
+def parse_marker(marker):  # type: (str) -> BaseMarker
+    """
+    Parses a marker string.
+
+    The markers parsed from the same string are shared
+    instead of being parsed again.
+    """
+    return _parse_marker(marker)
+
+
+@lru_cache(maxsize=2048)
+def _parse_marker(marker):  # type: (str) -> BaseMarker
     if marker == "<empty>":
         return EmptyMarker()
 
@@ -0,0 +1,496 @@
+from collections import OrderedDict
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from poetry.semver import Version
+from poetry.semver import VersionConstraint
+from poetry.semver import VersionRange
+from poetry.semver import VersionUnion
+from poetry.semver import parse_constraint
+from poetry.semver.operation_cache import OperationCache
+
+from .markers import AnyMarker
+from .markers import BaseMarker
+from .markers import EmptyMarker
+from .markers import MarkerUnion
+from .markers import MultiMarker
+from .markers import SingleMarker
+
+
+# Markers with more conjunctions than this, once distributed,
+# are left as they are.
+MAX_CONJUNCTIONS = 64
+
+# The names whose values are versions, reasoned about as intervals.
+VERSION_NAMES = {"python_version", "python_full_version", "platform_release"}
+
+# The names which can have several values at once, like the extras
+# requested for a package, so their markers are left as they are.
+MULTI_VALUED_NAMES = {"extra"}
+
+
+# The conjunctions of the markers already converted, keyed by their identity,
+# since the simplified markers are combined again and again by the solver.
+_conjunctions_cache = OperationCache(maxsize=8192)
+
+
+class _TooComplex(Exception):
+
+    pass
+
+
+class ValueSet(object):
+    """
+    The values allowed for a marker name, either a finite set of values
+    or every value except a finite set of them.
+
+    It mirrors the set operations of version constraints.
+    """
+
+    def __init__(self, values, excluded=False):  # type: (Any, bool) -> None
+        self._values = frozenset(values)
+        self._excluded = excluded
+
+    @property
+    def values(self):  # type: () -> frozenset
+        return self._values
+
+    @property
+    def excluded(self):  # type: () -> bool
+        return self._excluded
+
+    def is_empty(self):  # type: () -> bool
+        return not self._excluded and not self._values
+
+    def is_any(self):  # type: () -> bool
+        return self._excluded and not self._values
+
+    def allows_all(self, other):  # type: (ValueSet) -> bool
+        if not self._excluded:
+            return not other.excluded and other.values <= self._values
+
+        if not other.excluded:
+            return not other.values & self._values
+
+        return self._values <= other.values
+
+    def intersect(self, other):  # type: (ValueSet) -> ValueSet
+        if not self._excluded:
+            if not other.excluded:
+                return ValueSet(self._values & other.values)
+
+            return ValueSet(self._values - other.values)
+
+        if not other.excluded:
+            return ValueSet(other.values - self._values)
+
+        return ValueSet(self._values | other.values, excluded=True)
+
+    def union(self, other):  # type: (ValueSet) -> ValueSet
+        if not self._excluded:
+            if not other.excluded:
+                return ValueSet(self._values | other.values)
+
+            return ValueSet(other.values - self._values, excluded=True)
+
+        if not other.excluded:
+            return ValueSet(self._values - other.values, excluded=True)
+
+        return ValueSet(self._values & other.values, excluded=True)
+
+    def __eq__(self, other):
+        if not isinstance(other, ValueSet):
+            return False
+
+        return self._excluded == other.excluded and self._values == other.values
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self._excluded, self._values))
+
+    def __repr__(self):
+        return "<ValueSet {}{}>".format(
+            "not " if self._excluded else "", sorted(self._values)
+        )
+
+
+class _Conjunction(object):
+    """
+    A conjunction of single markers, with the values allowed
+    for each marker name it can reason about.
+
+    The markers it cannot reason about are kept as they are.
+    """
+
+    def __init__(self):
+        # The marker names and the opaque markers, in order of appearance
+        self.keys = []  # type: List[Any]
+        self.domains = {}  # type: Dict[str, Any]
+        # The single markers a domain was intersected from,
+        # or None once it is the union of other domains.
+        self.sources = {}  # type: Dict[str, Optional[list]]
+
+    @classmethod
+    def of(cls, marker):  # type: (SingleMarker) -> _Conjunction
+        conjunction = cls()
+
+        domain = _domain(marker)
+        if domain is None:
+            conjunction.keys.append(marker)
+        elif not domain.is_any():
+            conjunction.keys.append(marker.name)
+            conjunction.domains[marker.name] = domain
+            conjunction.sources[marker.name] = [(marker, domain)]
+
+        return conjunction
+
+    def copy(self):  # type: () -> _Conjunction
+        conjunction = _Conjunction()
+        conjunction.keys = list(self.keys)
+        conjunction.domains = dict(self.domains)
+        conjunction.sources = dict(self.sources)
+
+        return conjunction
+
+    def key(self):  # type: () -> tuple
+        return frozenset(self.domains.items()), self.atoms()
+
+    def atoms(self):  # type: () -> frozenset
+        return frozenset(key for key in self.keys if isinstance(key, BaseMarker))
+
+    def intersect(self, other):  # type: (_Conjunction) -> Optional[_Conjunction]
+        """
+        Returns the intersection of both conjunctions,
+        or None if it is not satisfiable.
+        """
+        conjunction = self.copy()
+
+        for key in other.keys:
+            if isinstance(key, BaseMarker):
+                if key not in conjunction.keys:
+                    conjunction.keys.append(key)
+
+                continue
+
+            if key not in conjunction.domains:
+                conjunction.keys.append(key)
+                conjunction.domains[key] = other.domains[key]
+                conjunction.sources[key] = other.sources[key]
+
+                continue
+
+            domain = conjunction.domains[key].intersect(other.domains[key])
+            if domain.is_empty():
+                return
+
+            sources = conjunction.sources[key]
+            if sources is not None and other.sources[key] is not None:
+                sources = sources + [
+                    source for source in other.sources[key] if source not in sources
+                ]
+            else:
+                sources = None
+
+            conjunction.domains[key] = domain
+            conjunction.sources[key] = sources
+
+        return conjunction
+
+    def implies(self, other):  # type: (_Conjunction) -> bool
+        for name, domain in other.domains.items():
+            if name not in self.domains or not domain.allows_all(self.domains[name]):
+                return False
+
+        return other.atoms() <= self.atoms()
+
+    def merge(self, other):  # type: (_Conjunction) -> Optional[_Conjunction]
+        """
+        Returns the union of both conjunctions if they only differ
+        by the values allowed for a single marker name.
+        """
+        if set(self.domains) != set(other.domains) or self.atoms() != other.atoms():
+            return
+
+        different = [
+            name for name in self.domains if self.domains[name] != other.domains[name]
+        ]
+        if len(different) != 1:
+            return
+
+        name = different[0]
+        domain = self.domains[name].union(other.domains[name])
+
+        conjunction = self.copy()
+        if domain.is_any():
+            conjunction.keys.remove(name)
+            del conjunction.domains[name]
+            del conjunction.sources[name]
+        else:
+            conjunction.domains[name] = domain
+            conjunction.sources[name] = None
+
+        return conjunction
+
+    def to_markers(self):  # type: () -> List[List[BaseMarker]]
+        """
+        Returns the alternatives of single markers equivalent to the conjunction.
+        """
+        alternatives = [[]]
+        for key in self.keys:
+            if isinstance(key, BaseMarker):
+                options = [[key]]
+            elif self.sources[key] is not None:
+                options = [_prune(self.sources[key], self.domains[key])]
+            else:
+                options = _domain_markers(key, self.domains[key])
+
+            alternatives = [
+                alternative + option
+                for alternative in alternatives
+                for option in options
+            ]
+
+        return alternatives
+
+
+def simplify_marker(marker):  # type: (BaseMarker) -> BaseMarker
+    """
+    Returns a canonical form of a marker, as a union of intersections
+    of single markers.
+
+    The version markers are reasoned about as intervals and the other markers
+    comparing names to values as sets of values, so that intersections which
+    cannot be satisfied, alternatives which are contained by others and
+    alternatives which only differ by a single name are reduced.
+
+    Markers whose canonical form would be longer, which happens when
+    intersections of unions have to be distributed, are left as they are.
+    """
+    if marker.is_any() or marker.is_empty() or isinstance(marker, SingleMarker):
+        return marker
+
+    try:
+        simplified = _simplify(marker)
+    except _TooComplex:
+        return marker
+
+    if _is_factored(marker) and len(str(simplified)) > len(str(marker)):
+        return marker
+
+    return simplified
+
+
+def _is_factored(marker):  # type: (BaseMarker) -> bool
+    """
+    Whether the marker has intersections of unions.
+    """
+    if isinstance(marker, MultiMarker):
+        return any(
+            isinstance(m, MarkerUnion) or _is_factored(m) for m in marker.markers
+        )
+
+    if isinstance(marker, MarkerUnion):
+        return any(_is_factored(m) for m in marker.markers)
+
+    return False
+
+
+def _simplify(marker):  # type: (BaseMarker) -> BaseMarker
+    conjunctions = _to_conjunctions(marker)
+
+    markers = []
+    for conjunction in conjunctions:
+        for alternative in conjunction.to_markers():
+            if not alternative:
+                return AnyMarker()
+
+            if len(alternative) == 1:
+                markers.append(alternative[0])
+            else:
+                markers.append(MultiMarker(*alternative))
+
+    if not markers:
+        return EmptyMarker()
+
+    if len(markers) == 1:
+        return markers[0]
+
+    return MarkerUnion(*markers)
+
+
+def _to_conjunctions(marker):  # type: (BaseMarker) -> List[_Conjunction]
+    key = ("conjunctions", id(marker))
+
+    conjunctions = _conjunctions_cache.get(key)
+    if conjunctions is None:
+        conjunctions = _convert(marker)
+        _conjunctions_cache.put(key, (marker,), conjunctions)
+
+    return conjunctions
+
+
+def _convert(marker):  # type: (BaseMarker) -> List[_Conjunction]
+    if marker.is_any():
+        return [_Conjunction()]
+
+    if marker.is_empty():
+        return []
+
+    if isinstance(marker, SingleMarker):
+        return [_Conjunction.of(marker)]
+
+    if isinstance(marker, MarkerUnion):
+        conjunctions = []
+        for m in marker.markers:
+            conjunctions += _to_conjunctions(m)
+
+        return _reduce(conjunctions)
+
+    if isinstance(marker, MultiMarker):
+        conjunctions = [_Conjunction()]
+        for m in marker.markers:
+            conjunctions = _reduce(
+                [
+                    intersection
+                    for intersection in (
+                        ours.intersect(theirs)
+                        for ours in conjunctions
+                        for theirs in _to_conjunctions(m)
+                    )
+                    if intersection is not None
+                ]
+            )
+
+            if len(conjunctions) > MAX_CONJUNCTIONS:
+                raise _TooComplex()
+
+        return conjunctions
+
+    raise _TooComplex()
+
+
+def _reduce(conjunctions):  # type: (List[_Conjunction]) -> List[_Conjunction]
+    """
+    Removes the conjunctions implied by others
+    and merges the ones differing by a single name, until none are left.
+    """
+    conjunctions = list(OrderedDict((c.key(), c) for c in conjunctions).values())
+
+    reduced = True
+    while reduced:
+        reduced = False
+
+        for i, ours in enumerate(conjunctions):
+            for j, theirs in enumerate(conjunctions):
+                if i == j:
+                    continue
+
+                if ours.implies(theirs):
+                    del conjunctions[i]
+                    reduced = True
+                    break
+
+                merged = ours.merge(theirs)
+                if merged is not None:
+                    conjunctions[i] = merged
+                    del conjunctions[j]
+                    reduced = True
+                    break
+
+            if reduced:
+                break
+
+    return conjunctions
+
+
+def _domain(marker):  # type: (SingleMarker) -> Any
+    if marker.name in MULTI_VALUED_NAMES:
+        return
+
+    if marker.name in VERSION_NAMES:
+        if isinstance(marker.constraint, VersionConstraint):
+            return marker.constraint
+
+        if marker.operator in {"in", "not in"}:
+            return
+
+        try:
+            return parse_constraint(marker.constraint_string)
+        except ValueError:
+            return
+
+    if marker.operator == "==":
+        return ValueSet([marker.value])
+
+    if marker.operator == "!=":
+        return ValueSet([marker.value], excluded=True)
+
+
+def _prune(sources, domain):  # type: (list, Any) -> List[BaseMarker]
+    """
+    Removes the markers which are not needed to intersect to the domain.
+    """
+    sources = list(sources)
+    for source in list(sources):
+        others = [s for s in sources if s is not source]
+        if not others:
+            break
+
+        intersection = others[0][1]
+        for other in others[1:]:
+            intersection = intersection.intersect(other[1])
+
+        if intersection == domain:
+            sources = others
+
+    return [marker for marker, _ in sources]
+
+
+def _domain_markers(name, domain):  # type: (str, Any) -> List[List[BaseMarker]]
+    if isinstance(domain, ValueSet):
+        values = sorted(domain.values)
+        if domain.excluded:
+            return [[SingleMarker(name, "!={}".format(value)) for value in values]]
+
+        return [[SingleMarker(name, "=={}".format(value))] for value in values]
+
+    if isinstance(domain, Version):
+        return [[SingleMarker(name, "=={}".format(domain.text))]]
+
+    if isinstance(domain, VersionRange):
+        markers = []
+        if domain.min is not None:
+            markers.append(
+                SingleMarker(
+                    name,
+                    "{}{}".format(">=" if domain.include_min else ">", domain.min.text),
+                )
+            )
+
+        if domain.max is not None:
+            markers.append(
+                SingleMarker(
+                    name,
+                    "{}{}".format("<=" if domain.include_max else "<", domain.max.text),
+                )
+            )
+
+        return [markers]
+
+    if isinstance(domain, VersionUnion):
+        excluded = VersionRange().difference(domain)
+        if isinstance(excluded, Version):
+            return [[SingleMarker(name, "!={}".format(excluded.text))]]
+
+        alternatives = []
+        for range in domain.ranges:
+            alternatives += _domain_markers(name, range)
+
+        return alternatives
+
+    raise ValueError("Unknown domain {}".format(domain))
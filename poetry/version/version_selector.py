@@ -1,9 +1,12 @@
+from typing import List
+from typing import Tuple
 from typing import Union
 
 from poetry.packages import Dependency
 from poetry.packages import Package
 from poetry.semver import parse_constraint
 from poetry.semver import Version
+from poetry.semver import VersionConstraint
 
 
 class VersionSelector(object):
@@ -20,15 +23,49 @@ class VersionSelector(object):
         Given a package name and optional version,
         returns the latest Package that matches
         """
-        if target_package_version:
-            constraint = parse_constraint(target_package_version)
-        else:
-            constraint = parse_constraint("*")
-
+        constraint = self._parse_constraint(target_package_version)
         candidates = self._pool.find_packages(
             package_name, constraint, allow_prereleases=allow_prereleases
         )
 
+        return self._select_best_candidate(package_name, constraint, candidates)
+
+    def find_best_candidates(
+        self,
+        requests,  # type: List[Tuple[str, Union[str, None]]]
+        allow_prereleases=False,  # type: bool
+    ):  # type: (...) -> List[Union[Package, bool]]
+        """
+        Given a list of package names and optional versions,
+        returns the latest Package that matches each of them.
+
+        The candidates of all packages are retrieved concurrently.
+        """
+        constraints = [self._parse_constraint(version) for _, version in requests]
+        candidates = self._pool.find_packages_many(
+            [
+                (name, constraint)
+                for (name, _), constraint in zip(requests, constraints)
+            ],
+            allow_prereleases=allow_prereleases,
+        )
+
+        return [
+            self._select_best_candidate(name, constraint, package_candidates)
+            for (name, _), constraint, package_candidates in zip(
+                requests, constraints, candidates
+            )
+        ]
+
+    def _parse_constraint(self, target_package_version):
+        if target_package_version:
+            return parse_constraint(target_package_version)
+
+        return parse_constraint("*")
+
+    def _select_best_candidate(
+        self, package_name, constraint, candidates
+    ):  # type: (str, VersionConstraint, List[Package]) -> Union[Package, bool]
         if not candidates:
             return False
 
@@ -0,0 +1,77 @@
+import pytest
+
+from cachy import CacheManager
+from cleo.testers import CommandTester
+
+from poetry.repositories.metadata_store import MetadataStore
+from poetry.utils._compat import Path
+
+
+@pytest.fixture
+def repository_cache(tmp_dir, mocker):
+    mocker.patch("poetry.locations.CACHE_DIR", tmp_dir)
+
+    cache = CacheManager(
+        {
+            "default": "pypi",
+            "serializer": "json",
+            "stores": {
+                "pypi": {
+                    "driver": "metadata",
+                    "path": str(Path(tmp_dir) / "cache" / "repositories" / "pypi"),
+                }
+            },
+        }
+    )
+    cache.extend("metadata", lambda config: MetadataStore(config["path"]))
+
+    cache.forever("cachy:0.1.0", {"name": "cachy", "version": "0.1.0"})
+    cache.forever("cachy:0.2.0", {"name": "cachy", "version": "0.2.0"})
+
+    return cache
+
+
+def test_clear_all_entries(app, repository_cache):
+    command = app.find("cache:clear")
+    tester = CommandTester(command)
+    tester.set_inputs(["yes"])
+
+    tester.execute(
+        [("command", command.get_name()), ("cache", "pypi"), ("--all", True)]
+    )
+
+    assert "Delete 2 entries?" in tester.get_display(True)
+    assert repository_cache.get_store().count() == 0
+
+
+def test_clear_all_entries_requires_confirmation(app, repository_cache):
+    command = app.find("cache:clear")
+    tester = CommandTester(command)
+    tester.set_inputs(["no"])
+
+    tester.execute(
+        [("command", command.get_name()), ("cache", "pypi"), ("--all", True)]
+    )
+
+    assert repository_cache.get_store().count() == 2
+
+
+def test_clear_single_entry(app, repository_cache):
+    command = app.find("cache:clear")
+    tester = CommandTester(command)
+    tester.set_inputs(["yes"])
+
+    tester.execute([("command", command.get_name()), ("cache", "pypi:cachy:0.1.0")])
+
+    assert repository_cache.get("cachy:0.1.0") is None
+    assert repository_cache.get("cachy:0.2.0") == {"name": "cachy", "version": "0.2.0"}
+
+
+def test_clear_unknown_entry(app, repository_cache):
+    command = app.find("cache:clear")
+    tester = CommandTester(command)
+
+    tester.execute([("command", command.get_name()), ("cache", "pypi:cachy:1.0.0")])
+
+    assert tester.get_display(True) == "No cache entries for cachy:1.0.0\n"
+    assert repository_cache.get_store().count() == 2
@@ -31,7 +31,13 @@ def test_list_displays_default_value_if_not_set(app, config):
 
     tester.execute([("command", command.get_name()), ("--list", True)])
 
-    expected = """settings.virtualenvs.create = true
+    expected = """settings.cache.max-age = 0
+settings.cache.max-size = 256
+settings.http.async = false
+settings.http.pool-size = 10
+settings.http.retries = 3
+settings.http.timeout = 15
+settings.virtualenvs.create = true
 settings.virtualenvs.in-project = false
 settings.virtualenvs.path = "."
 repositories = {}
@@ -56,7 +62,13 @@ def test_list_displays_set_get_setting(app, config):
     command._config = Config(config.file)
     tester.execute([("command", command.get_name()), ("--list", True)])
 
-    expected = """settings.virtualenvs.create = false
+    expected = """settings.cache.max-age = 0
+settings.cache.max-size = 256
+settings.http.async = false
+settings.http.pool-size = 10
+settings.http.retries = 3
+settings.http.timeout = 15
+settings.virtualenvs.create = false
 settings.virtualenvs.in-project = false
 settings.virtualenvs.path = "."
 repositories = {}
@@ -78,3 +90,30 @@ def test_display_single_setting(app, config):
 """
 
     assert tester.get_display(True) == expected
+
+
+def test_set_http_setting(app, config):
+    command = app.find("config")
+    command._config = Config(config.file)
+    tester = CommandTester(command)
+
+    tester.execute(
+        [
+            ("command", command.get_name()),
+            ("key", "settings.http.timeout"),
+            ("value", ["2.5"]),
+        ]
+    )
+
+    assert Config(config.file).setting("settings.http.timeout") == 2.5
+
+    with pytest.raises(RuntimeError):
+        tester.execute(
+            [
+                ("command", command.get_name()),
+                ("key", "settings.http.pool-size"),
+                ("value", ["many"]),
+            ]
+        )
+
+    config.remove_property("settings.http.timeout")
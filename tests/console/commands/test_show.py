@@ -315,7 +315,7 @@ def test_show_latest_decorated(app, poetry, installed, repo):
     assert tester.get_display(True) == expected
 
 
-def test_show_outdated(app, poetry, installed, repo):
+def test_show_outdated(app, poetry, installed, repo, mocker):
     command = app.find("show")
     tester = CommandTester(command)
 
@@ -367,6 +367,8 @@ def test_show_outdated(app, poetry, installed, repo):
         }
     )
 
+    find_packages_many = mocker.spy(poetry.pool, "find_packages_many")
+
     tester.execute([("command", command.get_name()), ("--outdated", True)])
 
     expected = """\
@@ -374,6 +376,7 @@ cachy    0.1.0 0.2.0 Cachy package
 """
 
     assert tester.get_display(True) == expected
+    assert find_packages_many.call_count == 1
 
 
 def test_show_hides_incompatible_package(app, poetry, installed, repo):
@@ -75,7 +75,7 @@ def installed():
 
 
 @pytest.fixture(autouse=True)
-def setup(mocker, installer, installed):
+def setup(mocker, installer, installed, tmp_dir):
     mocker.patch(
         "poetry.utils.env.Env.get", return_value=MockEnv(is_venv=True, execute=True)
     )
@@ -92,6 +92,12 @@ def setup(mocker, installer, installed):
     )
     p.return_value = installed
 
+    # Keeping resolutions out of the user cache
+    mocker.patch(
+        "poetry.puzzle.resolution_cache.RESOLUTIONS_CACHE_DIR",
+        str(Path(tmp_dir) / "resolutions"),
+    )
+
     # Patch git module to not actually clone projects
     mocker.patch("poetry.vcs.git.Git.clone", new=mock_clone)
     mocker.patch("poetry.vcs.git.Git.checkout", new=lambda *_: None)
@@ -45,3 +45,22 @@ def test_uploader_registers_for_appropriate_400_errors(mocker, http):
         uploader.upload("https://foo.com")
 
     assert 1 == register.call_count
+
+
+def test_uploader_sessions_use_the_upload_retries_and_no_timeout():
+    poetry = Poetry.create(project("simple_project"))
+    uploader = Uploader(poetry, NullIO())
+
+    session = uploader.make_session()
+    try:
+        adapter = session.get_adapter("https://foo.com")
+        retry = adapter.max_retries
+
+        assert retry.connect == 5
+        assert retry.total == 10
+        assert set(retry.status_forcelist) == {500, 501, 502, 503}
+        assert list(retry.method_whitelist) == ["GET"]
+        assert session.timeout is None
+        assert adapter.poolmanager is poetry.pool.http_client.poolmanager
+    finally:
+        session.close()
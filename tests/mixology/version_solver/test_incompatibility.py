@@ -0,0 +1,83 @@
+from poetry.packages import Dependency
+from poetry.packages import VCSDependency
+from poetry.mixology.incompatibility import Incompatibility
+from poetry.mixology.incompatibility_cause import ConflictCause
+from poetry.mixology.incompatibility_cause import DependencyCause
+from poetry.mixology.incompatibility_cause import NoVersionsCause
+from poetry.mixology.term import Term
+
+
+def dependency_incompatibility(depender, dependee):
+    return Incompatibility(
+        [Term(Dependency(*depender), True), Term(Dependency(*dependee), False)],
+        DependencyCause(),
+    )
+
+
+def test_terms_are_equal_if_they_have_the_same_package_and_constraint():
+    term = Term(Dependency("foo", "^1.0"), True)
+
+    assert term == Term(Dependency("foo", ">=1.0,<2.0"), True)
+    assert hash(term) == hash(Term(Dependency("foo", ">=1.0,<2.0"), True))
+    assert term != Term(Dependency("foo", "^1.0"), False)
+    assert term != Term(Dependency("foo", "^2.0"), True)
+    assert term != Term(Dependency("bar", "^1.0"), True)
+
+
+def test_terms_are_not_equal_if_their_dependencies_differ():
+    term = Term(Dependency("foo", "^1.0"), True)
+
+    with_extras = Dependency("foo", "^1.0")
+    with_extras.extras.append("bar")
+    prereleases = Dependency("foo", "^1.0", allows_prereleases=True)
+    vcs = VCSDependency("foo", "git", "https://github.com/demo/foo.git")
+    other_vcs = VCSDependency("foo", "git", "https://github.com/demo/bar.git")
+
+    assert term != Term(with_extras, True)
+    assert term != Term(prereleases, True)
+    assert Term(vcs, True) != Term(other_vcs, True)
+    assert Term(vcs, True) == Term(
+        VCSDependency("foo", "git", "https://github.com/demo/foo.git"), True
+    )
+    assert len({term, Term(with_extras, True), Term(prereleases, True)}) == 3
+
+
+def test_dependency_incompatibilities_are_not_equal_if_their_extras_differ():
+    with_extras = Dependency("bar", "^1.0")
+    with_extras.extras.append("baz")
+    incompatibility = dependency_incompatibility(("foo", "1.0"), ("bar", "^1.0"))
+    other = Incompatibility(
+        [Term(Dependency("foo", "1.0"), True), Term(with_extras, False)],
+        DependencyCause(),
+    )
+
+    assert incompatibility != other
+    assert len({incompatibility, other}) == 2
+
+
+def test_incompatibilities_with_the_same_terms_and_cause_are_equal():
+    incompatibility = dependency_incompatibility(("foo", "1.0"), ("bar", "^1.0"))
+    other = dependency_incompatibility(("foo", "1.0"), ("bar", "^1.0"))
+    reordered = Incompatibility(list(reversed(other.terms)), DependencyCause())
+
+    assert incompatibility == other
+    assert incompatibility == reordered
+    assert len({incompatibility, other, reordered}) == 1
+
+    assert incompatibility != dependency_incompatibility(
+        ("foo", "1.0"), ("bar", "^2.0")
+    )
+    assert incompatibility != Incompatibility(incompatibility.terms, NoVersionsCause())
+
+
+def test_derived_incompatibilities_are_equal_if_they_have_the_same_causes():
+    foo = dependency_incompatibility(("foo", "1.0"), ("bar", "^1.0"))
+    bar = Incompatibility([Term(Dependency("bar", "^1.0"), True)], NoVersionsCause())
+    terms = [Term(Dependency("foo", "1.0"), True)]
+    derived = Incompatibility(terms, ConflictCause(foo, bar))
+
+    assert derived == Incompatibility(
+        terms,
+        ConflictCause(dependency_incompatibility(("foo", "1.0"), ("bar", "^1.0")), bar),
+    )
+    assert derived != Incompatibility(terms, ConflictCause(bar, foo))
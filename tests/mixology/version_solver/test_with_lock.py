@@ -118,3 +118,94 @@ def test_with_compatible_locked_dependencies_use_latest(root, provider, repo):
         },
         use_latest=["foo"],
     )
+
+
+def test_locked_versions_are_selected_without_searching_for_other_versions(
+    root, provider, repo, mocker
+):
+    root.add_dependency("foo", "*")
+    root.add_dependency("baz", "*")
+
+    add_to_repo(repo, "foo", "1.0.0", deps={"bar": "1.0.0"})
+    add_to_repo(repo, "foo", "1.0.1", deps={"bar": "1.0.1"})
+    add_to_repo(repo, "foo", "1.0.2", deps={"bar": "1.0.2"})
+    add_to_repo(repo, "bar", "1.0.0")
+    add_to_repo(repo, "bar", "1.0.1")
+    add_to_repo(repo, "bar", "1.0.2")
+    add_to_repo(repo, "baz", "1.0.0")
+
+    search_for = mocker.spy(provider, "search_for")
+
+    check_solver_result(
+        root,
+        provider,
+        result={"foo": "1.0.1", "bar": "1.0.1", "baz": "1.0.0"},
+        locked={"foo": get_package("foo", "1.0.1"), "bar": get_package("bar", "1.0.1")},
+    )
+
+    searched = [call[0][0] for call in search_for.call_args_list]
+    assert ["baz"] == [
+        dependency.name for dependency in searched if not dependency.is_root
+    ]
+
+
+def test_conflicting_locked_versions_are_unlocked(root, provider, repo, mocker):
+    root.add_dependency("foo", "*")
+    root.add_dependency("baz", "*")
+    root.add_dependency("qux", "*")
+
+    add_to_repo(repo, "foo", "1.0.0", deps={"bar": "1.0.0"})
+    add_to_repo(repo, "foo", "1.0.1", deps={"bar": "1.0.1"})
+    add_to_repo(repo, "bar", "1.0.0")
+    add_to_repo(repo, "bar", "1.0.1")
+    add_to_repo(repo, "baz", "1.0.0", deps={"bar": "<1.0.1"})
+    add_to_repo(repo, "baz", "1.0.1", deps={"bar": "<1.0.1"})
+    add_to_repo(repo, "qux", "1.0.0")
+    add_to_repo(repo, "qux", "1.0.1")
+
+    incompatibilities_for = mocker.spy(provider, "incompatibilities_for")
+
+    check_solver_result(
+        root,
+        provider,
+        result={"foo": "1.0.0", "bar": "1.0.0", "baz": "1.0.1", "qux": "1.0.0"},
+        locked={
+            "foo": get_package("foo", "1.0.1"),
+            "bar": get_package("bar", "1.0.1"),
+            "qux": get_package("qux", "1.0.0"),
+        },
+    )
+
+    # Only the conflicting packages are resolved again with their other versions.
+    merged = [
+        call[0][0].name
+        for call in incompatibilities_for.call_args_list
+        if call[1].get("merge", True)
+    ]
+    assert {"myapp", "baz", "foo", "bar"} == set(merged)
+
+
+def test_locked_versions_are_decided_on_before_choosing_other_versions(
+    root, provider, repo, mocker
+):
+    root.add_dependency("foo", "*")
+    root.add_dependency("baz", "*")
+
+    add_to_repo(repo, "foo", "1.0.0", deps={"bar": "*"})
+    add_to_repo(repo, "foo", "1.0.1", deps={"bar": "*"})
+    add_to_repo(repo, "bar", "1.0.0")
+    add_to_repo(repo, "bar", "1.0.1")
+    add_to_repo(repo, "baz", "1.0.0")
+    add_to_repo(repo, "baz", "1.0.1")
+
+    count_for = mocker.spy(provider, "count_for")
+
+    check_solver_result(
+        root,
+        provider,
+        result={"foo": "1.0.0", "bar": "1.0.0", "baz": "1.0.1"},
+        locked={"foo": get_package("foo", "1.0.0"), "bar": get_package("bar", "1.0.0")},
+    )
+
+    # baz is the only package left to choose a version of
+    assert count_for.call_count == 0
@@ -1,6 +1,8 @@
 import pytest
 
 from poetry.io import NullIO
+from poetry.packages import DependencyPackage
+from poetry.packages import Package
 from poetry.packages import ProjectPackage
 from poetry.packages.directory_dependency import DirectoryDependency
 from poetry.packages.file_dependency import FileDependency
@@ -8,6 +10,7 @@ from poetry.packages.vcs_dependency import VCSDependency
 from poetry.puzzle.provider import Provider
 from poetry.repositories.pool import Pool
 from poetry.repositories.repository import Repository
+from poetry.semver import Version
 from poetry.utils._compat import PY35
 from poetry.utils._compat import Path
 from poetry.utils.env import EnvCommandError
@@ -368,3 +371,112 @@ def test_search_for_file_wheel_with_extras(provider):
         "foo": [get_dependency("cleo")],
         "bar": [get_dependency("tomlkit")],
     }
+
+
+def test_incompatibilities_for_merges_versions_with_the_same_dependencies(
+    provider, repository
+):
+    for version, dependencies in [
+        ("1.0.0", [("bar", "^1.0")]),
+        ("1.1.0", [("bar", "^2.0")]),
+        ("1.2.0", [("bar", "^2.0"), ("baz", "*")]),
+        ("1.3.0", [("bar", "^2.0"), ("baz", "*")]),
+        ("1.4.0", [("bar", "^3.0"), ("baz", "*")]),
+    ]:
+        package = Package("foo", version)
+        for name, constraint in dependencies:
+            package.add_dependency(name, constraint)
+
+        repository.add_package(package)
+
+    dependency = get_dependency("foo", "*")
+    package = DependencyPackage(dependency, repository.package("foo", "1.2.0"))
+
+    incompatibilities = provider.incompatibilities_for(package)
+
+    assert [str(i.terms[0].constraint) for i in incompatibilities] == [
+        "1.1.0 || 1.2.0 || 1.3.0",
+        "1.2.0 || 1.3.0 || 1.4.0",
+    ]
+    assert [i.terms[1].dependency.name for i in incompatibilities] == ["bar", "baz"]
+
+
+def test_incompatibilities_for_only_merges_candidate_versions(provider, repository):
+    for version in ["1.0.0", "1.1.0", "1.2.0", "1.3.0"]:
+        package = Package("foo", version)
+        package.add_dependency("bar", "^1.0")
+
+        repository.add_package(package)
+
+    dependency = get_dependency("foo", "!=1.1.0")
+    package = DependencyPackage(dependency, repository.package("foo", "1.2.0"))
+
+    incompatibilities = provider.incompatibilities_for(package)
+
+    assert [str(i.terms[0].constraint) for i in incompatibilities] == [
+        "1.0.0 || 1.2.0 || 1.3.0"
+    ]
+    assert not incompatibilities[0].terms[0].constraint.allows(Version.parse("1.1.0"))
+
+
+def test_incompatibilities_for_merges_versions_of_any_repository(
+    provider, repository, pool
+):
+    for version in ["1.0.0", "1.1.0", "1.2.0"]:
+        package = Package("foo", version)
+        package.add_dependency("bar", "^1.0")
+
+        repository.add_package(package)
+
+    pool.add_repository(Repository())
+
+    dependency = get_dependency("foo", "*")
+    package = DependencyPackage(dependency, repository.package("foo", "1.2.0"))
+
+    incompatibilities = provider.incompatibilities_for(package)
+
+    assert [str(i.terms[0].constraint) for i in incompatibilities] == [
+        "1.0.0 || 1.1.0 || 1.2.0"
+    ]
+
+
+def test_search_for_narrows_down_the_candidates_of_wider_constraints(
+    provider, repository, mocker
+):
+    for version in ["1.0.0", "1.1.0", "1.2.0b1", "1.2.0", "2.0.0"]:
+        repository.add_package(Package("foo", version))
+
+    find_packages = mocker.spy(repository, "find_packages")
+
+    candidates = provider.search_for(
+        get_dependency("foo", "*", allows_prereleases=True)
+    )
+    narrower = provider.search_for(get_dependency("foo", ">=1.1.0,<2.0.0"))
+    exact = provider.search_for(get_dependency("foo", "1.0.0"))
+
+    assert [p.version.text for p in candidates] == [
+        "2.0.0",
+        "1.2.0",
+        "1.2.0b1",
+        "1.1.0",
+        "1.0.0",
+    ]
+    assert [p.version.text for p in narrower] == ["1.2.0", "1.1.0", "1.2.0b1"]
+    assert [p.version.text for p in exact] == ["1.0.0"]
+    assert find_packages.call_count == 1
+
+
+def test_count_for_reuses_counts_and_search_results(provider, repository, mocker):
+    for version in ["1.0.0", "1.1.0", "1.2.0b1", "2.0.0"]:
+        repository.add_package(Package("foo", version))
+
+    count_packages = mocker.spy(repository, "count_packages")
+
+    assert provider.count_for(get_dependency("foo", "^1.0")) == 2
+    assert provider.count_for(get_dependency("foo", "^1.0")) == 2
+    assert count_packages.call_count == 1
+
+    provider.search_for(get_dependency("foo", "*"))
+
+    assert provider.count_for(get_dependency("foo", ">=1.1.0")) == 2
+    assert count_packages.call_count == 1
@@ -0,0 +1,188 @@
+import time
+
+import pytest
+
+from cleo.outputs.null_output import NullOutput
+from cleo.styles import OutputStyle
+
+from poetry.packages import Dependency
+from poetry.packages import ProjectPackage
+from poetry.puzzle import Solver
+from poetry.puzzle.resolution_cache import ResolutionCache
+from poetry.repositories.installed_repository import InstalledRepository
+from poetry.repositories.legacy_repository import LegacyRepository
+from poetry.repositories.pool import Pool
+from poetry.repositories.repository import Repository
+from poetry.utils._compat import Path
+
+from tests.helpers import get_package
+
+
+@pytest.fixture()
+def io():
+    return OutputStyle(NullOutput())
+
+
+@pytest.fixture()
+def package():
+    package = ProjectPackage("root", "1.0")
+    package.add_dependency("A", "^1.0")
+
+    return package
+
+
+@pytest.fixture()
+def repo():
+    repo = Repository()
+
+    package_a = get_package("A", "1.0")
+    package_a.add_dependency("B", {"version": "^1.0", "python": ">=3.6"})
+    repo.add_package(package_a)
+    repo.add_package(get_package("B", "1.0"))
+
+    return repo
+
+
+@pytest.fixture()
+def pool(repo):
+    return Pool([repo])
+
+
+@pytest.fixture()
+def cache(tmp_dir):
+    return ResolutionCache(str(Path(tmp_dir) / "resolutions"))
+
+
+@pytest.fixture()
+def solver(package, pool, io, cache):
+    return Solver(package, pool, InstalledRepository(), Repository(), io, cache=cache)
+
+
+def test_solver_reuses_cached_resolutions(solver, package, pool, io, cache, mocker):
+    ops = solver.solve()
+
+    resolve_version = mocker.patch("poetry.puzzle.solver.resolve_version")
+    solver = Solver(package, pool, InstalledRepository(), Repository(), io, cache=cache)
+    cached_ops = solver.solve()
+
+    assert not resolve_version.called
+    assert [str(op) for op in cached_ops] == [str(op) for op in ops]
+
+    cached_a = cached_ops[1].package
+    assert str(cached_a.marker) == str(ops[1].package.marker)
+    assert [d.to_pep_508() for d in cached_a.requires] == [
+        'B (>=1.0,<2.0); python_version >= "3.6"'
+    ]
+    assert cached_a.requires[0].pretty_constraint == "^1.0"
+
+
+def test_cached_packages_keep_the_dependencies_of_their_extras(
+    solver, package, pool, repo, io, cache
+):
+    package_a = repo.package("A", "1.0")
+    dependency = Dependency("C", "^1.0", optional=True)
+    dependency.in_extras.append("foo")
+    package_a.extras["foo"] = [dependency]
+
+    ops = solver.solve()
+
+    solver = Solver(package, pool, InstalledRepository(), Repository(), io, cache=cache)
+    cached_ops = solver.solve()
+
+    cached_a = cached_ops[1].package
+    assert cached_a.extras.keys() == ops[1].package.extras.keys()
+
+    extra = cached_a.extras["foo"]
+    assert [d.to_pep_508() for d in extra] == [dependency.to_pep_508()]
+    assert extra[0].is_optional()
+    assert not extra[0].is_activated()
+    assert extra[0] not in cached_a.requires
+
+
+def test_cached_resolutions_are_keyed_by_root_requirements(
+    solver, package, pool, cache
+):
+    solver.solve()
+
+    assert cache.get(package, pool, Repository()) is not None
+    assert cache.get(package, pool, Repository(), use_latest=["a"]) is None
+
+    package.add_dependency("B", "^1.0")
+
+    assert cache.get(package, pool, Repository()) is None
+
+
+def test_cached_resolutions_are_keyed_by_repository_urls(package, cache):
+    foo = LegacyRepository("foo", "https://foo.bar/simple/", disable_cache=True)
+    moved = LegacyRepository("foo", "https://foo.baz/simple/", disable_cache=True)
+
+    assert cache._key(package, Pool([foo]), Repository(), None) != cache._key(
+        package, Pool([moved]), Repository(), None
+    )
+
+
+def test_cached_resolutions_are_checked_without_remote_requests(
+    solver, package, pool, repo, cache, mocker
+):
+    find_packages = mocker.spy(pool, "find_packages_many")
+    solver.solve()
+
+    assert find_packages.call_count == 0
+
+    repo.add_package(get_package("B", "1.1"))
+
+    assert cache.get(package, pool, Repository()) is not None
+    assert find_packages.call_count == 0
+
+
+def test_cached_resolutions_are_discarded_when_cached_pages_changed(
+    solver, package, pool, repo, cache, mocker
+):
+    validator = mocker.patch.object(repo, "cache_validator", return_value='"a"')
+    solver.solve()
+
+    assert cache.get(package, pool, Repository()) is not None
+
+    validator.return_value = '"b"'
+
+    assert cache.get(package, pool, Repository()) is None
+
+
+def test_cached_resolutions_are_not_reused_when_updating_all_locked_packages(
+    solver, package, pool, io, cache, mocker
+):
+    locked = Repository([get_package("A", "1.0"), get_package("B", "1.0")])
+    solver = Solver(package, pool, InstalledRepository(), locked, io, cache=cache)
+    solver.solve(use_latest=["a", "b"])
+
+    assert cache.get(package, pool, locked, use_latest=["a", "b"]) is not None
+
+    get = mocker.spy(cache, "get")
+    solver = Solver(package, pool, InstalledRepository(), locked, io, cache=cache)
+    solver.solve(use_latest=["a", "b"])
+
+    assert not get.called
+
+    solver = Solver(package, pool, InstalledRepository(), locked, io, cache=cache)
+    solver.solve(use_latest=["a"])
+
+    assert get.called
+
+
+def test_cached_resolutions_expire(solver, package, pool, cache, mocker):
+    solver.solve()
+
+    mocker.patch("time.time", return_value=time.time() + cache.MAX_AGE * 60 + 1)
+
+    assert cache.get(package, pool, Repository()) is None
+
+
+def test_resolutions_with_vcs_dependencies_are_not_cached(
+    solver, package, pool, repo, cache
+):
+    package.add_dependency("demo", {"git": "https://github.com/demo/demo.git"})
+    repo.add_package(get_package("pendulum", "2.0.3"))
+
+    solver.solve()
+
+    assert cache.get(package, pool, Repository()) is None
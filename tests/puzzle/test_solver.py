@@ -561,8 +561,7 @@ def test_solver_sub_dependencies_with_requirements_complex(solver, repo, package
 
     op = ops[0]  # e
     assert str(op.package.marker) == (
-        'python_version < "4.0" and sys_platform == "win32" '
-        'or python_version < "5.0" and sys_platform == "win32"'
+        'python_version < "5.0" and sys_platform == "win32"'
     )
 
     op = ops[1]  # f
@@ -869,6 +868,39 @@ def test_solver_duplicate_dependencies_sub_dependencies(solver, repo, package):
     assert str(op.package.marker) == 'python_version >= "3.4"'
 
 
+def test_solver_resolves_each_python_branch_for_its_own_python_constraint(
+    solver, repo, package
+):
+    package.python_versions = "~2.7 || ^3.4"
+    package.add_dependency("A")
+
+    package_a = get_package("A", "1.0")
+    package_a.add_dependency("B", {"version": "^1.0", "python": "<3.4"})
+    package_a.add_dependency("B", {"version": "^2.0", "python": ">=3.4"})
+
+    package_b10 = get_package("B", "1.0")
+    package_b10.python_versions = "~2.7"
+    package_b20 = get_package("B", "2.0")
+    package_b20.python_versions = "^3.4"
+
+    repo.add_package(package_a)
+    repo.add_package(package_b10)
+    repo.add_package(package_b20)
+
+    ops = solver.solve()
+
+    check_solver_result(
+        ops,
+        [
+            {"job": "install", "package": package_b10},
+            {"job": "install", "package": package_b20},
+            {"job": "install", "package": package_a},
+        ],
+    )
+
+    assert package.python_versions == "~2.7 || ^3.4"
+
+
 def test_solver_fails_if_dependency_name_does_not_match_package(solver, repo, package):
     package.add_dependency("my-demo", {"git": "https://github.com/demo/demo.git"})
 
@@ -994,8 +1026,7 @@ def test_solver_does_not_trigger_conflict_for_python_constraint_if_python_requir
     )
 
     assert str(ops[0].package.marker) == (
-        'python_version >= "3.6" and python_version < "4.0" '
-        'or python_version >= "3.5.3" and python_version < "4.0.0"'
+        'python_version >= "3.5.3" and python_version < "4.0.0"'
     )
 
 
@@ -0,0 +1,247 @@
+import base64
+import threading
+
+import pytest
+
+try:
+    from http.server import BaseHTTPRequestHandler
+    from http.server import HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler
+    from BaseHTTPServer import HTTPServer
+
+from cachy import CacheManager
+
+from poetry.repositories.auth import Auth
+from poetry.repositories.pypi_repository import PyPiRepository
+from poetry.utils._compat import PY35
+from poetry.utils._compat import Path
+
+
+pytestmark = pytest.mark.skipif(not PY35, reason="asyncio requires Python 3.5+")
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from poetry.repositories.async_repository import AsyncLegacyRepository  # noqa
+from poetry.repositories.async_repository import AsyncPyPiRepository  # noqa
+from poetry.repositories.async_repository import AsyncRepositoryAdapter  # noqa
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get("Authorization")))
+
+        parts = self.path.strip("/").split("/")
+        if parts[0] == "simple":
+            self._send(FIXTURES / "legacy" / (parts[1] + ".html"), "text/html")
+
+            return
+
+        path = FIXTURES / "pypi.org" / "json" / (parts[1] + ".json")
+        if len(parts) == 4:
+            release = path.with_suffix("") / (parts[2] + ".json")
+            if release.exists():
+                path = release
+
+        self._send(path, "application/json")
+
+    def _send(self, path, content_type):
+        if not path.exists():
+            self.send_response(404)
+            self.end_headers()
+
+            return
+
+        with path.open("rb") as f:
+            content = f.read()
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.requests = []
+
+    httpd = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    yield "http://{}:{}".format(*httpd.server_address)
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def dict_cache():
+    return CacheManager(
+        {
+            "default": "releases",
+            "serializer": "json",
+            "stores": {
+                "releases": {"driver": "dict"},
+                "packages": {"driver": "dict"},
+            },
+        }
+    )
+
+
+def test_find_packages(server):
+    repo = AsyncRepositoryAdapter(
+        AsyncPyPiRepository(url=server + "/", disable_cache=True, fallback=False)
+    )
+
+    try:
+        assert len(repo.find_packages("requests", "^2.18")) == 5
+        assert len(repo.find_packages("toga", ">=0.3.0.dev2")) == 7
+    finally:
+        repo.close()
+
+
+def test_package(server):
+    repo = AsyncRepositoryAdapter(
+        AsyncPyPiRepository(url=server + "/", disable_cache=True, fallback=False)
+    )
+
+    try:
+        package = repo.package("requests", "2.18.4")
+    finally:
+        repo.close()
+
+    assert package.name == "requests"
+    assert len(package.requires) == 4
+    assert len(package.extras["security"]) == 3
+    assert len(package.extras["socks"]) == 2
+
+
+def test_packages_many(server):
+    repo = AsyncRepositoryAdapter(
+        AsyncPyPiRepository(url=server + "/", disable_cache=True, fallback=False)
+    )
+
+    try:
+        packages = repo.packages_many(
+            [("requests", "2.18.4"), ("missing", "1.0.0"), ("isort", "4.3.4")]
+        )
+    finally:
+        repo.close()
+
+    assert packages[0].name == "requests"
+    assert packages[1] is None
+    assert packages[2].name == "isort"
+
+
+def test_release_information_is_shared_with_the_synchronous_repository(server):
+    repo = AsyncPyPiRepository(url=server + "/", fallback=False)
+    repo._cache = dict_cache()
+    adapter = AsyncRepositoryAdapter(repo)
+
+    try:
+        adapter.package("requests", "2.18.4")
+        adapter.package("requests", "2.18.4")
+    finally:
+        adapter.close()
+
+    assert Handler.requests == [("/pypi/requests/2.18.4/json", None)]
+
+    sync_repo = PyPiRepository(url=server + "/", fallback=False)
+    sync_repo._cache = repo._cache
+
+    package = sync_repo.package("requests", "2.18.4")
+
+    assert len(package.requires) == 4
+    assert len(Handler.requests) == 1
+
+
+def test_credentials_of_the_url_are_sent(server):
+    host = server.split("://")[1]
+    repo = AsyncRepositoryAdapter(
+        AsyncPyPiRepository(
+            url="http://foo:b%40r@{}/".format(host), disable_cache=True, fallback=False
+        )
+    )
+
+    try:
+        repo.package("requests", "2.18.4")
+    finally:
+        repo.close()
+
+    authorization = "Basic {}".format(base64.b64encode(b"foo:b@r").decode())
+    assert Handler.requests == [("/pypi/requests/2.18.4/json", authorization)]
+
+
+def test_find_packages_of_legacy_repository(server):
+    repo = AsyncRepositoryAdapter(
+        AsyncLegacyRepository("foo", server + "/simple", disable_cache=True)
+    )
+
+    try:
+        packages = repo.find_packages("isort", "^4.3")
+        missing = repo.find_packages("missing")
+    finally:
+        repo.close()
+
+    assert [str(package.version) for package in packages] == ["4.3.4"]
+    assert packages[0].source_type == "legacy"
+    assert missing == []
+
+
+def test_package_of_legacy_repository(server, mocker):
+    repo = AsyncLegacyRepository("foo", server + "/simple", disable_cache=True)
+    get_info_from_urls = mocker.patch.object(
+        repo,
+        "_get_info_from_urls",
+        return_value={
+            "summary": "A Python utility / library to sort Python imports.",
+            "requires_dist": ["futures; python_version < '3.2'"],
+            "requires_python": ">=2.7",
+        },
+    )
+    adapter = AsyncRepositoryAdapter(repo)
+
+    try:
+        packages = adapter.packages_many([("isort", "4.3.4"), ("missing", "1.0")])
+    finally:
+        adapter.close()
+
+    assert packages[0].name == "isort"
+    assert packages[0].python_versions == ">=2.7"
+    assert [dep.name for dep in packages[0].requires] == ["futures"]
+    assert packages[1] is None
+    assert get_info_from_urls.call_count == 1
+    assert sorted(path for path, _ in Handler.requests) == [
+        "/simple/isort/",
+        "/simple/missing/",
+    ]
+
+
+def test_credentials_of_legacy_repository_are_sent(server):
+    repo = AsyncRepositoryAdapter(
+        AsyncLegacyRepository(
+            "foo",
+            server + "/simple",
+            auth=Auth(server, "foo", "bar"),
+            disable_cache=True,
+        )
+    )
+
+    try:
+        repo.find_packages("isort")
+    finally:
+        repo.close()
+
+    authorization = "Basic {}".format(base64.b64encode(b"foo:bar").decode())
+    assert Handler.requests == [("/simple/isort/", authorization)]
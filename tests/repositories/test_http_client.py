@@ -0,0 +1,80 @@
+import httpretty
+
+from cachecontrol.caches.file_cache import FileCache
+
+from poetry.repositories import Pool
+from poetry.repositories.http_client import HTTPClient
+from poetry.repositories.legacy_repository import LegacyRepository
+from poetry.repositories.pypi_repository import PyPiRepository
+
+
+def test_sessions_share_the_connection_pools_of_the_client(tmp_dir):
+    client = HTTPClient()
+
+    session = client.session()
+    cached_session = client.session(cache=FileCache(tmp_dir))
+
+    for s in [session, cached_session]:
+        assert s.get_adapter("https://foo.bar").poolmanager is client.poolmanager
+        assert s.get_adapter("http://foo.bar").poolmanager is client.poolmanager
+
+
+def test_closing_a_session_keeps_the_connection_pools_of_the_client():
+    client = HTTPClient()
+    client.poolmanager.connection_from_url("https://foo.bar")
+
+    session = client.session()
+    session.close()
+
+    assert len(client.poolmanager.pools) == 1
+
+    client.close()
+
+    assert len(client.poolmanager.pools) == 0
+
+
+def test_sessions_apply_the_timeout_of_the_client(http, mocker):
+    http.register_uri(http.GET, "https://foo.bar/", body="foo")
+
+    client = HTTPClient(timeout=3)
+    session = client.session()
+    send = mocker.spy(session.get_adapter("https://foo.bar"), "send")
+
+    assert session.get("https://foo.bar/").text == "foo"
+    assert send.call_args[1]["timeout"] == 3
+
+    session.get("https://foo.bar/", timeout=5)
+    assert send.call_args[1]["timeout"] == 5
+
+
+def test_failed_requests_are_retried(http):
+    http.register_uri(
+        http.GET,
+        "https://foo.bar/",
+        responses=[
+            httpretty.Response(body="", status=503),
+            httpretty.Response(body="", status=502),
+            httpretty.Response(body="foo", status=200),
+        ],
+    )
+
+    requests = len(http.latest_requests())
+
+    client = HTTPClient(retries=2, backoff_factor=0)
+    response = client.get("https://foo.bar/")
+
+    assert response.status_code == 200
+    assert response.text == "foo"
+    assert len(http.latest_requests()) - requests == 3
+
+
+def test_repositories_of_a_pool_share_its_client():
+    pool = Pool()
+    pypi = PyPiRepository(http_client=pool.http_client)
+    legacy = LegacyRepository("foo", "https://foo.bar", http_client=pool.http_client)
+
+    pool.add_repository(legacy).add_repository(pypi)
+
+    for repository in pool.repositories:
+        adapter = repository._session.get_adapter("https://foo.bar")
+        assert adapter.poolmanager is pool.http_client.poolmanager
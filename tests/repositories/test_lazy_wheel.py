@@ -0,0 +1,181 @@
+import re
+import threading
+
+import pytest
+import requests
+
+try:
+    from http.server import BaseHTTPRequestHandler
+    from http.server import HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler
+    from BaseHTTPServer import HTTPServer
+
+from poetry.repositories.lazy_wheel import HTTPRangeRequestUnsupported
+from poetry.repositories.lazy_wheel import LazyFileOverHTTP
+from poetry.repositories.lazy_wheel import metadata_from_wheel_url
+from poetry.utils._compat import Path
+
+DISTS = Path(__file__).parent / "fixtures" / "pypi.org" / "dists"
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    support_ranges = True
+    rejected_ranges_status = None
+    content_encoding = None
+    served = []
+
+    def do_HEAD(self):
+        self._respond(body=False)
+
+    def do_GET(self):
+        self._respond(body=True)
+
+    def _respond(self, body):
+        path = DISTS / self.path.lstrip("/")
+        if not path.exists():
+            self.send_response(404)
+            self.end_headers()
+
+            return
+
+        with path.open("rb") as f:
+            content = f.read()
+
+        m = re.match(r"bytes=(\d+)-(\d+)", self.headers.get("Range") or "")
+        if m and self.rejected_ranges_status:
+            self.send_response(self.rejected_ranges_status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+            return
+
+        if m and self.support_ranges:
+            start, end = int(m.group(1)), int(m.group(2)) + 1
+            content = content[start:end]
+            self.send_response(206)
+        else:
+            self.send_response(200)
+
+        if self.support_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+
+        if self.content_encoding:
+            self.send_header("Content-Encoding", self.content_encoding)
+
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+
+        if body:
+            self.served.append(len(content))
+            self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.support_ranges = True
+    Handler.rejected_ranges_status = None
+    Handler.content_encoding = None
+    Handler.served = []
+
+    httpd = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    yield "http://{}:{}".format(*httpd.server_address)
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_metadata_from_wheel_url(server):
+    meta = metadata_from_wheel_url(
+        server + "/isort-4.3.4-py3-none-any.whl", requests.session()
+    )
+
+    assert meta.name == "isort"
+    assert meta.version == "4.3.4"
+    assert meta.requires_python == ">=2.7, !=3.0.*, !=3.1.*, !=3.2.*, !=3.3.*"
+
+    size = (DISTS / "isort-4.3.4-py3-none-any.whl").stat().st_size
+    assert sum(Handler.served) < size
+
+
+def test_metadata_from_wheel_url_with_dependencies(server):
+    meta = metadata_from_wheel_url(
+        server + "/ipython-5.7.0-py3-none-any.whl", requests.session()
+    )
+
+    assert meta.name == "ipython"
+    assert 'pexpect; sys_platform != "win32"' in meta.requires_dist
+
+
+def test_metadata_from_wheel_url_without_range_support(server):
+    Handler.support_ranges = False
+
+    with pytest.raises(HTTPRangeRequestUnsupported):
+        metadata_from_wheel_url(
+            server + "/isort-4.3.4-py3-none-any.whl", requests.session()
+        )
+
+    assert Handler.served == []
+
+
+@pytest.mark.parametrize("status", [403, 416, 501])
+def test_metadata_from_wheel_url_with_rejected_ranges(server, status):
+    Handler.rejected_ranges_status = status
+
+    with pytest.raises(HTTPRangeRequestUnsupported):
+        metadata_from_wheel_url(
+            server + "/isort-4.3.4-py3-none-any.whl", requests.session()
+        )
+
+    assert Handler.served == []
+
+
+def test_metadata_from_wheel_url_with_rejected_ranges_raising_errors(server):
+    Handler.rejected_ranges_status = 416
+
+    session = requests.session()
+    session.hooks["response"].append(lambda r, *args, **kwargs: r.raise_for_status())
+
+    with pytest.raises(HTTPRangeRequestUnsupported):
+        metadata_from_wheel_url(server + "/isort-4.3.4-py3-none-any.whl", session)
+
+
+def test_metadata_from_wheel_url_with_encoded_content(server):
+    Handler.content_encoding = "gzip"
+
+    with pytest.raises(HTTPRangeRequestUnsupported):
+        metadata_from_wheel_url(
+            server + "/isort-4.3.4-py3-none-any.whl", requests.session()
+        )
+
+    assert Handler.served == []
+
+
+def test_lazy_file_only_retrieves_missing_ranges(server):
+    url = server + "/isort-4.3.4-py3-none-any.whl"
+    with (DISTS / "isort-4.3.4-py3-none-any.whl").open("rb") as f:
+        content = f.read()
+
+    with LazyFileOverHTTP(url, requests.session(), chunk_size=10) as f:
+        assert f.read(5) == content[:5]
+        assert Handler.served == [10]
+
+        f.seek(20)
+        assert f.read(5) == content[20:25]
+        assert Handler.served == [10, 10]
+
+        f.seek(8)
+        assert f.read(17) == content[8:25]
+        assert Handler.served == [10, 10, 10]
+
+        f.seek(-4, 2)
+        assert f.read() == content[-4:]
+        assert f.tell() == len(content)
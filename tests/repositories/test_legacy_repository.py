@@ -1,4 +1,6 @@
+import json
 import pytest
+import requests
 import shutil
 
 try:
@@ -6,10 +8,15 @@ try:
 except ImportError:
     import urlparse
 
+from cachy import CacheManager
+
 from poetry.packages import Dependency
 from poetry.repositories.exceptions import PackageNotFound
+from poetry.repositories.lazy_wheel import HTTPRangeRequestUnsupported
 from poetry.repositories.legacy_repository import LegacyRepository
 from poetry.repositories.legacy_repository import Page
+from poetry.repositories.metadata_store import MetadataStore
+from poetry.semver import Version
 from poetry.utils._compat import PY35
 from poetry.utils._compat import Path
 
@@ -32,6 +39,9 @@ class MockRepository(LegacyRepository):
         with fixture.open() as f:
             return Page(self._url + endpoint, f.read(), {})
 
+    def _get_wheel_metadata(self, url):
+        raise HTTPRangeRequestUnsupported()
+
     def _download(self, url, dest):
         filename = urlparse.urlparse(url).path.rsplit("/")[-1]
         filepath = self.FIXTURES.parent / "pypi.org" / "dists" / filename
@@ -59,6 +69,86 @@ def test_page_absolute_links_path_are_correct():
         assert link.path.startswith("/packages/")
 
 
+def test_page_links_are_grouped_by_version():
+    repo = MockRepository()
+
+    page = repo._get("/absolute")
+
+    assert [str(v) for v in page.versions] == ["0.1.0"]
+
+    links = page.links_for_version(Version.parse("0.1.0"))
+    assert [link.filename for link in links] == [
+        "poetry-0.1.0-py3-none-any.whl",
+        "poetry-0.1.0.tar.gz",
+    ]
+    assert [link.requires_python for link in links] == [">=3.6.0", ">=3.6.0"]
+    assert page.links_for_version(Version.parse("0.2.0")) == []
+
+
+def test_page_decodes_content_with_the_specified_charset():
+    page = Page(
+        "https://foo.bar/simple/foo",
+        u'<a href="foo-1.0.0.tar.gz" data-requires-python="&gt;=3.6">'
+        u"f\xf6\xf6</a>".encode("latin1"),
+        {"Content-Type": "text/html; charset=latin1"},
+    )
+
+    assert [link.url for link in page.links] == [
+        "https://foo.bar/simple/foo/foo-1.0.0.tar.gz"
+    ]
+    assert page.links[0].requires_python == ">=3.6"
+
+
+def test_page_falls_back_to_the_html_parser_for_complex_pages():
+    content = (
+        u"<html><head><script>var a = '<a href=\"bar-1.0.0.tar.gz\">';</script>"
+        u"</head><body><!-- <a href='baz-1.0.0.tar.gz'> -->"
+        u"<a href=foo-1.0.0.tar.gz data-requires-python='&gt;=3.6'>foo</a>"
+        u"</body></html>"
+    )
+
+    page = Page("https://foo.bar/simple/foo/", content, {})
+
+    assert [link.url for link in page.links] == [
+        "https://foo.bar/simple/foo/foo-1.0.0.tar.gz"
+    ]
+    assert page.links[0].requires_python == ">=3.6"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        # Parsed with regular expressions
+        u'<a href="foo-1.0.0.tar.gz" data-requires-python="&amp;gt;=3.6">foo</a>',
+        # Parsed with the standard HTML parser
+        u'<script></script><a href="foo-1.0.0.tar.gz" '
+        u'data-requires-python="&amp;gt;=3.6">foo</a>',
+        # Parsed with html5lib
+        u'<a href="foo-1.0.0.tar.gz" data-requires-python="&amp;gt;=3.6">'
+        u"f\xf6\xf6</a>".encode("utf-8"),
+    ],
+)
+def test_page_unescapes_attributes_once(content):
+    page = Page("https://foo.bar/simple/foo/", content, {})
+
+    assert page.links[0].requires_python == "&gt;=3.6"
+
+
+def test_page_sniffs_the_encoding_of_content_without_charset():
+    page = Page(
+        "https://foo.bar/simple/foo/",
+        u'<html><head><meta charset="windows-1251"></head><body>'
+        u'<a href="f\u0430-1.0.0.tar.gz">f\u0430</a></body></html>'.encode(
+            "windows-1251"
+        ),
+        {"Content-Type": "text/html"},
+    )
+
+    assert [link.url for link in page.links] == [
+        "https://foo.bar/simple/foo/f%430-1.0.0.tar.gz"
+    ]
+
+
 def test_sdist_format_support():
     repo = MockRepository()
     page = repo._get("/relative")
@@ -138,6 +228,14 @@ def test_find_packages_no_prereleases():
     assert len(packages) == 1
 
 
+def test_count_packages():
+    repo = MockRepository()
+
+    assert repo.count_packages("pyyaml") == 1
+    assert repo.count_packages("isort", "^4.3") == 1
+    assert repo.count_packages("isort", "^5.0") == 0
+
+
 def test_get_package_information_chooses_correct_distribution():
     repo = MockRepository()
 
@@ -205,3 +303,132 @@ def test_get_package_from_both_py2_and_py3_specific_wheels():
         package.requires[4].marker
     )
     assert 'sys_platform != "win32"' == str(package.requires[5].marker)
+
+
+def test_get_reuses_persisted_links_of_unchanged_pages(http, tmp_dir, mocker):
+    repo = LegacyRepository("legacy", url="https://foo.bar/simple")
+    repo._session = requests.session()
+    repo._cache = CacheManager(
+        {
+            "default": "pages",
+            "serializer": "json",
+            "stores": {"pages": {"driver": "metadata", "path": tmp_dir}},
+        }
+    )
+    repo._cache.extend("metadata", lambda config: MetadataStore(config["path"]))
+
+    with (MockRepository.FIXTURES / "isort.html").open() as f:
+        content = f.read()
+
+    http.register_uri(
+        http.GET,
+        "https://foo.bar/simple/isort/",
+        body=content,
+        adding_headers={"ETag": '"abcdef"'},
+    )
+
+    parse_links = mocker.spy(Page, "_parse_links")
+
+    assert repo.cache_validator("isort") is None
+
+    page = repo._get("/isort/")
+    links = [(link.url, link.requires_python) for link in page.links]
+    assert len(links) == 3
+    assert parse_links.call_count == 1
+    assert repo.cache_validator("isort") == '"abcdef"'
+
+    page = repo._get("/isort/")
+    assert [(link.url, link.requires_python) for link in page.links] == links
+    assert parse_links.call_count == 1
+
+    http.register_uri(
+        http.GET,
+        "https://foo.bar/simple/isort/",
+        body=content,
+        adding_headers={"ETag": '"ghijkl"'},
+    )
+
+    page = repo._get("/isort/")
+    assert [(link.url, link.requires_python) for link in page.links] == links
+    assert parse_links.call_count == 2
+    assert repo.cache_validator("isort") == '"ghijkl"'
+
+
+def test_pages_are_retrieved_once_per_run(mocker):
+    repo = MockRepository()
+    get = mocker.spy(repo, "_get")
+
+    repo.find_packages("isort")
+    repo.package("isort", "4.3.4")
+
+    assert get.call_count == 1
+
+
+def test_get_uses_the_json_form_of_simple_pages(http):
+    repo = LegacyRepository("legacy", url="https://foo.bar/simple", disable_cache=True)
+    repo._session = requests.session()
+
+    http.register_uri(
+        http.GET,
+        "https://foo.bar/simple/isort/",
+        body=json.dumps(
+            {
+                "meta": {"api-version": "1.0"},
+                "name": "isort",
+                "files": [
+                    {
+                        "filename": "isort-4.3.4-py3-none-any.whl",
+                        "url": "https://files.foo.bar/isort-4.3.4-py3-none-any.whl",
+                        "hashes": {"sha256": "abcdef", "md5": "123456"},
+                        "requires-python": ">=2.7, !=3.0.*",
+                    },
+                    {
+                        "filename": "isort-4.3.4.tar.gz",
+                        "url": "../../files/isort-4.3.4.tar.gz",
+                        "hashes": {},
+                    },
+                    {
+                        "filename": "isort-4.3.4.exe",
+                        "url": "https://files.foo.bar/isort-4.3.4.exe",
+                        "hashes": {},
+                    },
+                ],
+            }
+        ),
+        content_type="application/vnd.pypi.simple.v1+json",
+    )
+
+    page = repo._get("/isort/")
+
+    assert (
+        http.last_request()
+        .headers["Accept"]
+        .startswith("application/vnd.pypi.simple.v1+json")
+    )
+    assert [(link.url, link.requires_python) for link in page.links] == [
+        (
+            "https://files.foo.bar/isort-4.3.4-py3-none-any.whl#sha256=abcdef",
+            ">=2.7, !=3.0.*",
+        ),
+        ("https://foo.bar/files/isort-4.3.4.tar.gz", None),
+    ]
+    assert page.versions == [Version.parse("4.3.4")]
+
+
+def test_get_falls_back_to_the_html_form_of_simple_pages(http):
+    repo = LegacyRepository("legacy", url="https://foo.bar/simple", disable_cache=True)
+    repo._session = requests.session()
+
+    with (MockRepository.FIXTURES / "isort.html").open() as f:
+        content = f.read()
+
+    http.register_uri(
+        http.GET,
+        "https://foo.bar/simple/isort/",
+        body=content,
+        content_type="text/html",
+    )
+
+    page = repo._get("/isort/")
+
+    assert len(page.links) == 3
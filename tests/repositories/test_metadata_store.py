@@ -0,0 +1,163 @@
+import time
+
+from cachy import CacheManager
+from cachy.stores import FileStore
+from cachy.serializers import JsonSerializer
+
+from poetry.repositories.metadata_store import MetadataStore
+from poetry.utils._compat import Path
+
+
+def create_cache(directory):
+    cache = CacheManager(
+        {
+            "default": "releases",
+            "serializer": "json",
+            "stores": {"releases": {"driver": "metadata", "path": directory}},
+        }
+    )
+    cache.extend("metadata", lambda config: MetadataStore(config["path"]))
+
+    return cache
+
+
+def test_store_retrieves_stored_entries(tmp_dir):
+    cache = create_cache(tmp_dir)
+
+    cache.forever("foo:1.0.0", {"name": "foo", "version": "1.0.0"})
+
+    assert cache.get("foo:1.0.0") == {"name": "foo", "version": "1.0.0"}
+    assert cache.get("foo:2.0.0") is None
+    assert cache.remember_forever("foo:2.0.0", lambda: {"version": "2.0.0"}) == {
+        "version": "2.0.0"
+    }
+    assert list(Path(tmp_dir).iterdir()) == [Path(tmp_dir) / MetadataStore.FILENAME]
+
+    # Entries are persisted
+    cache = create_cache(tmp_dir)
+
+    assert cache.get("foo:1.0.0") == {"name": "foo", "version": "1.0.0"}
+    assert cache.get_store().count() == 2
+
+
+def test_store_forgets_entries(tmp_dir):
+    cache = create_cache(tmp_dir)
+
+    cache.forever("foo:1.0.0", {})
+    cache.forever("bar:1.0.0", {})
+
+    assert cache.forget("foo:1.0.0")
+    assert not cache.forget("foo:1.0.0")
+    assert cache.get("foo:1.0.0") is None
+    assert cache.get("bar:1.0.0") == {}
+
+    cache.flush()
+
+    assert cache.get("bar:1.0.0") is None
+
+
+def test_store_expires_entries(tmp_dir, mocker):
+    cache = create_cache(tmp_dir)
+
+    cache.put("foo:1.0.0", {}, 1)
+
+    assert cache.get("foo:1.0.0") == {}
+
+    mocker.patch("time.time", return_value=time.time() + 61)
+
+    assert cache.get("foo:1.0.0") is None
+
+
+def test_store_evicts_old_entries(tmp_dir, mocker):
+    store = MetadataStore(tmp_dir, max_age=3600)
+    store.set_serializer(JsonSerializer())
+
+    store.forever("foo:1.0.0", {})
+    mocker.patch("time.time", return_value=time.time() + 1800)
+    store.forever("foo:2.0.0", {})
+    mocker.patch("time.time", return_value=time.time() + 1801)
+
+    assert store.prune() == 1
+    assert store.get("foo:1.0.0") is None
+    assert store.get("foo:2.0.0") == {}
+
+
+def test_store_evicts_oldest_entries_above_max_size(tmp_dir):
+    store = MetadataStore(tmp_dir, max_size=30)
+    store.set_serializer(JsonSerializer())
+
+    store.forever("foo:1.0.0", {"version": "1.0.0"})
+    store.forever("foo:2.0.0", {"version": "2.0.0"})
+
+    assert store.prune() == 1
+    assert store.get("foo:1.0.0") is None
+    assert store.get("foo:2.0.0") == {"version": "2.0.0"}
+
+
+def test_store_migrates_file_cache_entries(tmp_dir):
+    legacy = FileStore(tmp_dir)
+    legacy.set_serializer(JsonSerializer())
+    legacy.forever("requests:2.18.4", {"name": "requests", "version": "2.18.4"})
+    legacy.forever("django:2.1", {"name": "Django", "version": "2.1"})
+    legacy.forever("unknown", {"foo": "bar"})
+    legacy.put("pendulum:2.0.0", {"name": "pendulum", "version": "2.0.0"}, 10)
+
+    http_cache = Path(tmp_dir) / "_http" / "a" / "b"
+    http_cache.mkdir(parents=True)
+    (http_cache / "entry").touch()
+
+    cache = create_cache(tmp_dir)
+
+    assert cache.get("requests:2.18.4") == {"name": "requests", "version": "2.18.4"}
+    assert cache.get("django:2.1") == {"name": "Django", "version": "2.1"}
+    assert cache.get("pendulum:2.0.0") == {"name": "pendulum", "version": "2.0.0"}
+    assert cache.get("unknown") is None
+    assert cache.get_store().count() == 3
+
+    assert sorted(p.name for p in Path(tmp_dir).iterdir()) == [
+        "_http",
+        MetadataStore.FILENAME,
+    ]
+    assert (http_cache / "entry").exists()
+
+
+def test_store_increments_and_decrements_counters(tmp_dir):
+    cache = create_cache(tmp_dir)
+
+    assert cache.increment("hits") == 1
+    assert cache.increment("hits", 4) == 5
+    assert cache.decrement("hits", 2) == 3
+    assert cache.get("hits") == 3
+
+    cache.forever("misses", 10)
+
+    assert cache.decrement("misses") == 9
+
+    # Other stores of the same directory see the updated counters
+    assert create_cache(tmp_dir).increment("hits") == 4
+
+
+def test_store_increments_expired_counters_from_zero(tmp_dir, mocker):
+    cache = create_cache(tmp_dir)
+
+    cache.put("hits", 5, 1)
+    mocker.patch("time.time", return_value=time.time() + 61)
+
+    assert cache.increment("hits") == 1
+
+
+def test_store_limits_are_read_from_the_configuration(tmp_dir, config, mocker):
+    mocker.patch("poetry.config.Config.create", return_value=config)
+
+    store = MetadataStore.create(tmp_dir)
+
+    assert store._max_size == MetadataStore.MAX_SIZE * 1024 * 1024
+    assert store._max_age is None
+
+    config.add_property("settings.cache.max-size", 0)
+    config.add_property("settings.cache.max-age", 7)
+
+    store = MetadataStore.create(tmp_dir)
+
+    assert store._max_size is None
+    assert store._max_age == 7 * 24 * 60 * 60
@@ -1,5 +1,6 @@
 import pytest
 
+from poetry.packages import Package
 from poetry.repositories import Pool
 from poetry.repositories import Repository
 from poetry.repositories.exceptions import PackageNotFound
@@ -11,3 +12,29 @@ def test_pool_raises_package_not_found_when_no_package_is_found():
 
     with pytest.raises(PackageNotFound):
         pool.package("foo", "1.0.0")
+
+
+def test_find_packages_many_returns_results_in_order():
+    repo1 = Repository([Package("foo", "1.0.0"), Package("foo", "2.0.0")])
+    repo2 = Repository([Package("foo", "3.0.0"), Package("bar", "1.0.0")])
+    pool = Pool([repo1, repo2])
+
+    results = pool.find_packages_many([("bar", "*"), ("baz", "*"), ("foo", ">=1.5")])
+
+    assert [[p.version.text for p in packages] for packages in results] == [
+        ["1.0.0"],
+        [],
+        ["2.0.0"],
+    ]
+
+
+def test_packages_many_returns_results_in_order():
+    repo1 = Repository([Package("foo", "1.0.0")])
+    repo2 = Repository([Package("bar", "1.0.0")])
+    pool = Pool([repo1, repo2])
+
+    results = pool.packages_many([("bar", "1.0.0"), ("foo", "1.0.0"), ("foo", "2.0.0")])
+
+    assert results[0].name == "bar"
+    assert results[1].name == "foo"
+    assert results[2] is None
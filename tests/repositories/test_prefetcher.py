@@ -0,0 +1,128 @@
+import threading
+import time
+
+from poetry.repositories import Pool
+from poetry.repositories import Repository
+from poetry.repositories.exceptions import PackageNotFound
+from poetry.repositories.prefetcher import ReleasePrefetcher
+from poetry.repositories.pypi_repository import PyPiRepository
+
+
+class MockRepository(PyPiRepository):
+    def __init__(self, disable_cache=False, releases=None):
+        super(MockRepository, self).__init__(
+            url="http://foo.bar", disable_cache=disable_cache
+        )
+
+        self._releases = releases
+        self.fetched = []
+        self.started = threading.Event()
+        self.lock = threading.Lock()
+
+    def get_release_info(self, name, version):
+        self.started.set()
+
+        with self.lock:
+            self.fetched.append((name, version))
+
+        if self._releases is not None and (name, version) not in self._releases:
+            raise PackageNotFound()
+
+        return {}
+
+
+def wait_for(predicate, timeout=5):
+    start = time.time()
+    while not predicate() and time.time() - start < timeout:
+        time.sleep(0.01)
+
+
+def test_prefetch_retrieves_release_information():
+    repository = MockRepository()
+    prefetcher = ReleasePrefetcher(Pool([repository]), max_workers=2)
+
+    prefetcher.prefetch("foo", ["1.0.0", "2.0.0"])
+    prefetcher.prefetch("bar", ["1.0.0"])
+    wait_for(lambda: len(repository.fetched) == 3)
+    prefetcher.shutdown()
+
+    assert sorted(repository.fetched) == [
+        ("bar", "1.0.0"),
+        ("foo", "1.0.0"),
+        ("foo", "2.0.0"),
+    ]
+
+
+def test_prefetch_does_not_fetch_the_same_release_twice():
+    repository = MockRepository()
+    prefetcher = ReleasePrefetcher(Pool([repository]), max_workers=1)
+
+    prefetcher.prefetch("foo", ["1.0.0"])
+    wait_for(lambda: len(repository.fetched) == 1)
+    prefetcher.prefetch("foo", ["1.0.0"])
+    prefetcher.shutdown()
+
+    assert repository.fetched == [("foo", "1.0.0")]
+
+
+def test_prefetch_falls_back_to_next_repository():
+    first = MockRepository(releases=[])
+    second = MockRepository(releases=[("foo", "1.0.0")])
+    prefetcher = ReleasePrefetcher(Pool([first, second]), max_workers=1)
+
+    prefetcher.prefetch("foo", ["1.0.0"])
+    wait_for(lambda: len(second.fetched) == 1)
+    prefetcher.shutdown()
+
+    assert first.fetched == [("foo", "1.0.0")]
+    assert second.fetched == [("foo", "1.0.0")]
+
+
+def test_prefetch_is_disabled_for_uncached_repositories():
+    uncached = MockRepository(disable_cache=True)
+    cached = MockRepository()
+    prefetcher = ReleasePrefetcher(Pool([Repository(), uncached, cached]))
+
+    prefetcher.prefetch("foo", ["1.0.0"])
+    prefetcher.shutdown()
+
+    assert prefetcher.pending == 0
+    assert uncached.fetched == []
+    assert cached.fetched == []
+
+
+def test_wait_removes_pending_releases():
+    repository = MockRepository()
+    prefetcher = ReleasePrefetcher(Pool([repository]), max_workers=1)
+
+    with repository.lock:
+        prefetcher.prefetch("foo", ["1.0.0", "2.0.0"])
+
+        # The worker is now blocked on the first release
+        repository.started.wait()
+        prefetcher.wait("foo", "2.0.0")
+
+        assert prefetcher.pending == 0
+
+    prefetcher.wait("foo", "1.0.0")
+    prefetcher.shutdown()
+
+    assert repository.fetched == [("foo", "1.0.0")]
+
+
+def test_prefetch_is_bounded():
+    repository = MockRepository()
+    prefetcher = ReleasePrefetcher(Pool([repository]), max_workers=1, max_pending=2)
+
+    with repository.lock:
+        prefetcher.prefetch("foo", ["1.0.0", "2.0.0", "3.0.0", "4.0.0"])
+
+        assert prefetcher.pending <= 2
+
+        prefetcher.cancel()
+
+        assert prefetcher.pending == 0
+
+    prefetcher.shutdown()
+
+    assert len(repository.fetched) <= 1
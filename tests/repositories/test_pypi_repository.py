@@ -1,8 +1,19 @@
 import json
 import pytest
 import shutil
+import threading
+
+from cachy import CacheManager
+
+try:
+    import urllib.parse as urlparse
+except ImportError:
+    import urlparse
 
 from poetry.packages import Dependency
+from poetry.repositories.http_client import HTTPClient
+from poetry.repositories.lazy_wheel import HTTPRangeRequestUnsupported
+from poetry.repositories.pypi_repository import InconclusiveInspection
 from poetry.repositories.pypi_repository import PyPiRepository
 from poetry.utils._compat import PY35
 from poetry.utils._compat import Path
@@ -36,8 +47,11 @@ class MockRepository(PyPiRepository):
         with fixture.open() as f:
             return json.loads(f.read())
 
+    def _get_wheel_metadata(self, url):
+        raise HTTPRangeRequestUnsupported()
+
     def _download(self, url, dest):
-        filename = url.split("/")[-1]
+        filename = urlparse.urlparse(url).path.rsplit("/")[-1]
 
         fixture = self.DIST_FIXTURES / filename
 
@@ -65,6 +79,14 @@ def test_find_packages_does_not_select_prereleases_if_not_allowed():
     assert len(packages) == 1
 
 
+def test_count_packages():
+    repo = MockRepository()
+
+    assert repo.count_packages("requests", "^2.18") == 5
+    assert repo.count_packages("toga", ">=0.3.0.dev2") == 7
+    assert repo.count_packages("pyyaml") == 1
+
+
 def test_package():
     repo = MockRepository()
 
@@ -173,3 +195,119 @@ def test_pypi_repository_supports_reading_bz2_files():
         assert expected_extras[name] == sorted(
             package.extras[name], key=lambda r: r.name
         )
+
+
+def test_fallback_inspects_each_archive_only_once():
+    repo = MockRepository(fallback=True)
+    repo._disable_cache = False
+    repo._cache = CacheManager(
+        {
+            "default": "releases",
+            "serializer": "json",
+            "stores": {
+                "releases": {"driver": "dict"},
+                "packages": {"driver": "dict"},
+                "archives": {"driver": "dict"},
+            },
+        }
+    )
+
+    downloads = []
+    download = repo._download
+
+    def _download(url, dest):
+        downloads.append(url)
+
+        download(url, dest)
+
+    repo._download = _download
+
+    package = repo.package("jupyter", "1.0.0")
+    assert len(package.requires) == 6
+    assert len(downloads) == 1
+    assert downloads[0].endswith(
+        "jupyter-1.0.0-py2.py3-none-any.whl#sha256="
+        "5b290f93b98ffbc21c0c7e749f054b3267782166d72fa5e3ed1ed4eaf34a2b78"
+    )
+
+    repo._cache.forget("jupyter:1.0.0")
+
+    package = repo.package("jupyter", "1.0.0")
+    assert len(package.requires) == 6
+    assert len(downloads) == 1
+
+
+def test_archives_are_inspected_by_a_pool_which_is_closed_afterwards():
+    repo = MockRepository()
+    threads = threading.active_count()
+
+    assert repo._get_info_from_archives(["a", "b"], lambda url: {"url": url}) == [
+        {"url": "a"},
+        {"url": "b"},
+    ]
+    assert threading.active_count() == threads
+
+
+def test_inconclusive_inspections_of_archives_are_not_cached():
+    repo = MockRepository()
+    repo._disable_cache = False
+    repo._cache = CacheManager(
+        {
+            "default": "releases",
+            "serializer": "json",
+            "stores": {"archives": {"driver": "dict"}},
+        }
+    )
+
+    inspected = []
+
+    def inspect(url):
+        inspected.append(url)
+
+        raise InconclusiveInspection({"requires_dist": None})
+
+    url = "https://foo.bar/foo-1.0.tar.gz#sha256=abcdef"
+
+    assert repo._get_info_from_archive(url, inspect) == {"requires_dist": None}
+    assert repo._get_info_from_archive(url, inspect) == {"requires_dist": None}
+    assert inspected == [url, url]
+    assert not repo._cache.store("archives").has("sha256:abcdef")
+
+
+def test_archives_are_no_longer_inspected_once_an_inspection_failed():
+    repo = MockRepository()
+    repo._http_client = HTTPClient(pool_size=1)
+
+    inspected = []
+
+    def inspect(url):
+        inspected.append(url)
+
+        raise ValueError(url)
+
+    with pytest.raises(ValueError):
+        repo._get_info_from_archives(["a", "b", "c"], inspect)
+
+    assert inspected == ["a"]
+
+
+def test_cache_validator_is_the_serial_of_the_cached_package_info():
+    repo = MockRepository()
+    repo._disable_cache = False
+    repo._cache = CacheManager(
+        {
+            "default": "releases",
+            "serializer": "json",
+            "stores": {
+                "releases": {"driver": "dict"},
+                "packages": {"driver": "dict"},
+                "serials": {"driver": "dict"},
+            },
+        }
+    )
+
+    assert repo.cache_validator("attrs") is None
+
+    repo.find_packages("attrs")
+
+    assert repo.cache_validator("attrs") == "3451237"
@@ -194,3 +194,14 @@ def test_versions_are_sortable(unsorted, sorted_):
     sorted_ = [parse_constraint(s) for s in sorted_]
 
     assert sorted(unsorted) == sorted_
+
+
+def test_parsed_constraints_are_shared():
+    assert parse_constraint(">=2.7, !=3.0.*") is parse_constraint(">=2.7, !=3.0.*")
+    assert parse_constraint("^1.0") is not parse_constraint("^2.0")
+
+
+def test_invalid_constraints_are_not_cached():
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            parse_constraint("foo")
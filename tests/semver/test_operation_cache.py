@@ -0,0 +1,49 @@
+from poetry.semver import Version
+from poetry.semver import VersionRange
+from poetry.semver import VersionUnion
+from poetry.semver.operation_cache import OperationCache
+from poetry.semver.operation_cache import operation_cache
+
+
+def test_operations_between_the_same_constraints_are_cached():
+    a = VersionRange(Version.parse("1.0"), Version.parse("2.0"), include_min=True)
+    b = VersionRange(Version.parse("1.5"), Version.parse("3.0"), include_min=True)
+
+    hits = operation_cache.hits
+    intersection = a.intersect(b)
+
+    assert operation_cache.hits == hits
+    assert a.intersect(b) is intersection
+    assert operation_cache.hits == hits + 1
+
+    assert str(intersection) == ">=1.5,<2.0"
+    assert str(b.intersect(a)) == ">=1.5,<2.0"
+
+
+def test_operations_between_equal_constraints_are_not_confused():
+    a = VersionRange(Version.parse("1.0"), Version.parse("2.0"), include_min=True)
+    b = VersionRange(Version.parse("3.0"), Version.parse("4.0"), include_min=True)
+    c = VersionRange(Version.parse("1.5"), Version.parse("4.0"), include_min=True)
+
+    union = VersionUnion.of(a, b)
+
+    assert str(union.difference(c)) == ">=1.0,<1.5"
+    assert str(union.intersect(c)) == ">=1.5,<2.0 || >=3.0,<4.0"
+    assert VersionUnion.of(a, b) is union
+
+
+def test_operation_cache_is_cleared_when_full():
+    cache = OperationCache(maxsize=2)
+
+    cache.put(("intersect", 1, 2), (), "a")
+    cache.put(("intersect", 2, 3), (), "b")
+    assert len(cache) == 2
+
+    cache.put(("intersect", 3, 4), (), "c")
+    assert len(cache) == 1
+
+    assert cache.get(("intersect", 1, 2)) is None
+    assert cache.get(("intersect", 3, 4)) == "c"
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.hit_rate == 0.5
@@ -73,6 +73,12 @@ def test_equality():
     assert Version.parse("1.2.3+1") == Version.parse("1.2.3+01")
 
 
+def test_equal_versions_have_the_same_hash():
+    assert hash(Version.parse("1.2.3")) == hash(Version.parse("01.2.3"))
+    assert hash(Version.parse("1.0.0b1")) == hash(Version.parse("1.0.0-beta.1"))
+    assert hash(Version.parse("1.2.3+1")) == hash(Version.parse("1.2.3+01"))
+
+
 def test_allows():
     v = Version.parse("1.2.3")
     assert v.allows(v)
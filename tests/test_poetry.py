@@ -2,8 +2,13 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import pytest
+
 from poetry.poetry import Poetry
+from poetry.repositories.legacy_repository import LegacyRepository
+from poetry.repositories.pypi_repository import PyPiRepository
 from poetry.utils._compat import PY2
+from poetry.utils._compat import PY35
 from poetry.utils._compat import Path
 from poetry.utils.toml_file import TomlFile
 
@@ -152,3 +157,40 @@ def test_check_fails():
         )
 
     assert Poetry.check(content) == {"errors": [expected], "warnings": []}
+
+
+def test_repositories_are_synchronous_by_default(config):
+    poetry = Poetry.create(str(fixtures_dir / "sample_project"))
+    poetry._config = config
+
+    assert isinstance(poetry.create_pypi_repository(), PyPiRepository)
+    assert isinstance(
+        poetry.create_legacy_repository({"name": "foo", "url": "https://foo.bar"}),
+        LegacyRepository,
+    )
+
+
+@pytest.mark.skipif(not PY35, reason="asyncio requires Python 3.5+")
+def test_async_repositories_are_used_if_enabled(config):
+    pytest.importorskip("aiohttp")
+
+    from poetry.repositories.async_repository import AsyncLegacyRepository
+    from poetry.repositories.async_repository import AsyncPyPiRepository
+    from poetry.repositories.async_repository import AsyncRepositoryAdapter
+
+    poetry = Poetry.create(str(fixtures_dir / "sample_project"))
+    poetry._config = config
+    config.add_property("settings.http.async", True)
+
+    pypi = poetry.create_pypi_repository()
+    legacy = poetry.create_legacy_repository({"name": "foo", "url": "https://foo.bar"})
+
+    try:
+        assert isinstance(pypi, AsyncRepositoryAdapter)
+        assert isinstance(pypi.repository, AsyncPyPiRepository)
+        assert isinstance(legacy, AsyncRepositoryAdapter)
+        assert isinstance(legacy.repository, AsyncLegacyRepository)
+        assert legacy.name == "foo"
+    finally:
+        pypi.close()
+        legacy.close()
@@ -1,6 +1,7 @@
 import os
 import pytest
 
+from poetry.version.markers import MarkerEnvironment
 from poetry.version.markers import MarkerUnion
 from poetry.version.markers import MultiMarker
 from poetry.version.markers import SingleMarker
@@ -183,10 +184,10 @@ def test_multi_marker():
     m = parse_marker('sys_platform == "darwin" and implementation_name == "cpython"')
 
     assert isinstance(m, MultiMarker)
-    assert m.markers == [
+    assert m.markers == (
         parse_marker('sys_platform == "darwin"'),
         parse_marker('implementation_name == "cpython"'),
-    ]
+    )
 
 
 def test_multi_marker_is_empty_is_contradictory():
@@ -254,10 +255,10 @@ def test_marker_union():
     m = parse_marker('sys_platform == "darwin" or implementation_name == "cpython"')
 
     assert isinstance(m, MarkerUnion)
-    assert m.markers == [
+    assert m.markers == (
         parse_marker('sys_platform == "darwin"'),
         parse_marker('implementation_name == "cpython"'),
-    ]
+    )
 
 
 def test_marker_union_deduplicate():
@@ -438,3 +439,63 @@ def test_parse_version_like_markers(marker, env):
     m = parse_marker(marker)
 
     assert m.validate(env)
+
+
+@pytest.mark.parametrize(
+    ("marker_string", "environment", "expected"),
+    [
+        ("os_name == 'foo'", {"os_name": "foo"}, True),
+        ("os_name == 'foo'", {"os_name": "bar"}, False),
+        ("os_name == 'foo'", {}, True),
+        ("'2.7' not in python_version", {"python_version": "2.7"}, False),
+        (
+            "python_version ~= '2.7.0' and (os_name == 'foo' or " "os_name == 'bar')",
+            {"os_name": "bar", "python_version": "2.7.4"},
+            True,
+        ),
+        (
+            "python_version ~= '2.7.0' and (os_name == 'foo' or " "os_name == 'bar')",
+            {"os_name": "other", "python_version": "2.7.4"},
+            False,
+        ),
+        (
+            'python_version < "3.4" or python_full_version >= "3.6.1"',
+            {"python_version": "3.6", "python_full_version": "3.6.0"},
+            False,
+        ),
+        ("<empty>", {}, False),
+        ("", {}, True),
+    ],
+)
+def test_compiled_markers_are_equivalent_to_validate(
+    marker_string, environment, expected
+):
+    m = parse_marker(marker_string)
+
+    assert m.validate(environment) is expected
+    assert m.compile()(MarkerEnvironment(environment)) is expected
+
+
+def test_parsed_markers_are_shared():
+    marker = 'sys_platform == "win32" and python_version < "3.6"'
+
+    assert parse_marker(marker) is parse_marker(marker)
+    assert parse_marker(marker).compile() is parse_marker(marker).compile()
+
+
+def test_shared_markers_are_not_changed_by_combining_them():
+    marker = 'sys_platform == "win32" or python_version < "3.6"'
+    m = parse_marker(marker)
+    predicate = m.compile()
+
+    union = m.union(parse_marker('os_name == "nt"'))
+
+    assert isinstance(m.markers, tuple)
+    assert len(union.markers) == 3
+    assert len(m.markers) == 2
+    assert parse_marker(marker).compile() is predicate
+    assert not predicate(
+        MarkerEnvironment(
+            {"sys_platform": "linux", "os_name": "nt", "python_version": "3.7"}
+        )
+    )
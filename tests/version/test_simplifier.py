@@ -0,0 +1,129 @@
+import pytest
+
+from poetry.version.markers import MultiMarker
+from poetry.version.markers import SingleMarker
+from poetry.version.markers import parse_marker
+from poetry.version.simplifier import ValueSet
+from poetry.version.simplifier import simplify_marker
+
+
+@pytest.mark.parametrize(
+    "marker, expected",
+    [
+        ('sys_platform == "win32"', 'sys_platform == "win32"'),
+        (
+            'python_version >= "3.6" and sys_platform != "win32"',
+            'python_version >= "3.6" and sys_platform != "win32"',
+        ),
+        (
+            'python_version < "4.0" and sys_platform == "win32" '
+            'or python_version < "5.0" and sys_platform == "win32"',
+            'python_version < "5.0" and sys_platform == "win32"',
+        ),
+        (
+            'python_version >= "2.7" and python_version < "2.8" '
+            'or python_version >= "3.4" and python_version < "3.5" '
+            'or python_version < "3.5"',
+            'python_version < "3.5"',
+        ),
+        (
+            'python_version >= "3.6" and python_version < "4.0" '
+            'or python_version >= "3.5.3" and python_version < "4.0.0"',
+            'python_version >= "3.5.3" and python_version < "4.0.0"',
+        ),
+        (
+            'sys_platform == "win32" and python_version < "3" '
+            'or sys_platform == "linux" and python_version < "3"',
+            'sys_platform == "linux" and python_version < "3" '
+            'or sys_platform == "win32" and python_version < "3"',
+        ),
+        (
+            'python_version >= "3.4" and python_version < "3.6" '
+            'or python_version >= "3.6" and python_version < "4.0"',
+            'python_version >= "3.4" and python_version < "4.0"',
+        ),
+        ('sys_platform == "win32" or sys_platform != "win32"', ""),
+        ('python_version < "3.4" or python_version >= "3.4"', ""),
+        ('sys_platform == "win32" and sys_platform == "linux"', "<empty>"),
+        ('extra == "a" or extra != "a"', 'extra == "a" or extra != "a"'),
+        (
+            'python_full_version >= "3.6.1" and python_full_version < "4" '
+            'or python_full_version >= "3.7"',
+            'python_full_version >= "3.7"',
+        ),
+        (
+            'python_version ~= "2.7" and platform_machine in "x86_64 aarch64"',
+            'python_version ~= "2.7" and platform_machine in "x86_64 aarch64"',
+        ),
+        (
+            'platform_machine in "x86_64 aarch64" and python_version < "3" '
+            'or platform_machine in "x86_64 aarch64" and python_version >= "3"',
+            'platform_machine in "x86_64 aarch64"',
+        ),
+    ],
+)
+def test_simplify_marker(marker, expected):
+    assert str(simplify_marker(parse_marker(marker))) == expected
+
+
+def test_simplify_marker_does_not_reason_about_the_values_of_extras():
+    marker = MultiMarker(
+        SingleMarker("extra", "==a"),
+        SingleMarker("extra", "==b"),
+        SingleMarker("sys_platform", "==linux"),
+    )
+
+    assert (
+        str(simplify_marker(marker))
+        == 'extra == "a" and extra == "b" and sys_platform == "linux"'
+    )
+
+
+def test_simplify_marker_keeps_factored_markers_which_are_shorter():
+    marker = parse_marker(
+        '(python_version < "3" or python_version >= "3.4") '
+        'and (sys_platform == "win32" or sys_platform == "darwin")'
+    )
+
+    assert simplify_marker(marker) is marker
+
+
+@pytest.mark.parametrize(
+    "marker, environment",
+    [
+        (
+            'python_version < "4.0" and sys_platform == "win32" '
+            'or python_version < "5.0" and sys_platform == "win32"',
+            {"python_version": "4.5", "sys_platform": "win32"},
+        ),
+        (
+            'sys_platform == "win32" and python_version < "3" '
+            'or sys_platform == "linux" and python_version < "3"',
+            {"python_version": "2.7", "sys_platform": "darwin"},
+        ),
+        (
+            'python_version >= "3.4" and python_version < "3.6" '
+            'or python_version >= "3.6" and python_version < "4.0"',
+            {"python_version": "3.6"},
+        ),
+    ],
+)
+def test_simplified_markers_are_equivalent(marker, environment):
+    marker = parse_marker(marker)
+
+    assert simplify_marker(marker).validate(environment) is marker.validate(
+        environment
+    )
+
+
+def test_value_sets():
+    win32 = ValueSet(["win32"])
+    not_win32 = ValueSet(["win32"], excluded=True)
+
+    assert win32.intersect(not_win32).is_empty()
+    assert win32.union(not_win32).is_any()
+    assert not_win32.allows_all(ValueSet(["linux", "darwin"]))
+    assert not not_win32.allows_all(ValueSet(["linux", "win32"]))
+    assert not_win32.intersect(ValueSet(["linux"], excluded=True)) == ValueSet(
+        ["linux", "win32"], excluded=True
+    )